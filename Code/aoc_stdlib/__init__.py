@@ -0,0 +1,31 @@
+"""
+AoCode's standard library of puzzle helpers.
+
+Every user's utils.py starts with `from aoc_stdlib import *`, so helpers
+improve for everyone with each AoCode update while utils.py only holds the
+user's own additions. Solutions run with this package on their path.
+"""
+# Imported by the old copy-pasted template, solutions may still rely on them
+from collections import deque
+from functools import reduce
+import heapq
+from typing import Any, Dict, List, Tuple
+
+from ._compat import HAS_NUMPY
+from .grid import *  # noqa: F401,F403
+from .maths import *  # noqa: F401,F403
+from .matrix import *  # noqa: F401,F403
+from .parallel import *  # noqa: F401,F403
+from .search import *  # noqa: F401,F403
+from .structures import *  # noqa: F401,F403
+from .text import *  # noqa: F401,F403
+from . import grid, maths, matrix, parallel, search, structures, text
+
+# Bumped whenever a helper is added or changes behaviour
+__version__ = "2.1"
+
+__all__ = [
+    "deque", "reduce", "heapq", "Any", "Dict", "List", "Tuple", "HAS_NUMPY",
+    *grid.__all__, *maths.__all__, *matrix.__all__, *parallel.__all__,
+    *search.__all__, *structures.__all__, *text.__all__,
+]
@@ -0,0 +1,15 @@
+"""Optional dependencies, looked up without importing them."""
+import importlib.util
+
+# NumPy is optional. It is only imported by the helpers that use it, so
+# solutions that don't need it don't pay for the import.
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+# SciPy is optional on top of NumPy, only flood_fill uses it
+HAS_SCIPY = HAS_NUMPY and importlib.util.find_spec("scipy") is not None
+
+
+def require_numpy():
+    if not HAS_NUMPY:
+        raise ImportError("This helper needs NumPy: pip install numpy")
+    import numpy
+    return numpy
@@ -0,0 +1,63 @@
+"""
+Helpers as the first utils template had them, where the aoc_stdlib version
+behaves differently: points and directions are lists rather than tuples,
+and UnionFind keeps ranks with None for a root's parent. Upgraded utils.py
+files import the ones they had unchanged, so older solutions keep working.
+"""
+__all__ = [
+    "DIRS4",
+    "DIRS8",
+    "padd",
+    "pneg",
+    "psub",
+    "UnionFind",
+]
+
+
+DIRS4 = [[-1, 0], [1, 0], [0, -1], [0, 1]]
+DIRS8 = DIRS4 + [[-1, -1], [-1, 1], [1, -1], [1, 1]]
+
+
+def padd(x, y):
+    return [a + b for a, b in zip(x, y)]
+
+
+def pneg(v):
+    return [-i for i in v]
+
+
+def psub(x, y):
+    return [a - b for a, b in zip(x, y)]
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.n = n
+        self.parents = [None] * n
+        self.ranks = [1] * n
+        self.num_sets = n
+
+    def find(self, i: int) -> int:
+        p = self.parents[i]
+        if p is None:
+            return i
+        p = self.find(p)
+        self.parents[i] = p
+        return p
+
+    def in_same_set(self, i: int, j: int) -> bool:
+        return self.find(i) == self.find(j)
+
+    def merge(self, i: int, j: int) -> None:
+        i = self.find(i)
+        j = self.find(j)
+        if i == j:
+            return
+        if self.ranks[i] < self.ranks[j]:
+            self.parents[i] = j
+        elif self.ranks[i] > self.ranks[j]:
+            self.parents[j] = i
+        else:
+            self.parents[j] = i
+            self.ranks[i] += 1
+        self.num_sets -= 1
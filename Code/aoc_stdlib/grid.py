@@ -0,0 +1,192 @@
+"""Points, directions and grids, with bulk NumPy operations when it is installed."""
+from collections import deque
+from typing import Dict, List, Tuple
+
+from ._compat import HAS_SCIPY, require_numpy
+
+__all__ = [
+    "DIRS4",
+    "DIRS8",
+    "CDIRS4",
+    "CDIRS8",
+    "padd",
+    "pneg",
+    "psub",
+    "pdist1",
+    "complex_grid",
+    "Grid",
+    "grid_array",
+    "neighbor_counts",
+    "flood_fill",
+    "manhattan",
+    "bounds",
+]
+
+
+# Coordinates
+# Points are tuples so they can go straight into sets and dicts. The 2D
+# case is spelled out since it is by far the most common one.
+DIRS4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIRS8 = DIRS4 + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# The same directions as complex numbers (real = row, imag = column), where
+# moving is just p + d and turning is d * 1j (left) or d * -1j (right)
+CDIRS4 = (-1, 1, -1j, 1j)
+CDIRS8 = CDIRS4 + (-1 - 1j, -1 + 1j, 1 - 1j, 1 + 1j)
+
+
+def padd(x, y):
+    if len(x) == 2:
+        return (x[0] + y[0], x[1] + y[1])
+    return tuple(a + b for a, b in zip(x, y))
+
+
+def pneg(v):
+    return tuple(-i for i in v)
+
+
+def psub(x, y):
+    if len(x) == 2:
+        return (x[0] - y[0], x[1] - y[1])
+    return tuple(a - b for a, b in zip(x, y))
+
+
+def pdist1(x, y=None):
+    if y is not None:
+        x = psub(x, y)
+    return sum(map(abs, x))
+
+
+def complex_grid(lines: List[str]) -> Dict[complex, str]:
+    return {complex(r, c): ch for r, line in enumerate(lines) for c, ch in enumerate(line)}
+
+
+# Grids
+# A character grid in one flat list with a border of None around it, so a
+# neighbour is just i + offset and never needs a bounds check.
+# Cells are addressed by flat index, index(r, c) and pos(i) convert.
+class Grid:
+    def __init__(self, rows: List[str]):
+        self.height = len(rows)
+        self.width = max(map(len, rows), default=0)
+        self.stride = w = self.width + 2
+        self.cells = [None] * w
+        for row in rows:
+            self.cells += [None, *row.ljust(self.width), None]
+        self.cells += [None] * w
+        self.dirs4 = (-w, 1, w, -1)
+        self.dirs8 = self.dirs4 + (-w - 1, -w + 1, w - 1, w + 1)
+
+    @classmethod
+    def from_text(cls, text: str) -> "Grid":
+        return cls(text.splitlines())
+
+    def index(self, r: int, c: int) -> int:
+        return (r + 1) * self.stride + c + 1
+
+    def pos(self, i: int) -> Tuple[int, int]:
+        r, c = divmod(i, self.stride)
+        return r - 1, c - 1
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            key = self.index(*key)
+        return self.cells[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, tuple):
+            key = self.index(*key)
+        self.cells[key] = value
+
+    def indices(self):
+        for r in range(self.height):
+            start = self.index(r, 0)
+            yield from range(start, start + self.width)
+
+    def neighbors(self, i: int, diagonal: bool = False) -> List[int]:
+        cells = self.cells
+        return [j for d in (self.dirs8 if diagonal else self.dirs4)
+                if cells[j := i + d] is not None]
+
+    def find(self, value) -> int:
+        return self.cells.index(value)
+
+    def find_all(self, value) -> List[int]:
+        return [i for i, cell in enumerate(self.cells) if cell == value]
+
+    def bfs(self, start: int, walls: str = "#") -> Dict[int, int]:
+        # Steps from start to every reachable cell.
+        cells, dirs = self.cells, self.dirs4
+        dist = {start: 0}
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            step = dist[i] + 1
+            for d in dirs:
+                j = i + d
+                if j not in dist and cells[j] is not None and cells[j] not in walls:
+                    dist[j] = step
+                    queue.append(j)
+        return dist
+
+    def __str__(self) -> str:
+        return "\n".join("".join(self.cells[self.index(r, 0):self.index(r, self.width)])
+                         for r in range(self.height))
+
+
+def grid_array(lines: List[str]):
+    # The grid as a 2D array of characters (dtype '<U1').
+    np = require_numpy()
+    return np.array([list(line) for line in lines])
+
+
+def neighbor_counts(mask, diagonal: bool = True):
+    # How many True neighbours each cell of a 2D boolean array has.
+    np = require_numpy()
+    padded = np.pad(mask.astype(np.int32), 1)
+    h, w = mask.shape
+    offsets = DIRS8 if diagonal else DIRS4
+    counts = np.zeros((h, w), dtype=np.int32)
+    for dr, dc in offsets:
+        counts += padded[1 + dr:1 + dr + h, 1 + dc:1 + dc + w]
+    return counts
+
+
+def flood_fill(mask, start: Tuple[int, int]):
+    # Boolean array of the cells of mask connected to start (4-way). SciPy
+    # labels the regions in C when it is installed. Otherwise a queue over
+    # the flat cells visits each one once, however winding the region is.
+    np = require_numpy()
+    mask = np.asarray(mask, dtype=bool)
+    if not mask[start]:
+        return np.zeros_like(mask)
+    if HAS_SCIPY:
+        from scipy import ndimage
+        labels, _ = ndimage.label(mask)
+        return labels == labels[start]
+
+    h, w = mask.shape
+    # A border of closed cells saves bounds checks
+    width = w + 2
+    open_cells = bytearray(np.pad(mask, 1).tobytes())
+    first = (start[0] % h + 1) * width + start[1] % w + 1
+    open_cells[first] = 0
+    filled = [first]
+    for i in filled:
+        for j in (i - width, i + width, i - 1, i + 1):
+            if open_cells[j]:
+                open_cells[j] = 0
+                filled.append(j)
+    result = np.zeros((h + 2) * width, dtype=bool)
+    result[filled] = True
+    return result.reshape(h + 2, width)[1:-1, 1:-1]
+
+
+def manhattan(point1: Tuple[int, ...], point2: Tuple[int, ...]) -> int:
+    if len(point1) == 2:
+        return abs(point1[0] - point2[0]) + abs(point1[1] - point2[1])
+    return sum(abs(a - b) for a, b in zip(point1, point2))
+
+
+def bounds(a, b, limit):
+    return 0 <= a < limit and 0 <= b < limit
@@ -0,0 +1,68 @@
+"""Primes and modular arithmetic."""
+from functools import reduce
+import itertools
+import math
+from typing import List
+
+__all__ = [
+    "isPrime",
+    "allPrimesToX",
+    "lcmWithRemainder",
+]
+
+
+def isPrime(n: int) -> bool:
+    if n <= 1:
+        return False
+    if n <= 3:
+        return True
+    if n % 2 == 0 or n % 3 == 0:
+        return False
+    i = 5
+    while i * i <= n:
+        if n % i == 0 or n % (i + 2) == 0:
+            return False
+        i += 6
+    return True
+
+
+def allPrimesToX(limit: int) -> List[int]:
+    if limit < 2:
+        return []
+    # Odd numbers only, sieve[i] says whether 2 * i + 1 is prime. Multiples
+    # are crossed off with one slice assignment per prime.
+    size = (limit + 1) // 2
+    sieve = bytearray([1]) * size
+    sieve[0] = 0
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, size, p)))
+    return [2, *itertools.compress(range(1, limit + 1, 2), sieve)]
+
+
+def lcmWithRemainder(a: List[int], n: List[int]) -> int:
+    def extended_gcd(a, b):
+        if b == 0:
+            return a, 1, 0
+        gcd, x1, y1 = extended_gcd(b, a % b)
+        return gcd, y1, x1 - (a // b) * y1
+
+    def mod_inverse(a, m):
+        gcd, x, _ = extended_gcd(a, m)
+        if gcd != 1:
+            raise ValueError("Modular inverse does not exist")
+        return x % m
+
+    if len(a) != len(n):
+        raise ValueError("Lists 'a' and 'n' must have the same length.")
+    if all(rem == 0 for rem in a):
+        return 0
+    N = reduce(lambda x, y: x * y, n)
+    result = 0
+    for ai, ni in zip(a, n):
+        Ni = N // ni
+        Mi = mod_inverse(Ni, ni)
+        result += ai * Ni * Mi
+    return result % N
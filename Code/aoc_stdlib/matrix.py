@@ -0,0 +1,86 @@
+"""Matrix products and powers, optionally modular and NumPy-backed."""
+import operator
+from typing import List
+
+from ._compat import HAS_NUMPY, require_numpy
+
+__all__ = [
+    "NUMPY_MIN_SIZE",
+    "identity",
+    "transpose",
+    "matmat",
+    "matvec",
+    "matexp",
+]
+
+
+# Pass mod to keep entries from growing into huge ints. Square matrices of
+# NUMPY_MIN_SIZE or more go through NumPy when it is installed: int64 for
+# a mod up to 2**31, Python ints (dtype=object) otherwise.
+NUMPY_MIN_SIZE = 16
+
+
+def identity(n: int) -> List[List[int]]:
+    return [[int(i == j) for j in range(n)] for i in range(n)]
+
+
+def transpose(a):
+    return [list(col) for col in zip(*a)]
+
+
+def matmat(a, b, mod=None):
+    assert len(a[0]) == len(b)
+    if HAS_NUMPY and len(a) >= NUMPY_MIN_SIZE:
+        np = require_numpy()
+        return _np_matmul(np, _np_matrix(np, a, mod), _np_matrix(np, b, mod), mod).tolist()
+    # Transposed once, so each entry is a dot product of two tuples
+    cols = list(zip(*b))
+    mul = operator.mul
+    if mod is None:
+        return [[sum(map(mul, row, col)) for col in cols] for row in a]
+    return [[sum(map(mul, row, col)) % mod for col in cols] for row in a]
+
+
+def matvec(a, v, mod=None):
+    mul = operator.mul
+    out = [sum(map(mul, row, v)) for row in a]
+    return [x % mod for x in out] if mod is not None else out
+
+
+def matexp(a, k, mod=None):
+    n = len(a)
+    if HAS_NUMPY and n >= NUMPY_MIN_SIZE:
+        # Converted once and kept as arrays across every squaring
+        np = require_numpy()
+        a = _np_matrix(np, a, mod)
+        out = _np_matrix(np, identity(n), mod)
+        while k > 0:
+            if k % 2 == 1:
+                out = _np_matmul(np, a, out, mod)
+            a = _np_matmul(np, a, a, mod)
+            k //= 2
+        return out.tolist()
+
+    out = identity(n)
+    while k > 0:
+        if k % 2 == 1:
+            out = matmat(a, out, mod)
+        a = matmat(a, a, mod)
+        k //= 2
+    return out
+
+
+def _np_matrix(np, a, mod):
+    if mod is not None and mod <= 2 ** 31:
+        return np.array([[x % mod for x in row] for row in a], dtype=np.int64)
+    return np.array(a, dtype=object)
+
+
+def _np_matmul(np, a, b, mod):
+    if mod is None:
+        return a @ b
+    if a.dtype == object or a.shape[1] * (mod - 1) ** 2 < 2 ** 63:
+        return (a @ b) % mod
+    # Split b into 16 bit halves so no sum of products overflows int64
+    high, low = b >> 16, b & 0xFFFF
+    return ((((a @ high) % mod) << 16) + a @ low) % mod
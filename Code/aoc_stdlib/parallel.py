@@ -0,0 +1,219 @@
+"""Spreading brute-force work over every core the solution is allowed to use."""
+import math
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+__all__ = [
+    "parallel_map",
+    "parallel_search",
+    "parallel_stats",
+    "max_workers",
+]
+
+# Caps the number of worker processes, e.g. AOCODE_MAX_WORKERS=2
+MAX_WORKERS_ENV = "AOCODE_MAX_WORKERS"
+# More chunks than workers, so a worker that finishes early takes more work
+MAP_CHUNKS_PER_WORKER = 4
+# Searches use smaller chunks so an early match stops the rest sooner
+SEARCH_CHUNKS_PER_WORKER = 32
+
+# The function and items of the current call. Workers are forked, so they
+# see these without anything being pickled, lambdas and closures included.
+# Only chunk bounds go out and results come back.
+_task = None
+_last_stats = None
+
+
+class WorkerTiming:
+    __slots__ = ("pid", "chunks", "items", "busy")
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.chunks = 0
+        self.items = 0
+        self.busy = 0.0
+
+    def __repr__(self) -> str:
+        return (f"WorkerTiming(pid={self.pid}, chunks={self.chunks}, "
+                f"items={self.items}, busy={self.busy:.3f})")
+
+
+class ParallelStats:
+    """Timing of one parallel_map or parallel_search call, per worker process."""
+
+    def __init__(self, wall: float, workers: List[WorkerTiming]) -> None:
+        self.wall = wall
+        self.workers = workers
+
+    def __str__(self) -> str:
+        count = len(self.workers)
+        lines = [f"{count} worker{'' if count == 1 else 's'}, {self.wall:.3f}s"]
+        for n, worker in enumerate(self.workers, 1):
+            share = worker.busy / self.wall if self.wall else 0.0
+            lines.append(f"  worker {n}: {worker.chunks} chunks, {worker.items} items, "
+                         f"busy {worker.busy:.3f}s ({share:.0%})")
+        return "\n".join(lines)
+
+
+def _cgroup_cpus() -> Optional[int]:
+    # Containers limit CPU time with a quota rather than by hiding cores
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return max(1, math.ceil(int(quota) / int(period)))
+
+
+def max_workers() -> int:
+    """
+    Worker processes a parallel call uses at most: the cores this process
+    may run on, lowered by a container CPU quota and by AOCODE_MAX_WORKERS.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS, Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpus()
+    if quota:
+        cpus = min(cpus, quota)
+    try:
+        cpus = min(cpus, int(os.environ.get(MAX_WORKERS_ENV, "")))
+    except ValueError:
+        pass
+    return max(1, cpus)
+
+
+def parallel_stats() -> Optional[ParallelStats]:
+    """Per-worker timing of the last parallel call, print it to see how the work spread."""
+    return _last_stats
+
+
+def _can_fork() -> bool:
+    # Imported here, it would otherwise add to every solution's start-up.
+    # Pool workers cannot start pools of their own, nested calls run serially.
+    import multiprocessing
+    return ("fork" in multiprocessing.get_all_start_methods()
+            and not multiprocessing.current_process().daemon)
+
+
+def _length(items: Sequence) -> int:
+    if isinstance(items, range):
+        # len() stops at sys.maxsize, a range can be far longer
+        if items.step > 0:
+            return max(0, (items.stop - items.start + items.step - 1) // items.step)
+        return max(0, (items.start - items.stop - items.step - 1) // -items.step)
+    return len(items)
+
+
+def _chunks(n: int, size: int) -> Iterator[tuple]:
+    # A generator, so a huge range with small chunks is never listed out
+    return ((start, min(start + size, n)) for start in range(0, n, size))
+
+
+def _map_chunk(bounds: tuple) -> tuple:
+    fn, items = _task
+    start, stop = bounds
+    began = time.perf_counter()
+    results = [fn(item) for item in items[start:stop]]
+    return os.getpid(), time.perf_counter() - began, stop - start, results
+
+
+def _search_chunk(bounds: tuple) -> tuple:
+    fn, items = _task
+    start, stop = bounds
+    began = time.perf_counter()
+    found = None
+    for offset, item in enumerate(items[start:stop]):
+        if fn(item):
+            found = start + offset
+            break
+    checked = stop - start if found is None else found - start + 1
+    return os.getpid(), time.perf_counter() - began, checked, found
+
+
+def _run(chunk_fn: Callable, fn: Callable, items: Sequence, workers: Optional[int],
+         chunksize: Optional[int], per_worker: int, stop: Callable[[Any], bool]) -> List[Any]:
+    """
+    Runs chunk_fn over the chunks in order and returns their results, up to
+    and including the first one stop() accepts. Later chunks are cancelled.
+    """
+    global _task, _last_stats
+    n = _length(items)
+    workers = min(workers or max_workers(), max_workers(), n) or 1
+    size = chunksize or max(1, -(-n // (workers * per_worker)))
+    chunks = _chunks(n, size)
+
+    timings: Dict[int, WorkerTiming] = {}
+    results = []
+    began = time.perf_counter()
+    _task = (fn, items)
+    try:
+        pool = None
+        if workers > 1 and n > size and _can_fork():
+            import multiprocessing
+            try:
+                pool = multiprocessing.get_context("fork").Pool(workers)
+            except OSError:
+                # Out of processes under a sandbox limit, do the work here instead
+                pool = None
+        if pool is None:
+            replies = map(chunk_fn, chunks)
+        else:
+            replies = pool.imap(chunk_fn, chunks)
+        try:
+            for pid, busy, count, result in replies:
+                worker = timings.setdefault(pid, WorkerTiming(pid))
+                worker.chunks += 1
+                worker.items += count
+                worker.busy += busy
+                results.append(result)
+                if stop(result):
+                    break
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+    finally:
+        _task = None
+    _last_stats = ParallelStats(time.perf_counter() - began, list(timings.values()))
+    return results
+
+
+def _sequence(items) -> Sequence:
+    # Ranges slice into ranges, so huge search spaces are never built as lists
+    return items if isinstance(items, (range, list, tuple, str, bytes)) else list(items)
+
+
+def parallel_map(fn: Callable, items, workers: Optional[int] = None,
+                 chunksize: Optional[int] = None) -> List[Any]:
+    """
+    [fn(item) for item in items], spread over worker processes. fn can be a
+    lambda or use the solution's globals, only its results are sent back.
+    Falls back to one process where fork is not available (Windows).
+    """
+    items = _sequence(items)
+    if not items:
+        return []
+    chunks = _run(_map_chunk, fn, items, workers, chunksize, MAP_CHUNKS_PER_WORKER,
+                  lambda result: False)
+    return [result for chunk in chunks for result in chunk]
+
+
+def parallel_search(fn: Callable, items, default: Any = None, workers: Optional[int] = None,
+                    chunksize: Optional[int] = None) -> Any:
+    """
+    The first item, in order, for which fn(item) is true, or default. Chunks
+    are searched in parallel and the rest are stopped once the first match
+    is certain, e.g. parallel_search(lambda seed: location(seed) < best, range(n)).
+    """
+    items = _sequence(items)
+    if not items:
+        return default
+    chunks = _run(_search_chunk, fn, items, workers, chunksize, SEARCH_CHUNKS_PER_WORKER,
+                  lambda found: found is not None)
+    return default if chunks[-1] is None else items[chunks[-1]]
+
@@ -0,0 +1,150 @@
+"""Binary search and graph searches, with integer-indexed variants over flat arrays."""
+from array import array
+from collections import deque
+import heapq
+import itertools
+from typing import Any, Dict, List
+
+__all__ = [
+    "binary_search",
+    "bfs",
+    "reconstruct_path",
+    "dijkstra",
+    "a_star",
+    "bfs_indexed",
+    "dijkstra_indexed",
+    "indexed_path",
+]
+
+
+def binary_search(f, lo=0, hi=None):
+    lo_bool = f(lo)
+    if hi is None:
+        offset = 1
+        while f(lo + offset) == lo_bool:
+            offset *= 2
+        hi = lo + offset
+    else:
+        assert f(hi) != lo_bool
+    best_so_far = lo if lo_bool else hi
+    while lo <= hi:
+        mid = (hi + lo) // 2
+        result = f(mid)
+        if result:
+            best_so_far = mid
+        if result == lo_bool:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best_so_far
+
+
+def bfs(graph: Dict[Any, List[Any]], start: Any) -> List[Any]:
+    # Nodes are marked when queued, so each one is queued at most once
+    visited = {start}
+    queue = deque([start])
+    result = []
+    while queue:
+        node = queue.popleft()
+        result.append(node)
+        for neighbor in graph.get(node, ()):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return result
+
+
+def reconstruct_path(parents: Dict[Any, Any], goal: Any) -> List[Any]:
+    path = [goal]
+    while (goal := parents[goal]) is not None:
+        path.append(goal)
+    return path[::-1]
+
+
+def dijkstra(start, neighbors, goal=None):
+    # Lazy deletion: a node can be pushed more than once and stale entries
+    # are skipped when popped, which beats any decrease-key in Python.
+    # neighbors(node) yields (neighbor, cost). Returns (dist, parents).
+    dist = {start: 0}
+    parents = {start: None}
+    tie = itertools.count()  # Nodes never get compared on equal distances
+    pq = [(0, next(tie), start)]
+    while pq:
+        d, _, node = heapq.heappop(pq)
+        if d > dist[node]:
+            continue
+        if node == goal:
+            break
+        for neighbor, cost in neighbors(node):
+            nd = d + cost
+            if nd < dist.get(neighbor, float('inf')):
+                dist[neighbor] = nd
+                parents[neighbor] = node
+                heapq.heappush(pq, (nd, next(tie), neighbor))
+    return dist, parents
+
+
+def a_star(start, goal, neighbors, h):
+    # Paths are rebuilt from a parent map at the end instead of being
+    # copied into every heap entry
+    g_score = {start: 0}
+    parents = {start: None}
+    tie = itertools.count()
+    pq = [(h(start), next(tie), 0, start)]
+    while pq:
+        _, _, g, current = heapq.heappop(pq)
+        if current == goal:
+            return reconstruct_path(parents, goal), g
+        if g > g_score[current]:
+            continue
+        for neighbor, cost in neighbors(current):
+            new_g = g + cost
+            if new_g < g_score.get(neighbor, float('inf')):
+                g_score[neighbor] = new_g
+                parents[neighbor] = current
+                heapq.heappush(pq, (new_g + h(neighbor), next(tie), new_g, neighbor))
+    return None, float('inf')
+
+
+# Integer-indexed versions for nodes numbered 0..n-1, such as Grid indices.
+# Distances and parents live in flat arrays instead of dicts.
+def bfs_indexed(n: int, start: int, neighbors) -> array:
+    dist = array('l', [-1]) * n
+    dist[start] = 0
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        step = dist[node] + 1
+        for neighbor in neighbors(node):
+            if dist[neighbor] < 0:
+                dist[neighbor] = step
+                queue.append(neighbor)
+    return dist
+
+
+def dijkstra_indexed(n: int, start: int, neighbors, goal: int = -1):
+    # Unreached nodes keep a distance of -1 and a parent of -1
+    dist = array('q', [-1]) * n
+    parents = array('l', [-1]) * n
+    dist[start] = 0
+    pq = [(0, start)]
+    while pq:
+        d, node = heapq.heappop(pq)
+        if d > dist[node]:
+            continue
+        if node == goal:
+            break
+        for neighbor, cost in neighbors(node):
+            nd = d + cost
+            if dist[neighbor] < 0 or nd < dist[neighbor]:
+                dist[neighbor] = nd
+                parents[neighbor] = node
+                heapq.heappush(pq, (nd, neighbor))
+    return dist, parents
+
+
+def indexed_path(parents, goal: int) -> List[int]:
+    path = [goal]
+    while (goal := parents[goal]) != -1:
+        path.append(goal)
+    return path[::-1]
@@ -0,0 +1,57 @@
+"""Union-find and a linked list."""
+from array import array
+
+__all__ = [
+    "UnionFind",
+    "Linked",
+]
+
+
+class UnionFind:
+    # Parents and set sizes are kept in int arrays. find halves the path as
+    # it walks up, so it never recurses however long a chain gets.
+    def __init__(self, n: int):
+        self.n = n
+        self.parents = array('i', range(n))
+        self.sizes = array('i', [1]) * n
+        self.num_sets = n
+
+    def find(self, i: int) -> int:
+        parents = self.parents
+        while parents[i] != i:
+            grandparent = parents[parents[i]]
+            parents[i] = grandparent
+            i = grandparent
+        return i
+
+    def in_same_set(self, i: int, j: int) -> bool:
+        return self.find(i) == self.find(j)
+
+    def merge(self, i: int, j: int) -> bool:
+        i = self.find(i)
+        j = self.find(j)
+        if i == j:
+            return False
+        # The smaller set goes under the larger one
+        if self.sizes[i] < self.sizes[j]:
+            i, j = j, i
+        self.parents[j] = i
+        self.sizes[i] += self.sizes[j]
+        self.num_sets -= 1
+        return True
+
+    def size(self, i: int) -> int:
+        return self.sizes[self.find(i)]
+
+
+class Linked:
+    def __init__(self, value):
+        self.value = value
+        self.next = None
+
+    def append(self, value):
+        new_node = Linked(value)
+        current = self
+        while current.next:
+            current = current.next
+        current.next = new_node
@@ -0,0 +1,20 @@
+"""Parsing helpers for strings and lists."""
+from typing import List
+
+__all__ = [
+    "lmap",
+    "ints",
+    "words",
+]
+
+
+def lmap(func, *iterables):
+    return list(map(func, *iterables))
+
+
+def ints(s: str) -> List[int]:
+    return lmap(int, s.split())
+
+
+def words(s: str) -> List[str]:
+    return s.split()
@@ -0,0 +1,92 @@
+"""
+Compares aoc_stdlib's flood_fill with the whole-array dilation it replaced
+and a plain BFS over the same mask. The maze is one corridor winding
+through every other row, the worst case for dilation, which needs a full
+pass over the array for every step along the path.
+
+    python Code/benchmarks/bench_flood_fill.py [size]
+
+Needs NumPy. SciPy is used by aoc_stdlib when it is installed, without it
+only the queue-based fill is timed.
+"""
+import os
+import sys
+import timeit
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+
+import aoc_stdlib  # noqa: E402
+
+REPEAT = 3
+
+
+def flood_fill_old(mask, start):
+    filled = np.zeros_like(mask, dtype=bool)
+    if not mask[start]:
+        return filled
+    filled[start] = True
+    while True:
+        grown = filled.copy()
+        grown[1:] |= filled[:-1]
+        grown[:-1] |= filled[1:]
+        grown[:, 1:] |= filled[:, :-1]
+        grown[:, :-1] |= filled[:, 1:]
+        grown &= mask
+        if (grown == filled).all():
+            return filled
+        filled = grown
+
+
+def flood_fill_bfs(mask, start):
+    h, w = mask.shape
+    open_cells = mask.tolist()
+    filled = np.zeros_like(mask, dtype=bool)
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        filled[r, c] = True
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < h and 0 <= nc < w and open_cells[nr][nc] and (nr, nc) not in seen:
+                seen.add((nr, nc))
+                queue.append((nr, nc))
+    return filled
+
+
+def serpentine(size: int):
+    mask = np.zeros((size, size), dtype=bool)
+    mask[::2] = True
+    for r in range(1, size, 2):
+        mask[r, size - 1 if r % 4 == 1 else 0] = True
+    return mask
+
+
+def bench(label: str, func) -> float:
+    seconds = min(timeit.repeat(func, number=1, repeat=REPEAT))
+    print(f"  {label:<36} {seconds * 1000:9.1f} ms")
+    return seconds
+
+
+def main(size: int) -> None:
+    mask = serpentine(size)
+    print(f"{size}x{size} winding corridor, {int(mask.sum())} open cells, "
+          f"SciPy {'on' if aoc_stdlib.grid.HAS_SCIPY else 'not installed'}")
+
+    expected = flood_fill_bfs(mask, (0, 0))
+    assert (aoc_stdlib.flood_fill(mask, (0, 0)) == expected).all()
+    assert (flood_fill_old(mask, (0, 0)) == expected).all()
+
+    old = bench("old flood_fill (dilation)", lambda: flood_fill_old(mask, (0, 0)))
+    bfs = bench("plain BFS", lambda: flood_fill_bfs(mask, (0, 0)))
+    new = bench("stdlib flood_fill", lambda: aoc_stdlib.flood_fill(mask, (0, 0)))
+    if aoc_stdlib.grid.HAS_SCIPY:
+        aoc_stdlib.grid.HAS_SCIPY = False
+        bench("stdlib flood_fill, without SciPy", lambda: aoc_stdlib.flood_fill(mask, (0, 0)))
+    print(f"  speedup: {old / new:.1f}x over dilation, {bfs / new:.1f}x over BFS")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 201)
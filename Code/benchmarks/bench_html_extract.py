@@ -0,0 +1,82 @@
+"""
+Compares the streaming <article> extractor with the BeautifulSoup approach
+it replaced, on saved AoC pages.
+
+    python Code/benchmarks/bench_html_extract.py [saved_page.html ...]
+
+Without arguments a synthetic page shaped like an AoC day page is used.
+Needs beautifulsoup4 (see requirements-dev.txt) for the comparison.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from core.html_extract import extract_articles  # noqa: E402
+
+REPEAT = 5
+
+
+def synthetic_page() -> str:
+    head = ("<!DOCTYPE html><html lang=\"en-us\"><head><meta charset=\"utf-8\"/>"
+            "<title>Day 1 - Advent of Code</title>"
+            "<style>body { background: #0f0f23; }</style>"
+            + "<script>window.x = [" + ",".join(str(i) for i in range(500)) + "];</script>"
+            "</head><body>")
+    nav = "<header><nav><ul>" + "".join(
+        f'<li><a href="/{2015 + i}/events">[{2015 + i}]</a></li>' for i in range(10)) + "</ul></nav></header>"
+    sidebar = "<div id=\"sidebar\">" + "".join(
+        f'<div class="sponsor"><a href="https://example.com/{i}">Sponsor {i}</a> text</div>'
+        for i in range(40)) + "</div>"
+
+    def article(title: str) -> str:
+        paragraphs = "\n".join(
+            f"<p>Paragraph {i} with <em>emphasis</em>, <code>code {i}</code> and "
+            f'<a href="/2023/day/1/input">a link</a>.</p>' for i in range(25))
+        example = "<pre><code>" + "\n".join(f"{i} {i * 7}" for i in range(30)) + "</code></pre>"
+        return f"<article class=\"day-desc\"><h2>--- {title} ---</h2>{paragraphs}\n{example}\n<p>What is it?</p></article>"
+
+    main = f"<main>{article('Day 1: Trebuchet?!')}{article('Part Two')}<p>Answer form</p></main>"
+    return head + nav + sidebar + main + "</body></html>"
+
+
+def bench(label: str, func) -> float:
+    seconds = min(timeit.repeat(func, number=20, repeat=REPEAT)) / 20
+    print(f"  {label:<34} {seconds * 1000:8.3f} ms")
+    return seconds
+
+
+def run(name: str, page: str) -> None:
+    print(f"{name} ({len(page) / 1024:.1f} KiB)")
+
+    streaming_problem = bench("streaming: both articles", lambda: extract_articles(page, limit=2))
+    streaming_submit = bench("streaming: first <p>", lambda: extract_articles(page, limit=1)[0].paragraphs[:1])
+
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        print("  beautifulsoup4 not installed, skipping comparison")
+        return
+
+    def soup_problem():
+        soup = BeautifulSoup(page, "html.parser")
+        return [article.text for article in soup.find_all("article")[:2]]
+
+    def soup_submit():
+        soup = BeautifulSoup(page, "html.parser")
+        return soup.find("article").find("p").text
+
+    soup_problem_time = bench("BeautifulSoup: both articles", soup_problem)
+    soup_submit_time = bench("BeautifulSoup: first <p>", soup_submit)
+    print(f"  speedup: {soup_problem_time / streaming_problem:.1f}x (problem), "
+          f"{soup_submit_time / streaming_submit:.1f}x (submission)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, encoding="utf-8") as f:
+                run(os.path.basename(path), f.read())
+    else:
+        run("synthetic AoC page", synthetic_page())
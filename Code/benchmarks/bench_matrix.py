@@ -0,0 +1,72 @@
+"""
+Compares the aoc_stdlib's matrix helpers with the nested-comprehension
+versions they replaced, on the kind of transition matrix puzzles use.
+
+    python Code/benchmarks/bench_matrix.py [size] [power]
+
+NumPy is used by aoc_stdlib when it is installed (see requirements-dev.txt),
+without it only the pure Python versions are compared.
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import aoc_stdlib  # noqa: E402
+
+MOD = 1_000_000_007
+REPEAT = 3
+
+
+def matmat_old(a, b):
+    n, k1 = len(a), len(a[0])
+    k2, m = len(b), len(b[0])
+    assert k1 == k2
+    return [[sum(a[i][k] * b[k][j] for k in range(k1)) for j in range(m)] for i in range(n)]
+
+
+def matexp_old(a, k, mod=None):
+    # The old helpers had no mod, reducing after each product is what
+    # solutions had to do by hand
+    n = len(a)
+    out = [[int(i == j) for j in range(n)] for i in range(n)]
+    while k > 0:
+        if k % 2 == 1:
+            out = matmat_old(a, out)
+            if mod:
+                out = [[x % mod for x in row] for row in out]
+        a = matmat_old(a, a)
+        if mod:
+            a = [[x % mod for x in row] for row in a]
+        k //= 2
+    return out
+
+
+def bench(label: str, func) -> float:
+    seconds = min(timeit.repeat(func, number=1, repeat=REPEAT))
+    print(f"  {label:<36} {seconds * 1000:9.1f} ms")
+    return seconds
+
+
+def main(size: int, power: int) -> None:
+    stdlib = vars(aoc_stdlib)
+    matrix = [[random.randrange(10) for _ in range(size)] for _ in range(size)]
+    print(f"{size}x{size} matrix to the power {power}, mod {MOD}, "
+          f"NumPy {'on' if stdlib['HAS_NUMPY'] else 'not installed'}")
+
+    expected = matexp_old(matrix, power, MOD)
+    assert stdlib["matexp"](matrix, power, MOD) == expected
+
+    old = bench("old matexp", lambda: matexp_old(matrix, power, MOD))
+    new = bench("stdlib matexp", lambda: stdlib["matexp"](matrix, power, MOD))
+
+    aoc_stdlib.matrix.HAS_NUMPY = False
+    python = bench("stdlib matexp, pure Python", lambda: stdlib["matexp"](matrix, power, MOD))
+    print(f"  speedup: {old / new:.1f}x (stdlib), {old / python:.1f}x (pure Python)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [50, 10 ** 12][len(args):]))
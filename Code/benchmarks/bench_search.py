@@ -0,0 +1,119 @@
+"""
+Compares the aoc_stdlib's search helpers with the versions they replaced
+on a large random grid.
+
+    python Code/benchmarks/bench_search.py [size]
+"""
+import heapq
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import aoc_stdlib  # noqa: E402
+
+WALL_CHANCE = 0.25
+
+
+def bfs_old(graph, start):
+    visited = set()
+    queue = deque([start])
+    result = []
+    while queue:
+        node = queue.popleft()
+        if node not in visited:
+            visited.add(node)
+            result.append(node)
+            queue.extend(graph.get(node, []))
+    return result
+
+
+def a_star_old(start, goal, neighbors, h):
+    pq = [(h(start), 0, start, [start])]
+    visited = set()
+    while pq:
+        f_score, g_score, current, path = heapq.heappop(pq)
+        if current == goal:
+            return path, g_score
+        if current in visited:
+            continue
+        visited.add(current)
+        for neighbor, cost in neighbors(current):
+            if neighbor in visited:
+                continue
+            new_g_score = g_score + cost
+            new_path = path + [neighbor]
+            heapq.heappush(pq, (new_g_score + h(neighbor),
+                                new_g_score, neighbor, new_path))
+    return None, float('inf')
+
+
+def make_grid(size: int):
+    random.seed(2024)
+    rows = [["#" if random.random() < WALL_CHANCE else "." for _ in range(size)] for _ in range(size)]
+    rows[0][0] = rows[-1][-1] = "."
+    return ["".join(row) for row in rows]
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label:<40} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main(size: int) -> None:
+    stdlib = vars(aoc_stdlib)
+    rows = make_grid(size)
+    print(f"{size}x{size} grid, {WALL_CHANCE:.0%} walls")
+
+    def point_neighbors(p):
+        r, c = p
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < size and 0 <= nc < size and rows[nr][nc] == ".":
+                yield (nr, nc), 1
+
+    graph = {(r, c): [n for n, _ in point_neighbors((r, c))]
+             for r in range(size) for c in range(size) if rows[r][c] == "."}
+    goal = (size - 1, size - 1)
+
+    def h(p):
+        return goal[0] - p[0] + goal[1] - p[1]
+
+    old_order = timed("old bfs (visited on pop)", lambda: bfs_old(graph, (0, 0)))
+    new_order = timed("stdlib bfs (visited on push)", lambda: stdlib["bfs"](graph, (0, 0)))
+    assert sorted(old_order) == sorted(new_order)
+
+    old_path, old_cost = timed("old a_star (path copy per entry)",
+                               lambda: a_star_old((0, 0), goal, point_neighbors, h))
+    new_path, new_cost = timed("stdlib a_star (parent map)",
+                               lambda: stdlib["a_star"]((0, 0), goal, point_neighbors, h))
+    assert old_cost == new_cost
+
+    dist, _ = timed("stdlib dijkstra (dict)",
+                    lambda: stdlib["dijkstra"]((0, 0), point_neighbors, goal))
+
+    grid = stdlib["Grid"](rows)
+    cells, dirs = grid.cells, grid.dirs4
+
+    def index_neighbors(i):
+        for d in dirs:
+            if cells[i + d] == ".":
+                yield i + d, 1
+
+    flat_dist, _ = timed("stdlib dijkstra_indexed (flat arrays)",
+                         lambda: stdlib["dijkstra_indexed"](
+                             len(cells), grid.index(0, 0), index_neighbors, grid.index(*goal)))
+    if old_cost != float("inf"):
+        assert flat_dist[grid.index(*goal)] == dist[goal] == old_cost
+        print(f"  shortest path: {old_cost} steps")
+    else:
+        print("  goal unreachable on this grid")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
@@ -0,0 +1,97 @@
+"""
+Compares the aoc_stdlib's UnionFind and prime sieve with the versions
+they replaced.
+
+    python Code/benchmarks/bench_union_sieve.py [n]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import aoc_stdlib  # noqa: E402
+
+
+class UnionFindOld:
+    def __init__(self, n: int):
+        self.n = n
+        self.parents = [None] * n
+        self.ranks = [1] * n
+        self.num_sets = n
+
+    def find(self, i: int) -> int:
+        p = self.parents[i]
+        if p is None:
+            return i
+        p = self.find(p)
+        self.parents[i] = p
+        return p
+
+    def merge(self, i: int, j: int) -> None:
+        i = self.find(i)
+        j = self.find(j)
+        if i == j:
+            return
+        if self.ranks[i] < self.ranks[j]:
+            self.parents[i] = j
+        elif self.ranks[i] > self.ranks[j]:
+            self.parents[j] = i
+        else:
+            self.parents[j] = i
+            self.ranks[i] += 1
+        self.num_sets -= 1
+
+
+def primes_old(limit: int):
+    if limit < 2:
+        return []
+    sieve = [True] * (limit + 1)
+    sieve[0] = sieve[1] = False
+    for start in range(2, int(limit**0.5) + 1):
+        if sieve[start]:
+            for multiple in range(start * start, limit + 1, start):
+                sieve[multiple] = False
+    return [num for num, is_prime in enumerate(sieve) if is_prime]
+
+
+def measure(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    # Timed and traced separately, tracing slows everything down a lot
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<32} {elapsed * 1000:9.1f} ms {peak / 2 ** 20:8.1f} MiB peak")
+    return result
+
+
+def union_workload(cls, n: int, pairs):
+    uf = cls(n)
+    for i, j in pairs:
+        uf.merge(i, j)
+    return uf.num_sets
+
+
+def main(n: int) -> None:
+    stdlib = vars(aoc_stdlib)
+
+    print(f"Sieve up to {n:,}")
+    old = measure("old list-of-bools sieve", lambda: primes_old(n))
+    new = measure("stdlib bytearray sieve", lambda: stdlib["allPrimesToX"](n))
+    assert old == new
+
+    random.seed(7)
+    pairs = [(random.randrange(n), random.randrange(n)) for _ in range(n)]
+    print(f"UnionFind, {n:,} elements and {n:,} random merges")
+    old_sets = measure("old recursive UnionFind", lambda: union_workload(UnionFindOld, n, pairs))
+    new_sets = measure("stdlib array UnionFind", lambda: union_workload(stdlib["UnionFind"], n, pairs))
+    assert old_sets == new_sets
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -1,14 +1,52 @@
 import os
 import json
 import hashlib
+from typing import Optional
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSplitter, QComboBox, QPushButton, QTextEdit, QMessageBox, QColorDialog
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QColor
-import config.config as config
+from config.preferences_store import PreferencesStore
+from config.themes import theme_engine
+
+EDITOR_FONT_SIZE = 15
+
+
+def create_store(token: str) -> PreferencesStore:
+    """Load a user's preferences without building the Preferences window."""
+    user_id = hashlib.sha256(token.encode()).hexdigest()
+    path = os.path.join("user_files", user_id, "preferences.json")
+    template = Preferences.get_template()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            f.write(template)
+
+    store = PreferencesStore(path, json.loads(template))
+    try:
+        store.load()
+    except Exception as e:
+        print(f"Error loading your preferences: {e}")
+    return store
+
+
+def apply_editor_style(store: PreferencesStore, editor: QWidget) -> None:
+    themes = theme_engine()
+    prefs = "code_editor_preferences"
+    themes.apply(editor, themes.stylesheet(
+        store.get(prefs, "Theme"), store.get(prefs, "CustomTheme", "#c2cbc8"), "#000000"))
+    themes.apply_font(editor, store.get(prefs, "Font"), EDITOR_FONT_SIZE)
+
+
+def apply_console_style(store: PreferencesStore, console: QWidget) -> None:
+    themes = theme_engine()
+    prefs = "console_preferences"
+    themes.apply(console, themes.stylesheet(
+        store.get(prefs, "Theme"), store.get(prefs, "CustomTheme", "#000000"), "#ffffff"))
 
 
 class Preferences(QWidget):
-    def __init__(self, editor: QTextEdit, console: QTextEdit, token: str) -> None:
+    def __init__(self, editor: QTextEdit, console: QTextEdit, token: str,
+                 store: Optional[PreferencesStore] = None) -> None:
         super().__init__()
 
         self.editor = editor
@@ -16,10 +54,13 @@ class Preferences(QWidget):
         self.token = token
         self.user_id = self.generate_user_id(token)
         self.preferences_dir = os.path.join("user_files", self.user_id)
-        self.preferences_path = os.path.join(
-            self.preferences_dir, "preferences.json")
 
         self.default_template = self.get_template()
+        # All reads and writes go through the store, the json file is only
+        # touched when loading and by the store's debounced writer
+        self.store = store or PreferencesStore(
+            os.path.join(self.preferences_dir, "preferences.json"),
+            json.loads(self.default_template))
         self.add_user()
         self.setWindowTitle("Preferences")
         self.setGeometry(300, 300, 400, 200)
@@ -37,9 +78,11 @@ class Preferences(QWidget):
         main_layout.addWidget(save)
         self.setLayout(main_layout)
 
-        self.load_file()  # sync dropdowns with saved prefs
-        self.apply_editor_preferences()
-        self.apply_console_preferences()
+        # sync dropdowns with saved prefs and apply them
+        if self.store.loaded:
+            self.sync_from_store()
+        else:
+            self.load_file()
 
     def create_editor_preferences_panel(self) -> QWidget:
         panel = QWidget()
@@ -86,6 +129,14 @@ class Preferences(QWidget):
     def generate_user_id(self, token: str) -> str:
         return hashlib.sha256(token.encode()).hexdigest()
 
+    @property
+    def preferences_path(self) -> str:
+        return self.store.path
+
+    @preferences_path.setter
+    def preferences_path(self, path: str) -> None:
+        self.store.path = path
+
     def add_user(self) -> None:
         os.makedirs(self.preferences_dir, exist_ok=True)
         if not os.path.exists(self.preferences_path):
@@ -94,29 +145,33 @@ class Preferences(QWidget):
 
     def load_file(self) -> None:
         try:
-            with open(self.preferences_path, "r") as f:
-                preferences = json.load(f)
-
-            self.editor_font.setCurrentText(
-                preferences["code_editor_preferences"]["Font"])
-
-            code_theme = preferences["code_editor_preferences"]["Theme"]
-            self.editor_theme.setCurrentText(
-                "Custom" if code_theme == "Custom" else code_theme)
-
-            console_theme = preferences["console_preferences"]["Theme"]
-            self.console_theme.setCurrentText(
-                "Custom" if console_theme == "Custom" else console_theme)
-
+            self.store.load()
         except Exception as e:
             QMessageBox.warning(
                 self, "Error loading your preferences:", str(e))
+            self.apply_editor_preferences()
+            self.apply_console_preferences()
+            return
+
+        self.sync_from_store()
+
+    def sync_from_store(self) -> None:
+        # Sync the dropdowns without each one triggering its own preview
+        combos = {
+            self.editor_font: self.store.get("code_editor_preferences", "Font"),
+            self.editor_theme: self.store.get("code_editor_preferences", "Theme"),
+            self.console_theme: self.store.get("console_preferences", "Theme"),
+        }
+        for combo, value in combos.items():
+            combo.blockSignals(True)
+            combo.setCurrentText(value)
+            combo.blockSignals(False)
+
+        self.apply_editor_preferences()
+        self.apply_console_preferences()
 
     def save_file(self) -> None:
         try:
-            with open(self.preferences_path, "r") as f:
-                preferences = json.load(f)
-
             eTheme = self.editor_theme.currentText()
             eFont = self.editor_font.currentText()
             cTheme = self.console_theme.currentText()
@@ -126,17 +181,13 @@ class Preferences(QWidget):
             if cTheme == "Change Custom":
                 cTheme = "Custom"
 
-            preferences["code_editor_preferences"]["Theme"] = eTheme
-            preferences["code_editor_preferences"]["Font"] = eFont
-            preferences["code_editor_preferences"].setdefault(
-                "CustomTheme", "#c2cbc8")
+            self.store.set("code_editor_preferences", "Theme", eTheme)
+            self.store.set("code_editor_preferences", "Font", eFont)
+            self.store.set("console_preferences", "Theme", cTheme)
+            self.store.save()
 
-            preferences["console_preferences"]["Theme"] = cTheme
-            preferences["console_preferences"].setdefault(
-                "CustomTheme", "#000000")
-
-            with open(self.preferences_path, "w") as f:
-                json.dump(preferences, f, indent=4)
+            if self.store.writer.last_error:
+                raise self.store.writer.last_error
 
             QMessageBox.information(
                 self, "Success", "Preferences saved successfully!")
@@ -147,67 +198,38 @@ class Preferences(QWidget):
                 self, "Error", f"Failed to save your preferences: {str(e)}")
 
     def apply_editor_preferences(self) -> None:
-        with open(self.preferences_path, "r") as f:
-            prefs = json.load(f)
-
         selected_theme = self.editor_theme.currentText()
-        custom_hex = prefs["code_editor_preferences"].get(
-            "CustomTheme", "#c2cbc8")
-        prefs["code_editor_preferences"]["Theme"] = selected_theme
-        prefs["code_editor_preferences"]["Font"] = self.editor_font.currentText()
 
         if selected_theme == "Change Custom":
             color = QColorDialog.getColor()
             if not color.isValid():
                 return
-            custom_hex = color.name()
-            prefs["code_editor_preferences"]["CustomTheme"] = custom_hex
+            self.store.set("code_editor_preferences",
+                           "CustomTheme", color.name())
             selected_theme = "Custom"
             self.editor_theme.setCurrentText("Custom")
 
-        if selected_theme == "Custom":
-            self.editor.setStyleSheet(
-                f"background-color: {custom_hex}; color: #000000;")
-        else:
-            self.editor.setStyleSheet(config.THEMES.get(
-                selected_theme, config.THEMES["Default"]))
-
-        font = QFont(self.editor_font.currentText(), 15)
-        font.setFixedPitch(True)
-        self.editor.setFont(font)
-
-        with open(self.preferences_path, "w") as f:
-            json.dump(prefs, f, indent=4)
+        self.store.set("code_editor_preferences", "Theme", selected_theme)
+        self.store.set("code_editor_preferences", "Font",
+                       self.editor_font.currentText())
+        apply_editor_style(self.store, self.editor)
 
     def apply_console_preferences(self) -> None:
-        with open(self.preferences_path, "r") as f:
-            prefs = json.load(f)
-
         selected_theme = self.console_theme.currentText()
-        custom_hex = prefs["console_preferences"].get("CustomTheme", "#000000")
-
-        prefs["console_preferences"]["Theme"] = selected_theme
 
         if selected_theme == "Change Custom":
             color = QColorDialog.getColor()
             if not color.isValid():
                 return
-            custom_hex = color.name()
-            prefs["console_preferences"]["CustomTheme"] = custom_hex
+            self.store.set("console_preferences", "CustomTheme", color.name())
             selected_theme = "Custom"
             self.console_theme.setCurrentText("Custom")
 
-        if selected_theme == "Custom":
-            self.console.setStyleSheet(
-                f"background-color: {custom_hex}; color: #ffffff;")
-        else:
-            self.console.setStyleSheet(config.THEMES.get(
-                selected_theme, config.THEMES["Default"]))
-
-        with open(self.preferences_path, "w") as f:
-            json.dump(prefs, f, indent=4)
+        self.store.set("console_preferences", "Theme", selected_theme)
+        apply_console_style(self.store, self.console)
 
-    def get_template(self) -> str:
+    @staticmethod
+    def get_template() -> str:
         return json.dumps({
             "code_editor_preferences": {
                 "Theme": "Default",
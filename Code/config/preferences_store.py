@@ -0,0 +1,109 @@
+import copy
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from core.file_io import DebouncedWriter
+
+SAVE_DELAY_MS = 300
+
+
+class PreferencesStore(QObject):
+    """
+    In-memory preferences model backed by preferences.json.
+    The file is read once by load(); set() only touches memory, notifies
+    observers through `changed` and schedules a debounced atomic write.
+    When writing, only the keys this store changed are merged into whatever
+    is on disk at that moment, under a lock file shared by every process,
+    so two windows editing different settings don't overwrite each other.
+    """
+
+    # section, key, new value
+    changed = Signal(str, str, object)
+
+    def __init__(self, path: str, defaults: Dict[str, Dict[str, Any]],
+                 delay_ms: int = SAVE_DELAY_MS, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.defaults = defaults
+        self.data: Dict[str, Dict[str, Any]] = copy.deepcopy(defaults)
+        self.loaded = False
+        # Keys changed since the last successful write. set() adds to it on
+        # the GUI thread and the writer thread removes what it wrote, so both
+        # hold the lock while touching it. A failed write leaves them here,
+        # the next write tries them again.
+        self._dirty: Dict[Tuple[str, str], Any] = {}
+        self._dirty_lock = threading.Lock()
+        self.writer = DebouncedWriter(
+            path, delay_ms, serialize=self._merge_with_disk, parent=self,
+            lock_file=True, written=self._forget_written)
+
+    @property
+    def path(self) -> str:
+        return self.writer.path
+
+    @path.setter
+    def path(self, value: str) -> None:
+        self.writer.path = value
+
+    def load(self) -> None:
+        """Read preferences from disk. Raises if the file is missing or invalid."""
+        with open(self.path, "r") as f:
+            saved = json.load(f)
+
+        data = copy.deepcopy(self.defaults)
+        for section, values in saved.items():
+            data.setdefault(section, {}).update(values)
+        self.data = data
+        self.loaded = True
+        with self._dirty_lock:
+            self._dirty.clear()
+        self.writer.mark_saved(json.dumps(saved, indent=4))
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        return self.data.get(section, {}).get(key, default)
+
+    def set(self, section: str, key: str, value: Any) -> None:
+        values = self.data.setdefault(section, {})
+        if key in values and values[key] == value:
+            return
+        values[key] = value
+        with self._dirty_lock:
+            self._dirty[(section, key)] = value
+            pending = dict(self._dirty)
+        self.changed.emit(section, key, value)
+        self.writer.schedule(pending)
+
+    def save(self) -> None:
+        """
+        Write now, used by the explicit Save button. Only the keys changed
+        here are written, settings saved by another window stay as they are.
+        """
+        with self._dirty_lock:
+            pending = dict(self._dirty)
+        self.writer.schedule(pending)
+        self.flush()
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def _merge_with_disk(self, changes: Dict[Tuple[str, str], Any]) -> str:
+        # Runs on the writer thread: start from the latest file so settings
+        # saved by another window in the meantime are kept.
+        try:
+            with open(self.path, "r") as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = copy.deepcopy(self.defaults)
+
+        for (section, key), value in changes.items():
+            current.setdefault(section, {})[key] = value
+        return json.dumps(current, indent=4)
+
+    def _forget_written(self, changes: Dict[Tuple[str, str], Any]) -> None:
+        # Keys changed again since this snapshot still need writing
+        with self._dirty_lock:
+            for (section, key), value in changes.items():
+                if self._dirty.get((section, key), object()) == value:
+                    self._dirty.pop((section, key), None)
@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QWidget
+
+import config.config as config
+
+# Dynamic property used to remember which stylesheet a widget already has
+APPLIED_THEME_PROPERTY = "aocodeAppliedTheme"
+APPLIED_FONT_PROPERTY = "aocodeAppliedFont"
+
+
+class ThemeEngine:
+    """
+    Precompiles every theme in config.THEMES once and hands out the cached
+    stylesheets and fonts. apply() skips widgets that already carry the
+    requested stylesheet, since every setStyleSheet call makes Qt re-polish
+    the whole widget subtree even when nothing changed.
+    """
+
+    def __init__(self, themes: Optional[Dict[str, str]] = None) -> None:
+        themes = config.THEMES if themes is None else themes
+        self.stylesheets: Dict[str, str] = dict(themes)
+        self.default = self.stylesheets.get(
+            "Default", next(iter(self.stylesheets.values()), ""))
+        self._custom: Dict[Tuple[str, str], str] = {}
+        self._fonts: Dict[Tuple[str, int], QFont] = {}
+
+    def stylesheet(self, name: str, custom_background: str = "#c2cbc8",
+                   custom_foreground: str = "#000000") -> str:
+        if name != "Custom":
+            return self.stylesheets.get(name, self.default)
+
+        key = (custom_background, custom_foreground)
+        if key not in self._custom:
+            self._custom[key] = (f"background-color: {custom_background}; "
+                                 f"color: {custom_foreground};")
+        return self._custom[key]
+
+    def font(self, family: str, size: int) -> QFont:
+        key = (family, size)
+        if key not in self._fonts:
+            font = QFont(family, size)
+            font.setFixedPitch(True)
+            self._fonts[key] = font
+        return self._fonts[key]
+
+    def apply(self, widget: QWidget, stylesheet: str) -> bool:
+        """Apply a stylesheet unless the widget already has it. Returns whether it changed."""
+        if widget.property(APPLIED_THEME_PROPERTY) == stylesheet:
+            return False
+
+        # Hold repaints until the new style is in place to avoid flicker
+        widget.setUpdatesEnabled(False)
+        try:
+            widget.setStyleSheet(stylesheet)
+            widget.setProperty(APPLIED_THEME_PROPERTY, stylesheet)
+        finally:
+            widget.setUpdatesEnabled(True)
+        return True
+
+    def apply_font(self, widget: QWidget, family: str, size: int) -> bool:
+        key = f"{family}:{size}"
+        if widget.property(APPLIED_FONT_PROPERTY) == key:
+            return False
+        widget.setFont(self.font(family, size))
+        widget.setProperty(APPLIED_FONT_PROPERTY, key)
+        return True
+
+
+@lru_cache(maxsize=None)
+def theme_engine() -> ThemeEngine:
+    return ThemeEngine()
@@ -0,0 +1,53 @@
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import config.config as config
+from core.file_io import atomic_write
+
+ANSWERS_FILE_NAME = "answers.json"
+
+# Submissions record answers from a worker thread
+_lock = threading.Lock()
+
+
+def answers_path(user_id: Optional[str] = None) -> str:
+    user = user_id or config.HASHED_TOKEN or "anonymous"
+    return os.path.join("user_files", user, ANSWERS_FILE_NAME)
+
+
+def load_answers(user_id: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Every accepted answer, as {year: {day: {part: answer}}}."""
+    try:
+        with open(answers_path(user_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def day_answers(year: int, day: int, user_id: Optional[str] = None) -> Dict[int, str]:
+    parts = load_answers(user_id).get(str(year), {}).get(str(int(day)), {})
+    return {int(part): answer for part, answer in parts.items()}
+
+
+def record_answers(year: int, day: int, answers: Dict[int, str],
+                   user_id: Optional[str] = None) -> None:
+    """
+    Remembers answers AoC accepted, by part, so old solutions can be
+    re-checked. The file is only written when one of them is new.
+    """
+    new = {str(int(part)): answer.strip() for part, answer in answers.items()}
+    with _lock:
+        stored = load_answers(user_id)
+        parts = stored.setdefault(str(year), {}).setdefault(str(int(day)), {})
+        if all(parts.get(part) == answer for part, answer in new.items()):
+            return
+        parts.update(new)
+        atomic_write(answers_path(user_id), json.dumps(stored, indent=2, sort_keys=True))
+
+
+def record_answer(year: int, day: int, part: int, answer: str,
+                  user_id: Optional[str] = None) -> None:
+    """Remembers an answer AoC accepted so old solutions can be re-checked."""
+    record_answers(year, day, {part: answer}, user_id)
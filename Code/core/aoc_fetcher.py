@@ -1,40 +1,92 @@
-import requests
-from bs4 import BeautifulSoup
+import html
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
 
+from core.answers import record_answers
+from core.cache import day_cache_dir
+from core.file_io import atomic_write
+from core.html_extract import AOC_URL, extract_articles
+from core.startup_profile import lazy_import
 
-from typing import List, Tuple
+PROBLEM_CACHE_FILE = "problem.json"
+INPUT_CACHE_FILE = "input.txt"
 
+PART2_UNAVAILABLE = "Part 2 not available yet. Complete Part 1 first!"
+NO_PROBLEM = "No problem available for today."
+# Shown after each article once that part is solved, outside the articles
+PUZZLE_ANSWER = re.compile(r"Your puzzle answer was <code>(.*?)</code>", re.DOTALL)
 
-def fetch_problem(year: int, day: int, session_cookie: str) -> Tuple[List[str], str]:
-    url = f"https://adventofcode.com/{year}/day/{day}"
+
+@dataclass
+class Problem:
+    """A day's problem with all display text worked out once per fetch."""
+    parts: List[str]
+    html: List[str] = field(default_factory=list)
+    formatted: List[str] = field(default_factory=list)
+    hints: List[str] = field(default_factory=list)
+    error: str = ""
+    # The user's accepted answers shown on the page, Part 1 first
+    answers: List[str] = field(default_factory=list)
+
+
+# Problems are only cached once both parts are out, until then Part 2 can
+# unlock at any time and has to be fetched again
+_problems: Dict[Tuple[int, int], Problem] = {}
+
+
+def fetch_problem_page(year: int, day: int, session_cookie: str) -> Tuple[str, str]:
+    url = f"{AOC_URL}/{year}/day/{day}"
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                "AppleWebKit/537.36 (KHTML, like Gecko) "
                "Chrome/96.0.4664.110 Safari/537.36"
                }
+    requests = lazy_import("requests")
     s = requests.Session()
     s.headers.update(headers)
     s.cookies.set("session", session_cookie)
     response = s.get(url)
 
     if response.status_code != 200:
-        return ["", ""], "Could not fetch Part 1. Is it in the future?"
+        return "", "Could not fetch Part 1. Is it in the future?"
+    return response.text, ""
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    articles = soup.find_all("article")
 
-    parts = []
-    for _, article in enumerate(articles):
-        article_text = article.text if article.text else ""
-        parts.append(article_text)
+def parse_problem_page(page: str) -> Tuple[List[str], List[str]]:
+    """Returns the text and sanitized HTML of the first two <article>s."""
+    articles = extract_articles(page, limit=2)
 
-    parts = parts[:2]
-    if len(parts) < 2:
-        parts.append("")
-    return parts, ""
+    texts = [article.text for article in articles]
+    fragments = [article.html for article in articles]
+    while len(texts) < 2:
+        texts.append("")
+        fragments.append("")
+    return texts, fragments
 
 
-def fetch_input(year: int, day: int, session_cookie: str) -> str:
+def parse_answers(page: str) -> List[str]:
+    """The answers the page shows as accepted, Part 1 first."""
+    return [html.unescape(answer) for answer in PUZZLE_ANSWER.findall(page)]
+
+
+def fetch_problem(year: int, day: int, session_cookie: str) -> Tuple[List[str], str]:
+    page, error = fetch_problem_page(year, day, session_cookie)
+    if error:
+        return ["", ""], error
+    texts, _ = parse_problem_page(page)
+    return texts, ""
+
+
+def input_cache_path(year: int, day: int) -> str:
+    return os.path.join(day_cache_dir(year, day), INPUT_CACHE_FILE)
+
+
+def download_input(year: int, day: int, session_cookie: str) -> Tuple[str, str]:
+    """Fetch an input and cache it on disk. Returns (path, error)."""
     url = f"https://adventofcode.com/{year}/day/{day}/input"
+    requests = lazy_import("requests")
     session = requests.Session()
 
     session.headers.update({
@@ -44,12 +96,129 @@ def fetch_input(year: int, day: int, session_cookie: str) -> str:
     session.cookies.set('session', session_cookie, domain='adventofcode.com')
     response = session.get(url)
 
-    if response.status_code == 200:
-        return response.text
-    else:
-        return f"Failed to fetch input for {year} day {day}. Are you sure it's unlocked?"
+    if response.status_code != 200:
+        return "", f"Failed to fetch input for {year} day {day}. Are you sure it's unlocked?"
+
+    path = input_cache_path(year, day)
+    atomic_write(path, response.text)
+    return path, ""
+
+
+def ensure_input_file(year: int, day: int, session_cookie: str) -> Tuple[str, str]:
+    """
+    Path of the cached input, downloading it the first time. Inputs never
+    change once a day is unlocked, so the cache is never refreshed.
+    """
+    path = input_cache_path(year, day)
+    if os.path.exists(path):
+        return path, ""
+    return download_input(year, day, session_cookie)
+
+
+def fetch_input(year: int, day: int, session_cookie: str) -> str:
+    path, error = ensure_input_file(year, day, session_cookie)
+    if error:
+        return error
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
 
 
 def get_last_paragraph(text: str) -> str:
-    paragraphs = [p for p in text.split('\n') if p.strip()]
-    return paragraphs[-1] if paragraphs else ''
+    # Walk backwards line by line instead of splitting the whole text
+    end = len(text)
+    while end >= 0:
+        start = text.rfind('\n', 0, end) + 1
+        line = text[start:end]
+        if line.strip():
+            return line
+        end = start - 1
+    return ''
+
+
+def add_newlines_after_second_dash(text: str) -> str:
+    """Add two newlines after the second occurrence of '---' in the text."""
+    first = text.find("---")
+    if first == -1:
+        return text
+    second = text.find("---", first + 3)
+    if second == -1:
+        return text
+    split = second + 3
+    return text[:split] + "\n\n" + text[split:]
+
+
+def format_problem(parts: List[str], error: str = "",
+                   fragments: Optional[List[str]] = None) -> Problem:
+    """Single pass over the fetched text producing the panel text and hints for each part."""
+    problem = Problem(parts=parts, html=list(fragments or ["", ""]), error=error)
+    part1_text = parts[0] if len(parts) > 0 else ""
+    part2_text = parts[1] if len(parts) > 1 else ""
+
+    if part1_text:
+        problem.formatted = [
+            add_newlines_after_second_dash(part1_text),
+            add_newlines_after_second_dash(part2_text) if part2_text else PART2_UNAVAILABLE,
+        ]
+    else:
+        problem.formatted = [NO_PROBLEM, ""]
+    problem.hints = [get_last_paragraph(text) for text in problem.formatted]
+    return problem
+
+
+def load_problem(year: int, day: int, session_cookie: str) -> Problem:
+    """
+    Fetch, parse and format a problem. Once both parts are out the result is
+    kept in memory and on disk, so a day's page is only parsed once.
+    """
+    key = (year, day)
+    if key in _problems:
+        return _problems[key]
+
+    cache_path = os.path.join(day_cache_dir(year, day), PROBLEM_CACHE_FILE)
+    problem = read_cached_problem(cache_path)
+    if problem is not None:
+        _problems[key] = problem
+        _record_answers(year, day, problem)
+        return problem
+
+    page, error_msg = fetch_problem_page(year, day, session_cookie)
+    if error_msg:
+        return format_problem(["", ""], error_msg)
+
+    texts, fragments = parse_problem_page(page)
+    problem = format_problem(texts, "", fragments)
+    problem.answers = parse_answers(page)
+    _record_answers(year, day, problem)
+    if all(texts):
+        _problems[key] = problem
+        try:
+            atomic_write(cache_path, json.dumps(asdict(problem)))
+        except OSError as e:
+            print(f"Error: Could not cache the problem: {e}")
+    return problem
+
+
+def _record_answers(year: int, day: int, problem: Problem) -> None:
+    # Days solved on the website or before answers were kept are only
+    # known from the page, the regression runner needs them too
+    if not problem.answers:
+        return
+    try:
+        record_answers(year, day, dict(enumerate(problem.answers, 1)))
+    except OSError as e:
+        print(f"Error: Could not record the answers: {e}")
+
+
+def read_cached_problem(path: str) -> Optional[Problem]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return Problem(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def invalidate_problem(year: int, day: int) -> None:
+    _problems.pop((year, day), None)
+    cache_path = os.path.join(day_cache_dir(year, day), PROBLEM_CACHE_FILE)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
@@ -0,0 +1,17 @@
+import os
+
+import config.config as config
+
+CACHE_DIR_NAME = "cache"
+
+
+def user_cache_dir(*parts: str) -> str:
+    """Directory under the current user's files for cached data, created if missing."""
+    user = config.HASHED_TOKEN or "anonymous"
+    path = os.path.join("user_files", user, CACHE_DIR_NAME, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def day_cache_dir(year: int, day: int) -> str:
+    return user_cache_dir(str(year), f"{int(day):02d}")
@@ -0,0 +1,58 @@
+"""
+The long-lived interpreter behind the editor's cell mode.
+
+Each request on stdin is one JSON line holding a cell's source. The cell
+runs in a namespace that is kept between requests, and one JSON line comes
+back with what it printed. Like parsed_input, this runs in the solution's
+process and only uses the standard library.
+"""
+import io
+import json
+import linecache
+import os
+import sys
+import time
+import traceback
+
+
+def run_cell(source: str, name: str, namespace: dict) -> dict:
+    # Registered so tracebacks can show the cell's lines
+    lines = source.splitlines(keepends=True)
+    linecache.cache[name] = (len(source), None, lines, name)
+
+    output = io.StringIO()
+    ok, error = True, ""
+    start = time.perf_counter()
+    sys.stdout = output
+    try:
+        exec(compile(source, name, "exec"), namespace)
+    except KeyboardInterrupt:
+        raise
+    except BaseException as e:
+        ok = False
+        # Leave out this function's own frame
+        error = "".join(traceback.format_exception(type(e), e, e.__traceback__.tb_next))
+    finally:
+        sys.stdout = sys.__stdout__
+    return {"ok": ok, "stdout": output.getvalue(), "error": error,
+            "seconds": time.perf_counter() - start}
+
+
+def main() -> None:
+    # Replies get their own copy of stdout, anything else written to fd 1
+    # goes to stderr so it cannot break the protocol
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    requests = sys.stdin
+    sys.stdin = io.StringIO()
+
+    namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+    for line in requests:
+        request = json.loads(line)
+        reply = run_cell(request["source"], request["name"], namespace)
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Cell mode: `# %%` lines split a solution into cells that run one after
+another in a worker process that keeps its variables between runs. When
+the code is run again only the cells that changed, and the cells that
+depend on them, are run, so slow parsing at the top is not redone while
+the last step is being tweaked.
+"""
+import ast
+import json
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+import config.config as config
+from core.aoc_fetcher import ensure_input_file
+from core.cache import day_cache_dir
+from core.interpreters import Interpreter, current
+from core.runner import SOLUTION_TIMEOUT, input_prelude, kill_process_group, solution_env
+
+CELL_MARKER = re.compile(r"^# ?%%")
+WORKER_EXITED = {"ok": False, "stdout": "", "error": ""}
+
+# Calls that change the object they are called on
+MUTATING_METHODS = frozenset({
+    "append", "appendleft", "extend", "extendleft", "insert", "pop", "popleft",
+    "popitem", "remove", "discard", "add", "update", "setdefault", "clear",
+    "sort", "reverse", "rotate", "difference_update", "intersection_update",
+    "symmetric_difference_update",
+})
+
+
+@dataclass
+class Cell:
+    source: str
+    # Line of the cell's first line in the whole file, from 0
+    start_line: int
+
+
+@dataclass
+class CellNames:
+    defines: Set[str] = field(default_factory=set)
+    uses: Set[str] = field(default_factory=set)
+    # Names whose objects the cell changes in place, e.g. grid[y][x] = "#"
+    mutates: Set[str] = field(default_factory=set)
+
+
+def split_cells(code: str) -> List[Cell]:
+    """Cells of the code. Each `# %%` line starts a new cell, code before the first is a cell too."""
+    cells: List[Cell] = []
+    lines = code.splitlines(keepends=True)
+    start = 0
+    for number, line in enumerate(lines):
+        if CELL_MARKER.match(line) and number > start:
+            cells.append(Cell("".join(lines[start:number]), start))
+            start = number
+    cells.append(Cell("".join(lines[start:]), start))
+    return [cell for cell in cells if cell.source.strip()] or [Cell(code, 0)]
+
+
+def _base_name(node: ast.AST) -> Optional[str]:
+    while isinstance(node, (ast.Subscript, ast.Attribute)):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _top_level_defines(statements: List[ast.stmt], names: Set[str]) -> None:
+    for statement in statements:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(statement.name)
+            continue
+        if isinstance(statement, (ast.Import, ast.ImportFrom)):
+            for alias in statement.names:
+                names.add((alias.asname or alias.name).split(".")[0])
+            continue
+        # Assignments, loop and with targets, also inside if/for/while/try
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                names.add(node.id)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(node.name)
+
+
+def analyse(source: str) -> Optional[CellNames]:
+    """Names a cell defines, reads and changes, or None if it does not parse."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+
+    names = CellNames()
+    _top_level_defines(tree.body, names.defines)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            # Reads inside function bodies count, the function sees the
+            # current value whenever it is called
+            names.uses.add(node.id)
+        elif isinstance(node, ast.Global):
+            names.defines.update(node.names)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+            names.uses.add(node.target.id)
+        elif isinstance(node, (ast.Subscript, ast.Attribute)) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            base = _base_name(node)
+            if base:
+                names.mutates.add(base)
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+              and node.func.attr in MUTATING_METHODS):
+            base = _base_name(node.func.value)
+            if base:
+                names.mutates.add(base)
+    return names
+
+
+def plan_reruns(cells: List[Cell], previous: List[Optional[str]]) -> List[int]:
+    """
+    Indices of the cells to run, in order. previous holds each cell's source
+    as of its last successful run, None for cells that need running anyway.
+    A cell runs when it changed, when it reads a name set by a cell that
+    runs before it, or when a running cell changes objects it created or
+    rebinds a name it set from its old value (x += 1), since running that
+    later cell again on top of its own earlier result would give a
+    different one.
+    """
+    infos = [analyse(cell.source) for cell in cells]
+    rerun = {i for i, cell in enumerate(cells)
+             if i >= len(previous) or previous[i] != cell.source or infos[i] is None}
+
+    while True:
+        changed: Set[str] = set()
+        for i, info in enumerate(infos):
+            if info is not None and info.uses & changed:
+                rerun.add(i)
+            if i in rerun and info is not None:
+                changed |= info.defines | info.mutates
+
+        extra = set()
+        for i in rerun:
+            if infos[i] is None:
+                continue
+            # A cell reading and setting the same name builds on its last value
+            for name in infos[i].mutates | (infos[i].uses & infos[i].defines):
+                for j in range(i - 1, -1, -1):
+                    if infos[j] is not None and name in infos[j].defines:
+                        extra.add(j)
+                        break
+        if extra <= rerun:
+            return sorted(rerun)
+        rerun |= extra
+
+
+@dataclass
+class CellRun:
+    output: str
+    ran: List[int]
+    cell_count: int
+    ok: bool = True
+
+
+class CellSession:
+    """
+    A worker process holding the namespace of the current solution, plus
+    what each cell printed last time so skipped cells still show output.
+    The worker is started again when the utils code, the input or the
+    interpreter changes.
+    """
+
+    def __init__(self, timeout: float = SOLUTION_TIMEOUT) -> None:
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self._replies: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._setup: Optional[str] = None
+        self._interpreter: Optional[str] = None
+        self._sources: List[Optional[str]] = []
+        self._outputs: List[str] = []
+
+    def run(self, code: str, utils_content: str, input_path: str, cache_dir: str,
+            restart: bool = False, interpreter: str = sys.executable) -> CellRun:
+        cells = split_cells(code)
+        setup = f"{utils_content}\n{input_prelude(input_path, cache_dir)}"
+        if (restart or setup != self._setup or interpreter != self._interpreter
+                or not self.alive()):
+            error = self._start(setup, interpreter)
+            if error:
+                return CellRun(error, [], len(cells), ok=False)
+
+        to_run = plan_reruns(cells, self._sources)
+        sources: List[Optional[str]] = [cell.source for cell in cells]
+        outputs = (self._outputs + [""] * len(cells))[:len(cells)]
+        ran: List[int] = []
+        error = ""
+        for i in to_run:
+            # Padding keeps line numbers in tracebacks the same as the editor's
+            reply = self._request("\n" * cells[i].start_line + cells[i].source, f"<cell {i + 1}>")
+            if reply is None or reply is WORKER_EXITED:
+                if reply is None:
+                    error = f"Cell {i + 1} was stopped after {self.timeout:g} seconds."
+                else:
+                    error = f"The worker exited while running cell {i + 1}."
+                error += " The next run starts from a fresh worker.\n"
+                self.stop()
+                sources = [None] * len(cells)
+                break
+            ran.append(i)
+            outputs[i] = reply["stdout"]
+            if not reply["ok"]:
+                error = reply["error"]
+                for j in to_run[to_run.index(i):]:
+                    sources[j] = None
+                break
+
+        self._sources = sources
+        self._outputs = outputs
+        if error:
+            # Nothing after the cell that failed has run
+            outputs = outputs[:ran[-1] + 1] if ran else []
+        return CellRun("".join(outputs) + error, ran, len(cells), ok=not error)
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self) -> None:
+        if self.process is not None:
+            kill_process_group(self.process)
+            self.process.wait()
+            self.process = None
+        self._setup = None
+        self._interpreter = None
+        self._sources = []
+        self._outputs = []
+
+    def _start(self, setup: str, interpreter: str) -> str:
+        self.stop()
+        try:
+            self.process = subprocess.Popen(
+                [interpreter, "-m", "core.cell_worker"], stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                encoding="utf-8", env=solution_env(), start_new_session=os.name == "posix")
+        except OSError as e:
+            return f"Error: Could not start {interpreter}: {e}\n"
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read_replies, args=(self.process, self._replies),
+                         daemon=True).start()
+
+        reply = self._request(setup, "<utils>")
+        if reply is None or not reply["ok"]:
+            self.stop()
+            return "Error: Could not set up the cell worker\n" + (reply["error"] if reply else "")
+        self._setup = setup
+        self._interpreter = interpreter
+        return ""
+
+    def _request(self, source: str, name: str) -> Optional[dict]:
+        """The worker's reply, WORKER_EXITED if it died, or None if it timed out."""
+        try:
+            self.process.stdin.write(json.dumps({"source": source, "name": name}) + "\n")
+            self.process.stdin.flush()
+            reply = self._replies.get(timeout=self.timeout)
+        except OSError:
+            return WORKER_EXITED
+        except queue.Empty:
+            return None
+        return WORKER_EXITED if reply is None else reply
+
+    @staticmethod
+    def _read_replies(process: subprocess.Popen, replies: "queue.Queue[Optional[dict]]") -> None:
+        for line in process.stdout:
+            replies.put(json.loads(line))
+        replies.put(None)
+
+
+def execute_cells(session: CellSession, code: str, utils_content: str = "",
+                  restart: bool = False, interpreter: Optional[Interpreter] = None) -> CellRun:
+    """Cell mode's execute_code: runs what changed against today's input."""
+    year, day = int(config.CURRENT_YEAR), int(config.CURRENT_DAY)
+    input_path, error = ensure_input_file(year, day, config.TOKEN)
+    if error:
+        return CellRun(error, [], 0, ok=False)
+    return session.run(code, utils_content, input_path, day_cache_dir(year, day), restart,
+                       (interpreter or current()).path)
@@ -0,0 +1,118 @@
+import hashlib
+import marshal
+import os
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+# Bump when the entry layout changes, or anything else that changes what
+# a run prints without changing its key
+EXEC_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+ENTRY_SUFFIX = ".run"
+
+
+@dataclass(frozen=True)
+class CachedRun:
+    stdout: str
+    # How long the original run took, if it was measured
+    wall: Optional[float]
+    created: float
+
+
+def run_key(code: str, utils_content: str, input_path: str, stdlib_version: str,
+            interpreter: str = sys.executable) -> str:
+    """Everything that decides what a run prints, hashed together."""
+    digest = hashlib.sha256()
+    for part in (str(EXEC_CACHE_VERSION), interpreter, sys.version, stdlib_version,
+                 code, utils_content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    with open(input_path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ExecCache:
+    """
+    Output of earlier successful runs, one file per key, kept under
+    `max_bytes` by dropping the least recently used entries. A file's
+    modification time is its last use, so the order survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+        found = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                stat = entry.stat()
+                found.append((stat.st_mtime_ns, entry.name[:-len(ENTRY_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.total_bytes += size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[CachedRun]:
+        if key not in self._entries:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                version, stdout, wall, created = marshal.load(f)
+            if version != EXEC_CACHE_VERSION:
+                raise ValueError("old cache entry")
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return CachedRun(stdout, wall, created)
+
+    def put(self, key: str, stdout: str, wall: Optional[float] = None) -> None:
+        data = marshal.dumps((EXEC_CACHE_VERSION, stdout, wall, time.time()))
+        # One huge output would push out everything else for little gain
+        if len(data) > self.max_bytes // 4:
+            return
+
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            # The cache is only a speed-up, the run itself already succeeded
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+
+        self.total_bytes += len(data) - self._entries.pop(key, 0)
+        self._entries[key] = len(data)
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        self.total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from PySide6.QtCore import QObject, QTimer, QThreadPool, QCoreApplication
+
+_write_pool: Optional[QThreadPool] = None
+
+
+def write_pool() -> QThreadPool:
+    # A single background thread keeps writes to the same file in order
+    global _write_pool
+    if _write_pool is None:
+        _write_pool = QThreadPool()
+        _write_pool.setMaxThreadCount(1)
+    return _write_pool
+
+
+def atomic_write(path: str, text: str) -> None:
+    """Write text to path via a temp file and rename so a crash never leaves a half-written file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Exclusive advisory lock for path, shared with every other process and
+    thread that takes it. It is held on path + ".lock", since path itself is
+    replaced by each atomic write.
+    """
+    lock_path = f"{path}.lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DebouncedWriter(QObject):
+    """
+    Coalesces repeated save requests for a single file.
+    Each call to schedule() restarts an idle timer; once it fires the latest
+    payload is serialised and written atomically on a worker thread.
+    Writes whose content matches what is already on disk are skipped.
+    With lock_file, serialize and the write happen under file_lock, so a
+    serialize that reads the file first can't lose another process's write.
+    written is called with the payload once it is safely on disk.
+    """
+
+    def __init__(self, path: str, delay_ms: int = 500,
+                 serialize: Optional[Callable[[Any], str]] = None,
+                 parent: Optional[QObject] = None, lock_file: bool = False,
+                 written: Optional[Callable[[Any], None]] = None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.serialize = serialize or (lambda payload: payload)
+        self.lock_file = lock_file
+        self.written = written
+        self.last_error: Optional[Exception] = None
+
+        self._lock = threading.Lock()
+        self._pending: Any = None
+        self._has_pending = False
+        self._generation = 0
+        self._written_generation = 0
+        self._last_hash: Optional[str] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._write_pending_async)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    def mark_saved(self, text: str) -> None:
+        # Tell the writer what is already on disk so an identical save is skipped
+        self._last_hash = content_hash(text)
+
+    def schedule(self, payload: Any) -> None:
+        self._pending = payload
+        self._has_pending = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write any pending payload synchronously, used on exit and explicit saves."""
+        self._timer.stop()
+        job = self._take_pending()
+        if job is not None:
+            self._write(*job)
+        write_pool().waitForDone()
+
+    def has_pending(self) -> bool:
+        return self._has_pending
+
+    def _take_pending(self) -> Optional[tuple]:
+        if not self._has_pending:
+            return None
+        self._generation += 1
+        job = (self._pending, self._generation)
+        self._pending = None
+        self._has_pending = False
+        return job
+
+    def _write_pending_async(self) -> None:
+        job = self._take_pending()
+        if job is not None:
+            write_pool().start(lambda: self._write(*job))
+
+    def _write(self, payload: Any, generation: int) -> None:
+        with self._lock:
+            # A newer payload has already been written, e.g. by flush()
+            if generation <= self._written_generation:
+                return
+            try:
+                if self.lock_file:
+                    with file_lock(self.path):
+                        self._serialize_and_write(payload)
+                else:
+                    self._serialize_and_write(payload)
+                self._written_generation = generation
+                self.last_error = None
+                if self.written is not None:
+                    self.written(payload)
+            except Exception as e:
+                self.last_error = e
+                print(f"Error: Failed to save {self.path}: {e}", file=sys.stderr)
+
+    def _serialize_and_write(self, payload: Any) -> None:
+        text = self.serialize(payload)
+        digest = content_hash(text)
+        if digest != self._last_hash:
+            atomic_write(self.path, text)
+            self._last_hash = digest
@@ -0,0 +1,164 @@
+import html
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+AOC_URL = "https://adventofcode.com"
+
+# Tags kept when turning an <article> into a display fragment, everything
+# else is unwrapped to its text and these never make it through at all
+ALLOWED_TAGS = {"h2", "p", "pre", "code", "em",
+                "strong", "a", "ul", "ol", "li", "br", "span"}
+DROPPED_TAGS = {"script", "style", "form", "input", "button"}
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "wbr"}
+
+# Pages are fed in pieces so parsing can stop once enough articles are found
+FEED_CHUNK = 16384
+ARTICLE_START = re.compile(r"<article\b", re.IGNORECASE)
+
+
+@dataclass
+class Article:
+    text: str = ""
+    html: str = ""
+    paragraphs: List[str] = field(default_factory=list)
+
+
+class ArticleExtractor(HTMLParser):
+    """
+    Streaming extractor for the <article> elements of an AoC page.
+    Only the articles are looked at, nothing outside them is kept and no
+    tree is built. For each article it collects the plain text, a sanitized
+    HTML fragment and the text of each <p>.
+    """
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.articles: List[Article] = []
+
+        self._depth = 0            # nesting of <article> tags
+        self._skipping: List[str] = []  # open dropped tag such as <script> and tags inside it
+        self._open: List[str] = []  # allowed tags emitted but not yet closed
+        self._text: List[str] = []
+        self._html: List[str] = []
+        self._paragraph: Optional[List[str]] = None
+        self._paragraphs: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return self.limit is not None and len(self.articles) >= self.limit
+
+    def extract(self, page: str) -> List[Article]:
+        # Nothing before the first <article> is kept, so don't tokenize it
+        first = ARTICLE_START.search(page)
+        if first is None:
+            return self.articles
+        for start in range(first.start(), len(page), FEED_CHUNK):
+            self.feed(page[start:start + FEED_CHUNK])
+            if self.done:
+                break
+        else:
+            self.close()
+            if self._depth and not self.done:
+                self._finish_article()  # page ended inside an unclosed <article>
+        return self.articles
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "article":
+            if self._depth == 0 and not self.done:
+                self._begin_article()
+            self._depth += 1
+            return
+        if self._depth == 0 or self.done:
+            return
+        if self._skipping or tag in DROPPED_TAGS:
+            if tag not in VOID_TAGS:
+                self._skipping.append(tag)
+            return
+
+        if tag == "p":
+            if self._paragraph is not None:
+                self.handle_endtag("p")  # an open <p> is implicitly closed
+            self._paragraph = []
+        if tag not in ALLOWED_TAGS:
+            return
+        if tag == "br":
+            self._html.append("<br>")
+            return
+        if tag == "a":
+            href = dict(attrs).get("href") or ""
+            if href.startswith("/"):
+                href = AOC_URL + href
+            if not href.startswith(("https://", "http://")):
+                return
+            self._html.append(f'<a href="{html.escape(href)}">')
+        else:
+            self._html.append(f"<{tag}>")
+        self._open.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+        else:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._depth == 0:
+            return
+        if tag == "article":
+            self._depth -= 1
+            if self._depth == 0 and not self.done:
+                self._finish_article()
+            return
+        if self.done:
+            return
+        if self._skipping:
+            # Stray end tags don't end the skip, only the tag that opened it does
+            if tag in self._skipping:
+                while self._skipping.pop() != tag:
+                    pass
+            return
+
+        if tag == "p" and self._paragraph is not None:
+            self._paragraphs.append("".join(self._paragraph))
+            self._paragraph = None
+        if tag in self._open:
+            # Close anything left open inside this tag as well
+            while self._open:
+                open_tag = self._open.pop()
+                self._html.append(f"</{open_tag}>")
+                if open_tag == tag:
+                    break
+
+    def handle_data(self, data: str) -> None:
+        if self._depth == 0 or self._skipping or self.done:
+            return
+        self._text.append(data)
+        self._html.append(html.escape(data, quote=False))
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+
+    def _begin_article(self) -> None:
+        self._skipping = []
+        self._open = []
+        self._text = []
+        self._html = []
+        self._paragraph = None
+        self._paragraphs = []
+
+    def _finish_article(self) -> None:
+        if self._paragraph is not None:
+            self._paragraphs.append("".join(self._paragraph))
+        self._html.extend(f"</{tag}>" for tag in reversed(self._open))
+        self.articles.append(Article(
+            text="".join(self._text),
+            html="".join(self._html),
+            paragraphs=self._paragraphs,
+        ))
+
+
+def extract_articles(page: str, limit: Optional[int] = None) -> List[Article]:
+    return ArticleExtractor(limit).extract(page)
@@ -0,0 +1,146 @@
+"""
+Python interpreters a solution can run under: the one running the editor,
+plus any other CPython, free-threaded CPython or PyPy found on PATH. Each
+candidate is asked about itself once, so a broken or too old install is
+left out instead of failing on the first run.
+"""
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import sysconfig
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+# The prelude modules (parsed_input, run_metrics, cell_worker) and aoc_stdlib
+# are written for this version and later
+MIN_VERSION = (3, 8)
+PROBE_TIMEOUT = 5
+# python3, python3.12, python3.13t, pypy, pypy3, pypy3.10, with .exe on Windows
+CANDIDATE_NAME = re.compile(r"^(python3(\.\d+t?)?|pypy3?(\.\d+)?)(\.exe)?$")
+
+_PROBE = """\
+import json, platform, sys, sysconfig
+print(json.dumps({
+    "implementation": platform.python_implementation(),
+    "version": platform.python_version(),
+    "version_info": list(sys.version_info[:2]),
+    "free_threaded": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+}))
+"""
+
+
+@dataclass(frozen=True)
+class Interpreter:
+    path: str
+    implementation: str
+    version: str
+    free_threaded: bool = False
+
+    @property
+    def label(self) -> str:
+        """Short name for menus and reports, e.g. "PyPy 3.10.14"."""
+        label = f"{self.implementation} {self.version}"
+        return label + " free-threaded" if self.free_threaded else label
+
+    @property
+    def identity(self) -> str:
+        """Path and build together, changes when the interpreter is upgraded in place."""
+        return f"{self.path}|{self.label}"
+
+
+def current() -> Interpreter:
+    """The interpreter running the editor, described without starting a process."""
+    return Interpreter(sys.executable, platform.python_implementation(),
+                       platform.python_version(),
+                       bool(sysconfig.get_config_var("Py_GIL_DISABLED")))
+
+
+def probe(path: str, timeout: float = PROBE_TIMEOUT) -> Optional[Interpreter]:
+    """Asks the interpreter at path what it is. None if it cannot run solutions."""
+    try:
+        result = subprocess.run([path, "-c", _PROBE], capture_output=True, text=True,
+                                timeout=timeout, stdin=subprocess.DEVNULL)
+        info = json.loads(result.stdout)
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+    if result.returncode != 0 or tuple(info["version_info"]) < MIN_VERSION:
+        return None
+    return Interpreter(path, info["implementation"], info["version"], info["free_threaded"])
+
+
+def candidate_paths(search_path: Optional[str] = None) -> List[str]:
+    """Executables on PATH whose name looks like a Python interpreter, in PATH order."""
+    paths = []
+    for directory in (search_path or os.environ.get("PATH", "")).split(os.pathsep):
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(directory, name)
+            if CANDIDATE_NAME.match(name) and os.path.isfile(path) and os.access(path, os.X_OK):
+                paths.append(path)
+    return paths
+
+
+def detect(extra_paths: Iterable[str] = (), search_path: Optional[str] = None) -> List[Interpreter]:
+    """
+    The editor's own interpreter first, then every other working one.
+    Links and shims often give one install several names, so each build is
+    listed once, under the first path it was found at. extra_paths come
+    before PATH, for interpreters chosen earlier that may not be on it.
+    """
+    found = [current()]
+    seen_paths = {os.path.realpath(sys.executable)}
+    seen_builds = {found[0].label}
+    for path in [*extra_paths, *candidate_paths(search_path)]:
+        real = os.path.realpath(path)
+        if real in seen_paths:
+            continue
+        seen_paths.add(real)
+        interpreter = probe(path)
+        if interpreter is not None and interpreter.label not in seen_builds:
+            seen_builds.add(interpreter.label)
+            found.append(interpreter)
+    return found
+
+
+def find(interpreters: Iterable[Interpreter], path: str) -> Optional[Interpreter]:
+    for interpreter in interpreters:
+        if interpreter.path == path:
+            return interpreter
+    return None
+
+
+class InterpreterDetector(QObject):
+    """
+    Runs detect() off the GUI thread, since probing means starting every
+    candidate once. `detected` carries the list of Interpreters.
+    """
+
+    detected = Signal(list)
+
+    def __init__(self, extra_paths: Iterable[str] = (), parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.extra_paths = list(extra_paths)
+
+    def start(self) -> None:
+        QThreadPool.globalInstance().start(self.load)
+
+    def load(self) -> None:
+        self.detected.emit(detect(self.extra_paths))
+
+
+def speedup(seconds: float, baseline: float) -> str:
+    """How one time compares with another, e.g. "4.2x faster"."""
+    if seconds <= 0 or baseline <= 0:
+        return ""
+    ratio = baseline / seconds
+    if ratio >= 1:
+        return f"{ratio:.1f}x faster"
+    return f"{1 / ratio:.1f}x slower"
@@ -0,0 +1,75 @@
+from array import array
+from bisect import bisect_right
+from typing import Optional, Tuple, Union
+import mmap
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+class LineIndex:
+    """
+    Line start offsets for a byte buffer, typically a memory-mapped input file.
+    Lines are only decoded when asked for, so a viewer can show any part of a
+    multi-megabyte input without ever materialising the whole text.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        self.buffer = buffer
+        self.size = len(buffer)
+        self.starts = array("q", [0])
+
+        find = buffer.find
+        pos = find(b"\n")
+        while pos != -1:
+            self.starts.append(pos + 1)
+            pos = find(b"\n", pos + 1)
+
+        # Close the last line as if it ended in a newline, unless it already
+        # does, so every line is starts[i] up to the newline before starts[i + 1]
+        if self.starts[-1] != self.size:
+            self.starts.append(self.size + 1)
+        self._max_width: Optional[int] = None
+
+    @property
+    def line_count(self) -> int:
+        return len(self.starts) - 1
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """Byte range of a line, without its line ending."""
+        start = self.starts[line]
+        end = self.starts[line + 1] - 1
+        if end > start and self.buffer[end - 1:end] == b"\r":
+            end -= 1
+        return start, max(start, end)
+
+    def line(self, line: int) -> str:
+        start, end = self.line_span(line)
+        return self.buffer[start:end].decode("utf-8", errors="replace")
+
+    def line_of(self, offset: int) -> int:
+        return min(bisect_right(self.starts, offset) - 1, max(self.line_count - 1, 0))
+
+    def position_of(self, offset: int) -> Tuple[int, int]:
+        """(line, column) of a byte offset, both zero based."""
+        line = self.line_of(offset)
+        return line, offset - self.starts[line]
+
+    @property
+    def max_width(self) -> int:
+        if self._max_width is None:
+            self._max_width = max(
+                (end - start for start, end in map(self.line_span, range(self.line_count))),
+                default=0)
+        return self._max_width
+
+    def find(self, needle: bytes, start: int = 0) -> int:
+        """Byte offset of the next occurrence at or after start, wrapping around, or -1."""
+        if not needle:
+            return -1
+        pos = self.buffer.find(needle, start)
+        if pos == -1 and start:
+            pos = self.buffer.find(needle, 0, start + len(needle) - 1)
+        return pos
+
+    def stats(self) -> str:
+        return f"{self.line_count} lines • {self.max_width} columns • {self.size:,} bytes"
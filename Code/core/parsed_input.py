@@ -0,0 +1,146 @@
+"""
+Parsed views of a puzzle input, available to solutions as `parsed`.
+
+This module runs inside the solution's subprocess, so it only uses the
+standard library. Each view is worked out the first time it is used and
+stored next to the cached input, later runs just load it back.
+"""
+import marshal
+import os
+import re
+from functools import cached_property
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+# Bump when a view's layout changes so old cache files are recomputed
+PARSED_CACHE_VERSION = 1
+INT_PATTERN = re.compile(r"-?\d+")
+
+T = TypeVar("T")
+
+
+class CharGrid:
+    """
+    A character grid stored as one bytes block, row after row.
+    Positions are (x, y) with x the column and y the row, (0, 0) top left.
+    """
+
+    __slots__ = ("cells", "width", "height")
+
+    def __init__(self, cells: bytes, width: int, height: int) -> None:
+        self.cells = cells
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_lines(cls, lines: List[str]) -> "CharGrid":
+        width = max(map(len, lines), default=0)
+        # Short rows are padded with spaces so every row has the same width
+        cells = "".join(line.ljust(width) for line in lines).encode("latin-1", "replace")
+        return cls(cells, width, len(lines))
+
+    def __getitem__(self, pos: Tuple[int, int]) -> str:
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{pos} is outside the {self.width}x{self.height} grid")
+        return chr(self.cells[y * self.width + x])
+
+    def get(self, x: int, y: int, default: Optional[str] = None) -> Optional[str]:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return chr(self.cells[y * self.width + x])
+        return default
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def row(self, y: int) -> str:
+        start = y * self.width
+        return self.cells[start:start + self.width].decode("latin-1")
+
+    def find(self, char: str) -> Optional[Tuple[int, int]]:
+        index = self.cells.find(char.encode("latin-1"))
+        if index == -1:
+            return None
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def find_all(self, char: str) -> Iterator[Tuple[int, int]]:
+        needle = char.encode("latin-1")
+        index = self.cells.find(needle)
+        while index != -1:
+            y, x = divmod(index, self.width)
+            yield x, y
+            index = self.cells.find(needle, index + 1)
+
+    def __repr__(self) -> str:
+        return f"CharGrid({self.width}x{self.height})"
+
+
+class ParsedInput:
+    """
+    Lazily parsed views of an input file:
+
+    - `data`: the whole input as a string
+    - `lines`: the input split into lines
+    - `ints`: every integer on each line, one list per line
+    - `grid`: the input as a CharGrid
+    - `paragraphs`: blocks separated by blank lines, each a list of lines
+    """
+
+    def __init__(self, input_path: str, cache_dir: Optional[str] = None) -> None:
+        self.input_path = input_path
+        self.cache_dir = cache_dir
+        stat = os.stat(input_path)
+        self._stamp = (PARSED_CACHE_VERSION, stat.st_size, stat.st_mtime_ns)
+
+    @cached_property
+    def data(self) -> str:
+        with open(self.input_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self._cached("lines", lambda: self.data.splitlines())
+
+    @cached_property
+    def ints(self) -> List[List[int]]:
+        return self._cached("ints", lambda: [
+            [int(n) for n in INT_PATTERN.findall(line)] for line in self.lines])
+
+    @cached_property
+    def grid(self) -> CharGrid:
+        cells, width, height = self._cached("grid", lambda: self._grid_fields())
+        return CharGrid(cells, width, height)
+
+    @cached_property
+    def paragraphs(self) -> List[List[str]]:
+        return self._cached("paragraphs", lambda: [
+            block.split("\n") for block in self.data.strip("\n").split("\n\n") if block])
+
+    def _grid_fields(self) -> Tuple[bytes, int, int]:
+        grid = CharGrid.from_lines(self.lines)
+        return grid.cells, grid.width, grid.height
+
+    def _cached(self, name: str, compute: Callable[[], T]) -> T:
+        if self.cache_dir is None:
+            return compute()
+
+        path = os.path.join(self.cache_dir, f"parsed_{name}.marshal")
+        try:
+            with open(path, "rb") as f:
+                stamp, value = marshal.load(f)
+            if stamp == self._stamp:
+                return value
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        value = compute()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                marshal.dump((self._stamp, value), f)
+            os.replace(temp_path, path)
+        except OSError:
+            # Caching is only a speed-up, the solution still gets its value
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        return value
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from core.run_metrics import Metrics
+
+HISTORY_FILE_NAME = "perf_history.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    started REAL NOT NULL,
+    wall REAL NOT NULL,
+    cpu REAL NOT NULL,
+    peak_kb INTEGER,
+    code_hash TEXT NOT NULL,
+    utils_hash TEXT NOT NULL,
+    stdlib_version TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    interpreter TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (year, day, part, id);
+-- Each version of a solution is stored once however often it is run
+CREATE TABLE IF NOT EXISTS code (
+    hash TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+"""
+
+_COLUMNS = ("id, year, day, part, started, wall, cpu, peak_kb, "
+            "code_hash, utils_hash, stdlib_version, interpreter, ok")
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    id: int
+    year: int
+    day: int
+    part: int
+    started: float
+    wall: float
+    cpu: float
+    peak_kb: Optional[int]
+    code_hash: str
+    utils_hash: str
+    stdlib_version: str
+    # Label of the interpreter it ran under, empty for runs from before
+    # interpreters could be chosen
+    interpreter: str
+    ok: bool
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+
+def history_path(user_id: str) -> str:
+    return os.path.join("user_files", user_id, HISTORY_FILE_NAME)
+
+
+class PerfHistory:
+    """
+    Every timed run of a solution, kept in a small SQLite file and looked up
+    by (year, day, part). The code of each run is kept too, so any earlier
+    version, the fastest one in particular, can be loaded back.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # Losing the last run on a power cut is fine, waiting on fsync is not
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        if "interpreter" not in columns:
+            with self.connection:
+                self.connection.execute(
+                    "ALTER TABLE runs ADD COLUMN interpreter TEXT NOT NULL DEFAULT ''")
+
+    def record(self, year: int, day: int, part: int, code: str, metrics: Metrics,
+               utils_hash: str, stdlib_version: str, ok: bool = True,
+               interpreter: str = "") -> RunRecord:
+        wall, cpu, peak_kb = metrics
+        digest = code_hash(code)
+        started = time.time()
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO code (hash, text) VALUES (?, ?)", (digest, code))
+            cursor = self.connection.execute(
+                f"INSERT INTO runs ({_COLUMNS}) VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (year, day, part, started, wall, cpu, peak_kb,
+                 digest, utils_hash, stdlib_version, interpreter, int(ok)))
+        return RunRecord(cursor.lastrowid, year, day, part, started, wall, cpu, peak_kb,
+                         digest, utils_hash, stdlib_version, interpreter, ok)
+
+    def runs(self, year: int, day: int, part: int) -> List[RunRecord]:
+        """Runs of one part, oldest first."""
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM runs WHERE year = ? AND day = ? AND part = ? ORDER BY id",
+            (year, day, part))
+        return [self._record(row) for row in rows]
+
+    def fastest(self, year: int, day: int, part: int) -> Optional[RunRecord]:
+        """The quickest successful run of one part."""
+        row = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM runs WHERE year = ? AND day = ? AND part = ? AND ok "
+            "ORDER BY wall, id LIMIT 1", (year, day, part)).fetchone()
+        return self._record(row) if row else None
+
+    def fastest_by_interpreter(self, year: int, day: int, part: int) -> List[RunRecord]:
+        """The quickest successful run under each interpreter, quickest first."""
+        best = {}
+        for run in self.runs(year, day, part):
+            if run.ok and (run.interpreter not in best or run.wall < best[run.interpreter].wall):
+                best[run.interpreter] = run
+        return sorted(best.values(), key=lambda run: run.wall)
+
+    def code(self, digest: str) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT text FROM code WHERE hash = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @staticmethod
+    def _record(row: tuple) -> RunRecord:
+        return RunRecord(*row[:-1], bool(row[-1]))
@@ -0,0 +1,249 @@
+"""
+Re-runs every stored solution for a year against its cached input and
+checks the output against the answers AoC accepted, so a change to the
+shared utils file that breaks or slows down an old day shows up at once.
+
+Run from the project root, like the editor itself:
+
+    python Code/regression.py 2023
+    python Code/regression.py 2023 --days 1 5 12 --jobs 4
+    python Code/regression.py 2023 --python pypy3
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import config.config as config
+from core.aoc_fetcher import input_cache_path
+from core.answers import day_answers
+from core.cache import day_cache_dir
+from core.file_io import atomic_write
+from core.interpreters import probe
+from core.runner import SOLUTION_TIMEOUT, build_script, run_script
+from core.solutions import SOLUTIONS_DIR_NAME, solution_path
+from core.token_store import read_cached_token
+from core.utils import upgrade_utils
+
+TIMINGS_FILE_NAME = "regression.json"
+# A day counts as slower once it takes this much longer than its last pass,
+# the absolute margin stops noise on very quick days being reported
+SLOWDOWN_RATIO = 1.5
+SLOWDOWN_MARGIN = 0.05
+
+PASS = "pass"
+FAIL = "fail"
+ERROR = "error"
+TIMEOUT = "timeout"
+NO_INPUT = "no input"
+NO_SOLUTION = "no solution"
+UNCHECKED = "unchecked"
+
+
+@dataclass
+class DayResult:
+    day: int
+    status: str
+    seconds: float = 0.0
+    expected: Dict[int, str] = field(default_factory=dict)
+    missing: List[int] = field(default_factory=list)
+    detail: str = ""
+    previous_seconds: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (PASS, UNCHECKED)
+
+    @property
+    def slower(self) -> bool:
+        return (self.ok and self.previous_seconds is not None
+                and self.seconds > self.previous_seconds * SLOWDOWN_RATIO
+                and self.seconds - self.previous_seconds > SLOWDOWN_MARGIN)
+
+
+def solved_days(user_id: str, year: int) -> List[int]:
+    directory = os.path.join("user_files", user_id, SOLUTIONS_DIR_NAME, str(year))
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(int(name[:-3]) for name in names
+                  if name.endswith(".py") and name[:-3].isdigit())
+
+
+def missing_answers(output: str, expected: Dict[int, str]) -> List[int]:
+    """
+    Parts whose answer is not in the output. An answer counts when it is a
+    whole line or a whitespace-separated word, so "Part 1: 123" matches 123.
+    """
+    found = set(output.split())
+    found.update(line.strip() for line in output.splitlines())
+    return [part for part, answer in sorted(expected.items()) if answer not in found]
+
+
+def load_utils(user_id: str) -> str:
+    try:
+        with open(os.path.join("user_files", user_id, "utils.py"), "r", encoding="utf-8") as f:
+            content = f.read()
+    except OSError:
+        return ""
+    # Old template files are upgraded in memory, the editor does it on disk
+    return upgrade_utils(content) or content
+
+
+def run_day(user_id: str, year: int, day: int, utils_content: str,
+            timeout: float = SOLUTION_TIMEOUT, interpreter: str = sys.executable) -> DayResult:
+    expected = day_answers(year, day, user_id)
+    input_path = input_cache_path(year, day)
+    if not os.path.exists(input_path):
+        return DayResult(day, NO_INPUT, expected=expected,
+                         detail="Open the day in AoCode once to download its input")
+
+    try:
+        with open(solution_path(user_id, year, day), "r", encoding="utf-8") as f:
+            code = f.read()
+    except OSError:
+        return DayResult(day, NO_SOLUTION, expected=expected)
+    script = build_script(code, utils_content, input_path, day_cache_dir(year, day))
+
+    start = time.perf_counter()
+    try:
+        result = run_script(script, timeout, interpreter=interpreter)
+    except subprocess.TimeoutExpired:
+        return DayResult(day, TIMEOUT, timeout, expected)
+    except OSError as e:
+        return DayResult(day, ERROR, expected=expected, detail=f"Could not start {interpreter}: {e}")
+    seconds = time.perf_counter() - start
+
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return DayResult(day, ERROR, seconds, expected, detail=lines[-1] if lines else "")
+    if not expected:
+        return DayResult(day, UNCHECKED, seconds)
+    missing = missing_answers(result.stdout, expected)
+    return DayResult(day, FAIL if missing else PASS, seconds, expected, missing)
+
+
+def run_year(user_id: str, year: int, days: Optional[Sequence[int]] = None,
+             jobs: Optional[int] = None, timeout: float = SOLUTION_TIMEOUT,
+             interpreter: Optional[str] = None) -> List[DayResult]:
+    """
+    Runs the chosen days, every solved day by default. Each solution already
+    runs in its own interpreter, so a thread pool is enough to keep `jobs`
+    of them going at once. With interpreter, the path of another Python,
+    timings are kept apart from the default interpreter's.
+    """
+    days = solved_days(user_id, year) if days is None else sorted(days)
+    utils_content = load_utils(user_id)
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        results = list(pool.map(
+            lambda day: run_day(user_id, year, day, utils_content, timeout,
+                                interpreter or sys.executable), days))
+
+    timings = load_timings(user_id)
+    year_timings = timings.setdefault(timings_key(year, interpreter), {})
+    for result in results:
+        result.previous_seconds = year_timings.get(str(result.day))
+        if result.ok:
+            year_timings[str(result.day)] = round(result.seconds, 4)
+    atomic_write(timings_path(user_id), json.dumps(timings, indent=2, sort_keys=True))
+    return results
+
+
+def timings_key(year: int, interpreter: Optional[str] = None) -> str:
+    return f"{year} {interpreter}" if interpreter else str(year)
+
+
+def timings_path(user_id: str) -> str:
+    return os.path.join("user_files", user_id, TIMINGS_FILE_NAME)
+
+
+def load_timings(user_id: str) -> Dict[str, Dict[str, float]]:
+    """
+    Time of each day's last successful run, as {year: {day: seconds}}. Runs
+    under a chosen interpreter use "year path" instead of the year.
+    """
+    try:
+        with open(timings_path(user_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def format_report(year: int, results: List[DayResult]) -> str:
+    lines = [f"AoC {year}: {len(results)} solutions", ""]
+    for r in results:
+        previous = "" if r.previous_seconds is None else f"  (was {r.previous_seconds:.3f}s)"
+        status = f"{r.status} slower" if r.slower else r.status
+        note = ""
+        if r.missing:
+            note = "  missing part " + ", ".join(
+                f"{part} ({r.expected[part]})" for part in r.missing)
+        elif r.detail:
+            note = f"  {r.detail}"
+        lines.append(f"Day {r.day:>2}  {status:<16}{r.seconds:>8.3f}s{previous}{note}")
+
+    counts = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    slower = sum(r.slower for r in results)
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    if slower:
+        summary += f", {slower} slower"
+    lines += ["", f"{summary}, {sum(r.seconds for r in results):.3f}s in total"]
+    return "\n".join(lines)
+
+
+def default_user_id() -> Optional[str]:
+    """The user of the saved session token, or the only user on this machine."""
+    token = read_cached_token()
+    if token:
+        return hashlib.sha256(token.encode()).hexdigest()
+    try:
+        users = [name for name in os.listdir("user_files")
+                 if os.path.isdir(os.path.join("user_files", name, SOLUTIONS_DIR_NAME))]
+    except OSError:
+        return None
+    return users[0] if len(users) == 1 else None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python Code/regression.py",
+        description="Re-run stored solutions and check them against accepted answers.")
+    parser.add_argument("year", type=int)
+    parser.add_argument("--days", type=int, nargs="+", help="only run these days")
+    parser.add_argument("--jobs", type=int, help="solutions run at once, one per CPU by default")
+    parser.add_argument("--timeout", type=float, default=SOLUTION_TIMEOUT,
+                        help="seconds before a solution is stopped")
+    parser.add_argument("--user", help="user id, the hashed session token")
+    parser.add_argument("--python", metavar="PATH",
+                        help="run the solutions under this interpreter, e.g. pypy3")
+    args = parser.parse_args(argv)
+
+    interpreter = None
+    if args.python:
+        found = probe(shutil.which(args.python) or args.python)
+        if found is None:
+            parser.error(f"{args.python} is not a Python this can run solutions with")
+        interpreter = found.path
+        print(f"Running under {found.label}")
+
+    user_id = args.user or default_user_id()
+    if user_id is None:
+        parser.error("could not tell which user to check, pass --user")
+    config.HASHED_TOKEN = user_id
+
+    results = run_year(user_id, args.year, args.days, args.jobs, args.timeout, interpreter)
+    if not results:
+        print(f"No stored solutions for {args.year}")
+        return 1
+    print(format_report(args.year, results))
+    return 0 if all(r.ok and not r.slower for r in results) else 1
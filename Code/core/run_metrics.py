@@ -0,0 +1,69 @@
+"""
+Timing and memory figures for a solution run, measured inside the
+solution's own process.
+
+The prelude calls `start()` before the user's code. If the editor asked for
+metrics through the AOCODE_METRICS environment variable, they are written
+to that path when the interpreter exits, whether the solution finished or
+raised. Like parsed_input, this only uses the standard library.
+"""
+import atexit
+import marshal
+import os
+import sys
+import time
+from typing import Optional, Tuple
+
+METRICS_ENV = "AOCODE_METRICS"
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+Metrics = Tuple[float, float, Optional[int]]
+
+
+def peak_memory_kb() -> Optional[int]:
+    """Peak of this process or of its largest finished child, e.g. a parallel_map worker."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process plus its finished children, so parallel work counts."""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def start() -> None:
+    path = os.environ.get(METRICS_ENV)
+    if not path:
+        return
+    wall_start = time.perf_counter()
+    cpu_start = cpu_seconds()
+
+    def write() -> None:
+        metrics = (time.perf_counter() - wall_start,
+                   cpu_seconds() - cpu_start, peak_memory_kb())
+        try:
+            with open(path, "wb") as f:
+                marshal.dump(metrics, f)
+        except OSError:
+            pass
+
+    atexit.register(write)
+
+
+def read_metrics(path: str) -> Optional[Metrics]:
+    """(wall seconds, CPU seconds, peak memory in KB), or None if nothing was written."""
+    try:
+        with open(path, "rb") as f:
+            wall, cpu, peak = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return wall, cpu, peak
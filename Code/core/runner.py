@@ -1,20 +1,54 @@
-from typing import Optional
+from typing import Callable, List, Optional
 from PySide6 import QtWidgets
-from bs4 import BeautifulSoup
+import compileall
+import signal
 import subprocess
 import time
 import tempfile
 import sys
 import os
 
-import requests
 from typing import Union
 
-from core.aoc_fetcher import fetch_input
+from core.aoc_fetcher import ensure_input_file
+from core.answers import record_answer
+from core.cache import day_cache_dir
+from core.exec_cache import CachedRun, ExecCache, run_key
+from core.html_extract import extract_articles
+from core.interpreters import Interpreter, current, speedup
+from core.run_metrics import METRICS_ENV, Metrics, read_metrics
+from core.startup_profile import lazy_import
 import config.config as config
 
 
-def execute_code(code: str, utils_content: str = "") -> Union[str, None]:
+# Added to the solution's PYTHONPATH so it can import core.parsed_input
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOLUTION_TIMEOUT = 20
+
+
+def __getattr__(name: str):
+    # requests is only imported when something first needs it
+    if name == "requests":
+        return lazy_import("requests")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def execute_code(code: str, utils_content: str = "",
+                 on_metrics: Optional[Callable[[Metrics, bool], None]] = None,
+                 cache: Optional[ExecCache] = None, force: bool = False,
+                 on_cached: Optional[Callable[[CachedRun], None]] = None,
+                 interpreter: Optional[Interpreter] = None) -> Union[str, None]:
+    """
+    Runs the user's code against today's input and returns what it printed.
+    It runs under interpreter, the editor's own Python by default.
+    on_metrics, if given, is called with the run's (wall, CPU, peak memory)
+    figures and whether it succeeded.
+
+    With a cache, a run whose code, utils, input and interpreter all match
+    an earlier successful one returns that output straight away and calls
+    on_cached instead. force runs it again and replaces the cached output.
+    """
+    interpreter = interpreter or current()
     start_time = time.time()
     try:
         if len(code) == 0:
@@ -24,35 +58,190 @@ def execute_code(code: str, utils_content: str = "") -> Union[str, None]:
         day = config.CURRENT_DAY
         token = config.TOKEN
 
-        user_input: str = fetch_input(
-            int(year), int(day), token)
-
-        # Use repr() to properly escape the input string, meaning we get the full input, not just the first line
-        full_code = f"{utils_content}\ndata = {repr(user_input)}\n{code}"
+        input_path, error = ensure_input_file(int(year), int(day), token)
+        if error:
+            return error
 
-        with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
-            f.write(full_code)
-            temp_path: str = f.name
+        key = None
+        if cache is not None:
+            key = run_key(code, utils_content, input_path,
+                          lazy_import("aoc_stdlib").__version__, interpreter.identity)
+            cached = None if force else cache.get(key)
+            if cached is not None:
+                if on_cached is not None:
+                    on_cached(cached)
+                return cached.stdout
 
+        script = build_script(code, utils_content, input_path,
+                              day_cache_dir(int(year), int(day)))
+        metrics_path = None
+        if on_metrics is not None or key is not None:
+            fd, metrics_path = tempfile.mkstemp(suffix=".metrics")
+            os.close(fd)
         try:
-            result = subprocess.run([sys.executable, temp_path], stdin=subprocess.PIPE, capture_output=True,
-                                    text=True, timeout=20, encoding='utf-8')
-            # I included stdin=subprocess.PIPE as the user may want to request inputs, however
-            # unlikely. Additionally AoC solutions can all be done in under 15 seconds so I give
-            # a bit of leeway just in case.
-            if result.returncode == 0:
-                return result.stdout
-            else:
-                end_time = time.time()
-                time_taken = end_time - start_time
-                return f"Process took approximately {time_taken:.4f} seconds\n{result.stderr}"
+            result = run_script(script, metrics_path=metrics_path, interpreter=interpreter.path)
+        except OSError as e:
+            return f"Error: Could not start {interpreter.label} at {interpreter.path}: {e}"
         finally:
-            # Clean up the temp file
-            os.unlink(temp_path)
+            metrics = None
+            if metrics_path is not None:
+                metrics = read_metrics(metrics_path)
+                os.unlink(metrics_path)
+        if metrics is not None and on_metrics is not None:
+            on_metrics(metrics, result.returncode == 0)
+
+        if result.returncode == 0:
+            if key is not None:
+                cache.put(key, result.stdout, metrics[0] if metrics else None)
+            return result.stdout
+        else:
+            end_time = time.time()
+            time_taken = end_time - start_time
+            return f"Process took approximately {time_taken:.4f} seconds\n{result.stderr}"
     except subprocess.TimeoutExpired:
         return "There's very likely an infinite loop/recursion or a way to do it much quicker. Every solution can be done in under 15 seconds, this has returned after 20."
 
 
+def compare_interpreters(code: str, utils_content: str, interpreters: List[Interpreter],
+                         on_metrics: Optional[Callable[[Interpreter, Metrics, bool], None]] = None,
+                         timeout: float = SOLUTION_TIMEOUT) -> str:
+    """
+    Runs the same code against today's input under each interpreter in turn,
+    never from the run cache, and returns a table of their timings. The
+    first interpreter is the baseline the others are compared with, and a
+    run whose output differs from the baseline's is flagged.
+    """
+    year, day = int(config.CURRENT_YEAR), int(config.CURRENT_DAY)
+    input_path, error = ensure_input_file(year, day, config.TOKEN)
+    if error:
+        return error
+    script = build_script(code, utils_content, input_path, day_cache_dir(year, day))
+
+    width = max(len(interpreter.label) for interpreter in interpreters)
+    lines = [f"{'Interpreter':<{width}}  {'Wall':>9}  {'CPU':>9}  {'Memory':>9}", ""]
+    baseline_wall = baseline_output = None
+    for interpreter in interpreters:
+        fd, metrics_path = tempfile.mkstemp(suffix=".metrics")
+        os.close(fd)
+        try:
+            result = run_script(script, timeout, metrics_path, interpreter.path)
+        except subprocess.TimeoutExpired:
+            result = None
+            note = f"stopped after {timeout:g}s"
+        except OSError as e:
+            result = None
+            note = f"could not start: {e}"
+        finally:
+            metrics = read_metrics(metrics_path)
+            os.unlink(metrics_path)
+
+        ok = result is not None and result.returncode == 0
+        if result is not None and not ok:
+            errors = result.stderr.strip().splitlines()
+            note = "failed: " + (errors[-1] if errors else f"exit code {result.returncode}")
+        if metrics is not None and on_metrics is not None:
+            on_metrics(interpreter, metrics, ok)
+        if not ok or metrics is None:
+            lines.append(f"{interpreter.label:<{width}}  {note if not ok else 'no timings'}")
+            continue
+
+        wall, cpu, peak_kb = metrics
+        memory = "-" if peak_kb is None else f"{peak_kb / 1024:.1f}MB"
+        line = f"{interpreter.label:<{width}}  {wall:>8.3f}s  {cpu:>8.3f}s  {memory:>9}"
+        if baseline_wall is None:
+            baseline_wall, baseline_output = wall, result.stdout
+            line += "  baseline"
+        else:
+            line += f"  {speedup(wall, baseline_wall)}"
+            if result.stdout != baseline_output:
+                line += ", output differs"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def build_script(code: str, utils_content: str, input_path: str, cache_dir: str) -> str:
+    prelude = input_prelude(input_path, cache_dir)
+    return f"{utils_content}\n{prelude}\n{code}"
+
+
+def run_script(script: str, timeout: float = SOLUTION_TIMEOUT,
+               metrics_path: Optional[str] = None,
+               interpreter: str = sys.executable) -> subprocess.CompletedProcess:
+    """
+    Runs a solution script in a fresh process of the interpreter at that
+    path. Raises subprocess.TimeoutExpired, or OSError if it cannot start.
+    With metrics_path, the run's timings are written there as it exits.
+    """
+    env = solution_env()
+    if metrics_path is not None:
+        env[METRICS_ENV] = metrics_path
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
+        f.write(script)
+        temp_path: str = f.name
+
+    try:
+        # I included stdin=subprocess.PIPE as the user may want to request inputs, however
+        # unlikely. Additionally AoC solutions can all be done in under 15 seconds so I give
+        # a bit of leeway just in case.
+        process = subprocess.Popen([interpreter, temp_path], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                   encoding='utf-8', env=env, start_new_session=os.name == "posix")
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(process)
+            process.communicate()
+            raise
+        return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+    finally:
+        # Clean up the temp file
+        os.unlink(temp_path)
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """
+    Kills a solution along with any worker processes it started, e.g. with
+    parallel_map. Left running, they would keep its output pipes open.
+    The process must have been started with start_new_session on POSIX.
+    """
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+
+
+def input_prelude(input_path: str, cache_dir: str) -> str:
+    """
+    Code run before the user's solution. Timing starts here when the editor
+    asked for metrics. `data` is read from the cached input file rather than
+    pasted into the script, and `parsed` gives lines, ints, a grid and
+    paragraphs that are parsed once and then cached on disk.
+    """
+    return (
+        "from core.run_metrics import start as _start_metrics\n"
+        "_start_metrics()\n"
+        "from core.parsed_input import ParsedInput as _ParsedInput\n"
+        f"parsed = _ParsedInput({os.path.abspath(input_path)!r}, {os.path.abspath(cache_dir)!r})\n"
+        "data = parsed.data\n"
+    )
+
+
+def solution_env() -> dict:
+    paths = [CODE_DIR, os.environ.get("PYTHONPATH", "")]
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in paths if p))
+
+
+def precompile_stdlib() -> None:
+    """
+    Writes the aoc_stdlib bytecode ahead of time so the first run after an
+    update does not pay for compiling it inside the timed subprocess.
+    """
+    compileall.compile_dir(os.path.join(CODE_DIR, "aoc_stdlib"), quiet=1)
+
+
 def submit_answer(year: int, day: int, part: str, token: str, answer: str, terminal: QtWidgets.QTextEdit, instance: object) -> None:
     terminal.append("Submitting answer: " + answer)
     url = f"https://adventofcode.com/{year}/day/{day}/answer"
@@ -68,31 +257,36 @@ def submit_answer(year: int, day: int, part: str, token: str, answer: str, termi
         'session': token,
     }
 
+    requests = lazy_import("requests")
     response = requests.post(url, headers=headers, data=data, cookies=cookies)
 
     if response.status_code != 200:
         terminal.append(f"Error: Received status code {response.status_code}")
         return
 
-    soup = BeautifulSoup(response.text, 'html.parser')
-    article = soup.find('article')
+    # Only the first <article> matters, so stop parsing as soon as it ends
+    articles = extract_articles(response.text, limit=1)
 
     # Check if <article> exists before accessing <p>
-    if article is None:
+    if not articles:
         terminal.append("Error: Could not find <article> tag in response.")
         # Print first 1000 characters
         terminal.append("Response content:\n" + response.text[:1000])
         return
 
-    p_tag = article.find('p')
+    article = articles[0]
 
-    if p_tag is None:
+    if not article.paragraphs:
         terminal.append("Error: Could not find <p> tag inside <article>.")
-        terminal.append("Article content:\n" + article.prettify())
+        terminal.append("Article content:\n" + article.html)
         return
 
-    article_text = p_tag.text.strip()
-    colour = "green" if "That's the right answer" in article_text else "red"
+    article_text = article.paragraphs[0].strip()
+    correct = "That's the right answer" in article_text
+    colour = "green" if correct else "red"
+    if correct:
+        # Kept so the regression runner can re-check this day later
+        record_answer(year, day, part, answer)
 
     terminal.append(f'''<span style="color: {
         colour};">------{article_text}</span>''')
@@ -0,0 +1,118 @@
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional, Pattern, Union
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+# Anything longer than this is searched in the background so typing in the
+# find bar never waits on a scan of a multi-megabyte input
+WORKER_THRESHOLD = 1_000_000
+MAX_MATCHES = 100_000
+_CANCEL_CHECK = 4096
+
+Searchable = Union[str, bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class SearchOptions:
+    case_sensitive: bool = False
+    regex: bool = False
+    whole_word: bool = False
+
+
+def compile_pattern(query: str, options: SearchOptions, binary: bool = False) -> Pattern:
+    """Raises re.error if the query is not a valid regular expression."""
+    pattern = query if options.regex else re.escape(query)
+    if options.whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    flags = 0 if options.case_sensitive else re.IGNORECASE
+    return re.compile(pattern.encode("utf-8") if binary else pattern, flags)
+
+
+class Matches:
+    """Start and end offsets of every match, in order."""
+
+    def __init__(self) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.truncated = False
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span(self, i: int):
+        return self.starts[i], self.ends[i]
+
+    def between(self, start: int, end: int) -> range:
+        """Indices of the matches starting inside [start, end)."""
+        return range(bisect_left(self.starts, start), bisect_left(self.starts, end))
+
+    def any_between(self, start: int, end: int) -> bool:
+        i = bisect_left(self.ends, start + 1)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def first_at_or_after(self, offset: int) -> int:
+        """Index of the first match at or after offset, wrapping to 0, or -1 when empty."""
+        if not self.starts:
+            return -1
+        i = bisect_left(self.starts, offset)
+        return i if i < len(self.starts) else 0
+
+    def count_text(self) -> str:
+        return f"{len(self)}+" if self.truncated else str(len(self))
+
+
+def find_all(pattern: Pattern, text: Searchable, is_cancelled=lambda: False) -> Optional[Matches]:
+    """Every non-empty match of pattern in text, or None if the search was cancelled."""
+    matches = Matches()
+    starts, ends = matches.starts, matches.ends
+    for n, match in enumerate(pattern.finditer(text), 1):
+        start, end = match.span()
+        if start != end:
+            starts.append(start)
+            ends.append(end)
+            if len(starts) >= MAX_MATCHES:
+                matches.truncated = True
+                break
+        if n % _CANCEL_CHECK == 0 and is_cancelled():
+            return None
+    return matches
+
+
+class SearchWorker(QObject):
+    """
+    Runs find_all on the global thread pool. Every request gets a generation
+    number, starting a new one makes older searches stop at their next
+    check, and `finished` carries the generation so stale results can be
+    ignored by the receiver.
+    """
+
+    finished = Signal(int, object)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.generation = 0
+
+    def search(self, pattern: Pattern, text: Searchable) -> int:
+        self.generation += 1
+        generation = self.generation
+        QThreadPool.globalInstance().start(
+            lambda: self._run(generation, pattern, text))
+        return generation
+
+    def cancel(self) -> None:
+        self.generation += 1
+
+    def _run(self, generation: int, pattern: Pattern, text: Searchable) -> None:
+        try:
+            matches = find_all(pattern, text,
+                               lambda: generation != self.generation)
+        except (ValueError, BufferError) as e:
+            # The mapped input was closed under us, a newer search follows
+            print(f"Error: Search failed: {e}", file=sys.stderr)
+            return
+        if matches is not None:
+            self.finished.emit(generation, matches)
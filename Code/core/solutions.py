@@ -0,0 +1,95 @@
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QTextDocument
+from PySide6.QtWidgets import QPlainTextDocumentLayout
+
+from core.file_io import DebouncedWriter
+from ui.highlighter import PythonHighlighter
+
+SOLUTIONS_DIR_NAME = "solutions"
+AUTOSAVE_DELAY_MS = 500
+# Open documents keep their undo history and highlighting, so only the
+# most recently used days stay in memory
+MAX_OPEN_DOCUMENTS = 8
+
+
+def solution_path(user_id: str, year: int, day: int) -> str:
+    return os.path.join("user_files", user_id, SOLUTIONS_DIR_NAME,
+                        str(year), f"{int(day):02d}.py")
+
+
+class OpenSolution:
+    """A day's document together with its highlighter and autosave."""
+
+    def __init__(self, path: str, text: str, parent: QObject) -> None:
+        self.path = path
+        self.document = QTextDocument(parent)
+        self.document.setDocumentLayout(QPlainTextDocumentLayout(self.document))
+        # Loading the text also resets the undo history
+        self.document.setPlainText(text)
+        self.highlighter = PythonHighlighter(self.document)
+        self.writer = DebouncedWriter(path, AUTOSAVE_DELAY_MS, parent=self.document)
+        self.writer.mark_saved(text)
+        self.document.contentsChanged.connect(self.save)
+
+    def save(self) -> None:
+        self.writer.schedule(self.document.toPlainText())
+
+    def close(self) -> None:
+        self.writer.flush()
+        self.document.contentsChanged.disconnect(self.save)
+        self.document.deleteLater()
+
+
+class SolutionWorkspace(QObject):
+    """
+    One solution file per (year, day), stored under
+    user_files/<user_id>/solutions/<year>/<day>.py. Switching back to a day
+    that is still open reuses its document, so the undo stack, cursor and
+    highlighting are all still there. The least recently used day is saved
+    and dropped once more than `capacity` are open.
+    """
+
+    def __init__(self, user_id: str, capacity: int = MAX_OPEN_DOCUMENTS,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.user_id = user_id
+        self.capacity = max(1, capacity)
+        self._open: "OrderedDict[Tuple[int, int], OpenSolution]" = OrderedDict()
+
+    def document(self, year: int, day: int) -> QTextDocument:
+        key = (int(year), int(day))
+        solution = self._open.get(key)
+        if solution is not None:
+            self._open.move_to_end(key)
+            return solution.document
+
+        path = solution_path(self.user_id, *key)
+        solution = OpenSolution(path, self._read(path), self)
+        self._open[key] = solution
+        while len(self._open) > self.capacity:
+            _, evicted = self._open.popitem(last=False)
+            evicted.close()
+        return solution.document
+
+    def is_open(self, year: int, day: int) -> bool:
+        return (int(year), int(day)) in self._open
+
+    def open_days(self) -> List[Tuple[int, int]]:
+        """Open (year, day) pairs, least recently used first."""
+        return list(self._open)
+
+    def flush(self) -> None:
+        for solution in self._open.values():
+            solution.writer.flush()
+
+    @staticmethod
+    def _read(path: str) -> str:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
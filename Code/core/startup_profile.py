@@ -0,0 +1,70 @@
+import importlib
+import os
+import sys
+import time
+from types import ModuleType
+from typing import List, Tuple
+
+
+def _launch_time() -> float:
+    """
+    When the process started, on the perf_counter clock. Linux reports it
+    in /proc, elsewhere the best estimate is when this module was imported,
+    which main.py does first.
+    """
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name can hold spaces, the fields after it cannot
+            started_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - started_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return now
+    return now - max(0.0, age)
+
+
+LAUNCH_TIME = _launch_time()
+
+_marks: List[Tuple[str, float]] = []
+_imports: List[Tuple[str, float]] = []
+
+
+def elapsed_ms() -> float:
+    return (time.perf_counter() - LAUNCH_TIME) * 1000
+
+
+def mark(label: str) -> None:
+    """Record how long after startup a phase finished."""
+    _marks.append((label, elapsed_ms()))
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module on first use and record how long the import took.
+    Heavy dependencies (requests, keyring) go through here instead of
+    being imported at the top of a module, so they stay off the startup path.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports.append((name, (time.perf_counter() - start) * 1000))
+    return module
+
+
+def report() -> str:
+    lines = ["Startup (ms since launch):"]
+    lines += [f"  {ms:8.1f}  {label}" for label, ms in _marks]
+    lines.append("")
+    lines.append("Deferred imports (ms, on first use):")
+    if _imports:
+        lines += [f"  {ms:8.1f}  {name}" for name, ms in _imports]
+    else:
+        lines.append("  none yet")
+    lines.append("")
+    lines.append("For a full breakdown run: python -X importtime Code/main.py")
+    return "\n".join(lines)
@@ -0,0 +1,115 @@
+"""
+The session token lives in the system keyring. A copy is also kept in
+user_files/.session for when the keyring is slow or unavailable, and for
+tools such as the regression runner that run without it.
+
+The copy is the token in plain text, in a file only its owner can read
+(0600). It is not encrypted: any key kept next to it would be just as
+readable, so the file permissions are the protection, the same as for
+~/.netrc or an SSH key. Anyone who can read the file as you can use the
+token; delete the file to keep the token in the keyring only.
+"""
+import os
+import sys
+import threading
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from core.file_io import atomic_write
+from core.startup_profile import lazy_import
+
+KEYRING_SERVICE = "AoCode"
+KEYRING_USERNAME = "session_token"
+CACHE_PATH = os.path.join("user_files", ".session")
+# Some backends (D-Bus secret service) can block for a long time, the
+# cached copy is used if the keyring has not answered by then
+KEYRING_TIMEOUT = 3.0
+TOKEN_LENGTH = 128
+
+
+def is_valid_token(token: str) -> bool:
+    return len(token) == TOKEN_LENGTH and token.isalnum()
+
+
+def read_cached_token(path: str = CACHE_PATH) -> Optional[str]:
+    """The cached token, or None if there is none or the file holds something else."""
+    try:
+        with open(path, "r") as f:
+            token = f.read().strip()
+    except OSError:
+        return None
+    # Older versions stored an obfuscated blob, the keyring replaces it
+    return token if is_valid_token(token) else None
+
+
+def write_cached_token(token: str, path: str = CACHE_PATH) -> None:
+    # atomic_write's temp file is created 0600, so the token is never
+    # readable by others, not even before the chmod
+    atomic_write(path, token)
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        pass
+
+
+def save_token(token: str, path: str = CACHE_PATH) -> None:
+    """Store a new token in the keyring and the local cache."""
+    try:
+        lazy_import("keyring").set_password(
+            KEYRING_SERVICE, KEYRING_USERNAME, token)
+    except Exception as e:
+        print(f"Error: Could not save the session token to the keyring: {e}",
+              file=sys.stderr)
+    write_cached_token(token, path)
+
+
+class TokenLoader(QObject):
+    """
+    Fetches the session token off the GUI thread. The keyring is asked
+    first and the local copy is refreshed from it, so a token changed
+    elsewhere is never shadowed by an old copy. The copy is only used when
+    the keyring has no token, fails, or takes longer than KEYRING_TIMEOUT.
+    `loaded` carries the token, or an empty string when neither has one.
+    """
+
+    loaded = Signal(str)
+
+    def __init__(self, cache_path: str = CACHE_PATH, parent: Optional[QObject] = None,
+                 keyring_timeout: float = KEYRING_TIMEOUT) -> None:
+        super().__init__(parent)
+        self.cache_path = cache_path
+        self.keyring_timeout = keyring_timeout
+
+    def start(self) -> None:
+        QThreadPool.globalInstance().start(self.load)
+
+    def load(self) -> None:
+        cached = read_cached_token(self.cache_path)
+        token = self._from_keyring()
+        if token and token != cached:
+            try:
+                write_cached_token(token, self.cache_path)
+            except OSError as e:
+                print(f"Error: Could not cache the session token: {e}",
+                      file=sys.stderr)
+        self.loaded.emit(token or cached or "")
+
+    def _from_keyring(self) -> Optional[str]:
+        result: List[Optional[str]] = []
+
+        def read() -> None:
+            try:
+                result.append(lazy_import("keyring").get_password(
+                    KEYRING_SERVICE, KEYRING_USERNAME))
+            except Exception as e:
+                print(f"Error: Could not read the keyring: {e}", file=sys.stderr)
+
+        # A daemon thread, so a backend that never answers can't hold up exit
+        thread = threading.Thread(target=read, daemon=True)
+        thread.start()
+        thread.join(self.keyring_timeout)
+        if thread.is_alive():
+            print(f"Error: The keyring did not answer within {self.keyring_timeout:g}s, "
+                  "using the cached session token", file=sys.stderr)
+        return result[0] if result else None
@@ -1,9 +1,30 @@
+import ast
 import hashlib
 import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
 from PySide6.QtWidgets import QMessageBox
 from ui.highlighter import PythonHighlighter
+from core.file_io import DebouncedWriter, atomic_write, content_hash
+from core.legacy_template import TEMPLATE_V1
 import config.config as config
 
+AUTOSAVE_DELAY_MS = 500
+
+TEMPLATE_VERSION = 2
+STDLIB_DIR = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), "aoc_stdlib")
+TEMPLATE = f"""# AoCode utils template v{TEMPLATE_VERSION}
+# Everything in aoc_stdlib (grids, graph searches, matrices, primes, ...) is
+# imported below and is kept up to date by AoCode. Add your own helpers
+# after it, they are available in every solution.
+from aoc_stdlib import *
+"""
+_VERSION_PATTERN = re.compile(r"^# AoCode utils template v(\d+)", re.MULTILINE)
+# The line that makes a file current, whether or not its header comment survived
+_STDLIB_IMPORT = re.compile(r"^from aoc_stdlib import \*", re.MULTILINE)
+
 
 class Utils:
     def __init__(self, panel):
@@ -14,12 +35,24 @@ class Utils:
         self.utils_path = os.path.join(self.utils_dir, "utils.py")
         self.default_template = self.get_template()
         self.panel = panel
+        self.writer = DebouncedWriter(self.utils_path, AUTOSAVE_DELAY_MS)
+
+        # The in-memory buffer is authoritative, disk is only persistence.
+        # version increases on every edit so callers can cheaply tell whether
+        # the utils code changed since they last looked.
+        self.content: str = ""
+        self.version: int = 0
+        self._hash: Optional[str] = None
+        self._hash_version: int = -1
+        # Backup of the file as it was before load_file upgraded it, if it did
+        self.upgrade_backup: Optional[str] = None
 
         # Setup
         self.add_user()
         self.load_file()
 
-        # Connect text changes to autosave
+        # Connect text changes to autosave. Edits are coalesced and written
+        # off the GUI thread once typing pauses.
         self.panel.textChanged.connect(self.save_file)
 
         self.highlighter = PythonHighlighter(self.panel.document())
@@ -37,259 +70,137 @@ class Utils:
         try:
             with open(self.utils_path, "r") as f:
                 content = f.read()
-                self.panel.setPlainText(content)
+            content = self.upgrade_file(content)
+            self.writer.mark_saved(content)
+            self.set_content(content)
+            self.panel.setPlainText(content)
         except Exception as e:
             QMessageBox.critical(
                 None, "Error", f"Failed to load utils.py: {e}"
             )
 
-    def get_content(self):
-        try:
-            with open(self.utils_path, "r") as f:
-                return f.read()
-        except Exception as e:
-            QMessageBox.critical(
-                None, "Error", f"Failed to load utils.py: {e}"
-            )
-
-    def save_file(self):
-        try:
-            with open(self.utils_path, "w") as f:
-                f.write(self.panel.toPlainText())
-        except Exception as e:
-            QMessageBox.critical(
-                None, "Error", f"Failed to save utils.py: {e}"
-            )
-
-    def get_template(self):
-        return """# A couple of functions to get you started.
-
-from collections import deque
-from functools import reduce
-import heapq
-from typing import List, Tuple, Dict, Any
-
-
-# Strings, lists
-def lmap(func, *iterables):
-    return list(map(func, *iterables))
-
-
-def ints(s: str) -> List[int]:
-    return lmap(int, s.split())
-
-
-def words(s: str) -> List[str]:
-    return s.split()
-
-
-# Algorithms
-def binary_search(f, lo=0, hi=None):
-    lo_bool = f(lo)
-    if hi is None:
-        offset = 1
-        while f(lo + offset) == lo_bool:
-            offset *= 2
-        hi = lo + offset
-    else:
-        assert f(hi) != lo_bool
-    best_so_far = lo if lo_bool else hi
-    while lo <= hi:
-        mid = (hi + lo) // 2
-        result = f(mid)
-        if result:
-            best_so_far = mid
-        if result == lo_bool:
-            lo = mid + 1
-        else:
-            hi = mid - 1
-    return best_so_far
-
-
-def bfs(graph: Dict[Any, List[Any]], start: Any) -> List[Any]:
-    visited = set()
-    queue = deque([start])
-    result = []
-    while queue:
-        node = queue.popleft()
-        if node not in visited:
-            visited.add(node)
-            result.append(node)
-            queue.extend(graph.get(node, []))
-    return result
-
-
-def a_star(start, goal, neighbors, h):
-    pq = [(h(start), 0, start, [start])]
-    visited = set()
-    while pq:
-        f_score, g_score, current, path = heapq.heappop(pq)
-        if current == goal:
-            return path, g_score
-        if current in visited:
-            continue
-        visited.add(current)
-        for neighbor, cost in neighbors(current):
-            if neighbor in visited:
-                continue
-            new_g_score = g_score + cost
-            new_path = path + [neighbor]
-            heapq.heappush(pq, (new_g_score + h(neighbor),
-                        new_g_score, neighbor, new_path))
-    return None, float('inf')
-
-
-# Maths
-def isPrime(n: int) -> bool:
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
+    def upgrade_file(self, content):
+        backup = f"{self.utils_path}.v{template_version(content)}.bak"
+        # A backup means this file was upgraded before and edited since,
+        # whatever it looks like now is the user's choice
+        upgraded = None if os.path.exists(backup) else upgrade_utils(content)
+        if upgraded is None:
+            return content
+        # The old file is kept next to the new one in case anything was lost
+        atomic_write(backup, content)
+        atomic_write(self.utils_path, upgraded)
+        self.upgrade_backup = backup
+        return upgraded
 
+    def get_content(self):
+        return self.content
 
-def allPrimesToX(limit: int) -> List[int]:
-    if limit < 2:
-        return []
-    sieve = [True] * (limit + 1)
-    sieve[0] = sieve[1] = False
-    for start in range(2, int(limit**0.5) + 1):
-        if sieve[start]:
-            for multiple in range(start * start, limit + 1, start):
-                sieve[multiple] = False
-    return [num for num, is_prime in enumerate(sieve) if is_prime]
-
-
-# Data structures
-class UnionFind:
-    def __init__(self, n: int):
-        self.n = n
-        self.parents = [None] * n
-        self.ranks = [1] * n
-        self.num_sets = n
-
-    def find(self, i: int) -> int:
-        p = self.parents[i]
-        if p is None:
-            return i
-        p = self.find(p)
-        self.parents[i] = p
-        return p
+    def set_content(self, content):
+        self.content = content
+        self.version += 1
 
-    def in_same_set(self, i: int, j: int) -> bool:
-        return self.find(i) == self.find(j)
+    def content_hash(self):
+        # Only rehash when the buffer has changed since the last call
+        if self._hash_version != self.version:
+            self._hash = content_hash(self.content)
+            self._hash_version = self.version
+        return self._hash
 
-    def merge(self, i: int, j: int) -> None:
-        i = self.find(i)
-        j = self.find(j)
-        if i == j:
-            return
-        if self.ranks[i] < self.ranks[j]:
-            self.parents[i] = j
-        elif self.ranks[i] > self.ranks[j]:
-            self.parents[j] = i
+    def save_file(self):
+        self.set_content(self.panel.toPlainText())
+        self.writer.schedule(self.content)
+
+    def flush(self):
+        self.writer.flush()
+
+    @staticmethod
+    def get_template():
+        return TEMPLATE
+
+
+def template_version(content: str) -> int:
+    match = _VERSION_PATTERN.search(content)
+    return int(match.group(1)) if match else 1
+
+
+def _top_level_names(node: ast.stmt) -> Set[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, ast.Assign):
+        return {target.id for target in node.targets if isinstance(target, ast.Name)}
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return {(alias.asname or alias.name).split(".")[0] for alias in node.names}
+    return set()
+
+
+def _template_definitions() -> Dict[str, Set[str]]:
+    """The AST of every helper any template version shipped, by name."""
+    sources = [TEMPLATE_V1]
+    for name in sorted(os.listdir(STDLIB_DIR)):
+        if name.endswith(".py"):
+            with open(os.path.join(STDLIB_DIR, name), "r", encoding="utf-8") as f:
+                sources.append(f.read())
+
+    definitions: Dict[str, Set[str]] = defaultdict(set)
+    for source in sources:
+        for node in ast.parse(source).body:
+            for name in _top_level_names(node):
+                definitions[name].add(ast.dump(node))
+    return definitions
+
+
+def upgrade_utils(content: str) -> Optional[str]:
+    """
+    Move a utils.py written from an older template onto the current one.
+    Helpers that are unchanged copies of template code, and imports the
+    stdlib already provides, are dropped; everything else the user wrote is
+    kept after the new header. Unchanged helpers whose stdlib version behaves
+    differently are imported from aoc_stdlib.compat_v1 instead, so solutions
+    written against them keep working. Returns None when content is up to
+    date, including a current file whose header comment was deleted.
+    """
+    if template_version(content) >= TEMPLATE_VERSION or _STDLIB_IMPORT.search(content):
+        return None
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        # Can't tell what is whose, keep it all and let it shadow the stdlib
+        return f"{TEMPLATE}\n\n{content}"
+
+    import aoc_stdlib
+    from aoc_stdlib import compat_v1
+    provided = set(aoc_stdlib.__all__)
+    definitions = _template_definitions()
+    lines = content.splitlines()
+    kept: List[str] = []
+    compat: List[str] = []
+    user_names: Set[str] = set()
+    previous_end = 0
+
+    for node in tree.body:
+        names = _top_level_names(node)
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            from_template = bool(names) and names <= provided
         else:
-            self.parents[j] = i
-            self.ranks[i] += 1
-        self.num_sets -= 1
-
-
-class Linked:
-    def __init__(self, value):
-        self.value = value
-        self.next = None
-
-    def append(self, value):
-        new_node = Linked(value)
-        current = self
-        while current.next:
-            current = current.next
-        current.next = new_node
-
-
-# List/Vector operations
-DIRS4 = [[-1, 0], [1, 0], [0, -1], [0, 1]]
-DIRS8 = DIRS4 + [[-1, -1], [-1, 1], [1, -1], [1, 1]]
-
-
-def padd(x, y):
-    return [a + b for a, b in zip(x, y)]
-
-
-def pneg(v):
-    return [-i for i in v]
-
-
-def psub(x, y):
-    return [a - b for a, b in zip(x, y)]
-
-
-def pdist1(x, y=None):
-    if y is not None:
-        x = psub(x, y)
-    return sum(map(abs, x))
-
-
-# Matrices
-def matmat(a, b):
-    n, k1 = len(a), len(a[0])
-    k2, m = len(b), len(b[0])
-    assert k1 == k2
-    return [[sum(a[i][k] * b[k][j] for k in range(k1)) for j in range(m)] for i in range(n)]
-
-
-def matvec(a, v):
-    return [j for i in matmat(a, [[x] for x in v]) for j in i]
-
-
-def matexp(a, k):
-    n = len(a)
-    out = [[int(i == j) for j in range(n)] for i in range(n)]
-    while k > 0:
-        if k % 2 == 1:
-            out = matmat(a, out)
-        a = matmat(a, a)
-        k //= 2
-    return out
-
-
-# Miscellaneous
-def manhattan(point1: Tuple[int, int], point2: Tuple[int, int]) -> int:
-    return sum(abs(a - b) for a, b in zip(point1, point2))
-
-
-def bounds(a, b, limit):
-    return 0 <= a < limit and 0 <= b < limit
-
-
-def lcmWithRemainder(a: List[int], n: List[int]) -> int:
-    def extended_gcd(a, b):
-        if b == 0:
-            return a, 1, 0
-        gcd, x1, y1 = extended_gcd(b, a % b)
-        return gcd, y1, x1 - (a // b) * y1
-
-    def mod_inverse(a, m):
-        gcd, x, _ = extended_gcd(a, m)
-        if gcd != 1:
-            raise ValueError("Modular inverse does not exist")
-        return x % m
-
-    if len(a) != len(n):
-        raise ValueError("Lists 'a' and 'n' must have the same length.")
-    if all(rem == 0 for rem in a):
-        return 0
-    N = reduce(lambda x, y: x * y, n)
-    result = 0
-    for ai, ni in zip(a, n):
-        Ni = N // ni
-        Mi = mod_inverse(Ni, ni)
-        result += ai * Ni * Mi
-    return result % N"""
+            from_template = bool(names) and all(
+                ast.dump(node) in definitions.get(name, ()) for name in names)
+        if from_template and names & set(compat_v1.__all__):
+            reads = {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+            if reads & user_names:
+                # Built from a helper the user changed, e.g. DIRS8 from DIRS4
+                from_template = False
+            else:
+                compat.extend(name for name in compat_v1.__all__ if name in names)
+        # Comments and blank lines above a node go with it
+        if not from_template:
+            kept.extend(lines[previous_end:node.end_lineno])
+            user_names |= names
+        previous_end = node.end_lineno
+    kept.extend(lines[previous_end:])
+
+    header = TEMPLATE
+    if compat:
+        header += ("# Kept as your old utils.py had them, aoc_stdlib's versions differ\n"
+                   f"from aoc_stdlib.compat_v1 import {', '.join(compat)}\n")
+    additions = "\n".join(kept).strip("\n")
+    return f"{header}\n\n{additions}\n" if additions.strip() else header
@@ -1,19 +1,41 @@
+from core import startup_profile  # Imported first so it timestamps launch
 import sys
 import os
+from functools import partial
 from typing import List, Optional
 from PySide6 import QtWidgets, QtCore, QtGui
-from core.aoc_fetcher import fetch_input, fetch_problem, get_last_paragraph
+from core.aoc_fetcher import Problem, ensure_input_file, load_problem
 from ui.highlighter import PythonHighlighter
 from ui.code_editor import CodeEditor
 from PySide6.QtGui import QFont, QTextCursor, QIcon
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QSize, QObject
-from core.runner import execute_code, submit_answer
+from core.runner import compare_interpreters, execute_code, precompile_stdlib, submit_answer
 from core.utils import Utils
+from core.solutions import SolutionWorkspace
+from core.perf_history import PerfHistory, history_path
+from core.run_metrics import Metrics
+from core.exec_cache import CachedRun, ExecCache
+from core.cache import user_cache_dir
+from core.cells import CellSession, execute_cells
+from core.interpreters import Interpreter, InterpreterDetector, current as current_interpreter
 import config.config as config
-from config.preferences import Preferences
+from config.preferences import Preferences, create_store, apply_editor_style, apply_console_style
+from config.preferences_store import PreferencesStore
+from core.token_store import TokenLoader, is_valid_token, save_token
 from ui.infobox import Infobox
-from keyring import get_password, set_password
+from ui.input_view import InputView
+from ui.find_bar import FindBar
+from ui.perf_panel import PerfPanel
+
+# Preferences section mapping "year-day" to the interpreter path for that day
+INTERPRETER_SECTION = "interpreters"
+
+PROBLEM_STYLESHEET = """
+pre { background-color: #e4e4e4; }
+code { font-family: Menlo, Consolas, monospace; }
+em { font-weight: bold; font-style: normal; }
+"""
 
 
 class AoCEditor(QtWidgets.QWidget):
@@ -23,18 +45,23 @@ class AoCEditor(QtWidgets.QWidget):
         self.resize(1200, 1000)
         self.setWindowTitle("AoCode")
 
-        config.TOKEN = get_password("AoCode", "session_token")
-        if config.TOKEN:
-            self.session_cookie: str = config.TOKEN
-        else:
-            self.session_cookie: str = self.get_session_token()
-            config.TOKEN = self.session_cookie
-
-        if not self.session_cookie:
-            QtWidgets.QMessageBox.critical(
-                self, "No Session Token", "A valid session token is required to continue."
-            )
-            QtWidgets.QApplication.instance().quit()
+        # Everything that needs the session token (user files, preferences,
+        # the problem itself) is loaded by finish_startup once the window is up
+        self.session_cookie: str = ""
+        self.utilsEditor: Optional[Utils] = None
+        self.solutions: Optional[SolutionWorkspace] = None
+        self.perf_history: Optional[PerfHistory] = None
+        self.exec_cache: Optional[ExecCache] = None
+        self.cell_session: CellSession = CellSession()
+        # Filled in by InterpreterDetector, the editor's own Python until then
+        self.interpreters: List[Interpreter] = [current_interpreter()]
+        self.preferences_store: Optional[PreferencesStore] = None
+        self.problem: Optional[Problem] = None
+
+        # Built the first time they are opened
+        self._infobox_panel: Optional[Infobox] = None
+        self._preferences_panel: Optional[Preferences] = None
+        self._perf_panel: Optional[PerfPanel] = None
 
         main_layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout(self)
 
@@ -109,6 +136,14 @@ class AoCEditor(QtWidgets.QWidget):
             str(current_day) if int(current_day) <= 25 else "1")
         dropdown_layout.addWidget(self.day_dropdown)
 
+        # Which Python runs the solution, remembered for each day
+        self.interpreter_dropdown: QtWidgets.QComboBox = QtWidgets.QComboBox()
+        self.interpreter_dropdown.setToolTip(
+            "Python that runs this day's solution. History > Compare Interpreters times them all.")
+        self.show_interpreters()
+        self.interpreter_dropdown.currentIndexChanged.connect(self.set_day_interpreter)
+        dropdown_layout.addWidget(self.interpreter_dropdown)
+
         self.run_button: QtWidgets.QPushButton = QtWidgets.QPushButton(self)
         self.run_button.setFixedSize(50, 50)
         self.run_button.setStyleSheet(
@@ -120,6 +155,21 @@ class AoCEditor(QtWidgets.QWidget):
 
         self.run_button.clicked.connect(self.run_code)
 
+        # Cell mode: `# %%` splits the code and only what changed runs again
+        self.cells_button: QtWidgets.QPushButton = QtWidgets.QPushButton("Cells", self)
+        self.cells_button.setCheckable(True)
+        self.cells_button.setFixedHeight(32)
+        self.cells_button.setToolTip(
+            "Split the code into cells with '# %%' lines and only re-run the cells that changed")
+        self.cells_button.toggled.connect(self.set_cell_mode)
+        dropdown_layout.insertWidget(dropdown_layout.indexOf(self.run_button), self.cells_button)
+
+        # Says where the last output came from: the run cache or cell mode
+        self.run_status_label: QtWidgets.QLabel = QtWidgets.QLabel()
+        self.run_status_label.setStyleSheet("color: gray; font-style: italic;")
+        self.run_status_label.hide()
+        dropdown_layout.addWidget(self.run_status_label)
+
         row1_layout.addLayout(dropdown_layout, 0, 1)
         main_layout.addLayout(row1_layout)
 
@@ -129,6 +179,12 @@ class AoCEditor(QtWidgets.QWidget):
         self.submit_button.clicked.connect(self.handle_submit_button)
         dropdown_layout.addWidget(self.submit_button)
 
+        self.history_button: QtWidgets.QPushButton = QtWidgets.QPushButton(self)
+        self.history_button.setFixedSize(80, 50)
+        self.history_button.setText("History")
+        self.history_button.clicked.connect(self.toggle_perf_panel)
+        dropdown_layout.addWidget(self.history_button)
+
         # Row 2: Problem Description and Code/Terminal Section
         main_splitter: QtWidgets.QSplitter = QtWidgets.QSplitter(
             QtCore.Qt.Horizontal)
@@ -138,22 +194,18 @@ class AoCEditor(QtWidgets.QWidget):
         left_layout.setContentsMargins(0, 0, 0, 0)
 
         self.problem_tabs: QtWidgets.QTabWidget = QtWidgets.QTabWidget()
-        self.part1_panel: QtWidgets.QTextEdit = QtWidgets.QTextEdit()
-        self.part2_panel: QtWidgets.QTextEdit = QtWidgets.QTextEdit()
+        self.part1_panel: QtWidgets.QTextBrowser = QtWidgets.QTextBrowser()
+        self.part2_panel: QtWidgets.QTextBrowser = QtWidgets.QTextBrowser()
         self.utils_panel: QtWidgets.QTextEdit = QtWidgets.QTextEdit()
 
-        self.utilsEditor: Utils = Utils(self.utils_panel)
-
         for panel in [self.part1_panel, self.part2_panel, self.utils_panel]:
             panel.setStyleSheet("background-color: #f0f0f0; color: black;")
 
-        self.utils_panel.setPlaceholderText(
-            self.utilsEditor.default_template)
+        for panel in [self.part1_panel, self.part2_panel]:
+            panel.setOpenExternalLinks(True)
+            panel.document().setDefaultStyleSheet(PROBLEM_STYLESHEET)
 
-        self.part1_panel.setReadOnly(True)
-        self.part2_panel.setReadOnly(True)
-
-        self.input_panel: QtWidgets.QTextEdit = QtWidgets.QTextEdit()
+        self.input_panel: InputView = InputView()
         self.input_panel.setStyleSheet(
             "background-color: #ffffff; color: black;"
         )
@@ -205,17 +257,81 @@ class AoCEditor(QtWidgets.QWidget):
         right_splitter.setSizes([800, 200])
 
         main_layout.addWidget(main_splitter)
+
+        # One find/replace bar for every panel, opened on whichever has focus
+        self.find_bar: FindBar = FindBar(self)
+        main_layout.addWidget(self.find_bar)
+        find_shortcut = QtGui.QShortcut(QtGui.QKeySequence.Find, self)
+        find_shortcut.activated.connect(self.open_find_bar)
+
         self.setLayout(main_layout)
 
         self.code_editor.installEventFilter(self)
+        startup_profile.mark("main window built")
+
+    def finish_startup(self) -> None:
+        """Runs once the window is on screen and starts loading the session token."""
+        startup_profile.mark("first event loop pass")
 
-        self.infobox_panel = Infobox()
-        self.infobox_panel.installEventFilter(self)
+        # The keyring can block for seconds on some Linux backends, so the
+        # token is fetched in the background and the rest of startup
+        # continues in on_token_loaded
+        self.token_loader = TokenLoader(parent=self)
+        self.token_loader.loaded.connect(self.on_token_loaded)
+        self.token_loader.start()
 
-        self.preferences_panel = Preferences(
-            editor=self.code_editor, console=self, token=self.session_cookie)
-        self.preferences_panel.editor = self.code_editor
-        self.preferences_panel.installEventFilter(self)
+        QtCore.QThreadPool.globalInstance().start(precompile_stdlib)
+
+    def on_token_loaded(self, token: str) -> None:
+        """Loads the user files and today's problem once the token is known."""
+        startup_profile.mark("session token loaded")
+
+        if not token:
+            token = self.get_session_token()
+
+        if not token:
+            QtWidgets.QMessageBox.critical(
+                self, "No Session Token", "A valid session token is required to continue."
+            )
+            QtWidgets.QApplication.instance().quit()
+            return
+
+        self.session_cookie = token
+        config.TOKEN = token
+
+        self.utilsEditor = Utils(self.utils_panel)
+        self.utils_panel.setPlaceholderText(
+            self.utilsEditor.default_template)
+        if self.utilsEditor.upgrade_backup:
+            QtWidgets.QMessageBox.information(
+                self, "utils.py Upgraded",
+                "Your utils.py now imports the built-in helpers from aoc_stdlib. "
+                "Unchanged copies of the old helpers were removed, the ones that "
+                "behave differently in aoc_stdlib come from aoc_stdlib.compat_v1, "
+                "and your own code was kept. "
+                f"The previous file is saved as {self.utilsEditor.upgrade_backup}."
+            )
+        self.solutions = SolutionWorkspace(self.utilsEditor.user_id, parent=self)
+        self.perf_history = PerfHistory(history_path(self.utilsEditor.user_id))
+        self.exec_cache = ExecCache(user_cache_dir("exec"))
+
+        # Apply saved preferences straight from the store, the Preferences
+        # window itself is only built when it is first opened
+        self.preferences_store = create_store(self.session_cookie)
+        apply_editor_style(self.preferences_store, self.code_editor)
+        apply_console_style(self.preferences_store, self)
+        self.cells_button.setChecked(bool(
+            self.preferences_store.get("code_editor_preferences", "CellMode", False)))
+
+        # Probing each Python on PATH starts it once, so it is done in the
+        # background. Interpreters picked earlier are checked even if they
+        # are no longer on PATH.
+        chosen = self.preferences_store.data.get(INTERPRETER_SECTION, {}).values()
+        self.interpreter_detector = InterpreterDetector(
+            [path for path in chosen if path], parent=self)
+        self.interpreter_detector.detected.connect(self.on_interpreters_detected)
+        self.interpreter_detector.start()
+        startup_profile.mark("user files loaded")
 
         self.year_dropdown.currentIndexChanged.connect(
             self.update_problem_description
@@ -226,21 +342,49 @@ class AoCEditor(QtWidgets.QWidget):
 
         self.update_problem_description()
         self.problem_tabs.currentChanged.connect(self.update_hint)
+        startup_profile.mark("problem loaded")
+
+    @property
+    def preferences_panel(self) -> Preferences:
+        if self._preferences_panel is None:
+            self._preferences_panel = Preferences(
+                editor=self.code_editor, console=self, token=self.session_cookie,
+                store=self.preferences_store)
+            self._preferences_panel.installEventFilter(self)
+        return self._preferences_panel
+
+    @property
+    def infobox_panel(self) -> Infobox:
+        if self._infobox_panel is None:
+            self._infobox_panel = Infobox()
+            self._infobox_panel.installEventFilter(self)
+        return self._infobox_panel
+
+    @property
+    def perf_panel(self) -> PerfPanel:
+        if self._perf_panel is None:
+            self._perf_panel = PerfPanel()
+            self._perf_panel.load_requested.connect(self.load_solution_code)
+            self._perf_panel.compare_requested.connect(self.run_comparison)
+            self._perf_panel.installEventFilter(self)
+        return self._perf_panel
 
     def toggle_preferences(self):
-        if self.preferences_panel.isVisible():
+        if self._preferences_panel is not None and self._preferences_panel.isVisible():
             self.close_preferences()
         else:
             self.open_preferences()
 
     def open_preferences(self) -> None:
+        if self.preferences_store is None:
+            return  # Still starting up
         self.preferences_panel.show()
 
     def close_preferences(self) -> None:
         self.preferences_panel.close()
 
     def toggle_infobox(self):
-        if self.infobox_panel.isVisible():
+        if self._infobox_panel is not None and self._infobox_panel.isVisible():
             self.close_infobox()
         else:
             self.open_infobox()
@@ -251,6 +395,115 @@ class AoCEditor(QtWidgets.QWidget):
     def close_infobox(self) -> None:
         self.infobox_panel.close()
 
+    def toggle_perf_panel(self):
+        if self._perf_panel is not None and self._perf_panel.isVisible():
+            self.close_perf_panel()
+        else:
+            self.open_perf_panel()
+
+    def open_perf_panel(self) -> None:
+        if self.perf_history is None:
+            return  # Still starting up
+        self.refresh_perf_panel(force=True)
+        self.perf_panel.show()
+
+    def close_perf_panel(self) -> None:
+        self.perf_panel.close()
+
+    def refresh_perf_panel(self, force: bool = False) -> None:
+        # Only redrawn while it is open, opening it always refreshes
+        if self.perf_history is None or not (force or (
+                self._perf_panel is not None and self._perf_panel.isVisible())):
+            return
+        self.perf_panel.show_history(
+            self.perf_history, int(config.CURRENT_YEAR), int(config.CURRENT_DAY),
+            int(config.CURRENT_PART or 1))
+
+    def record_run(self, code: str, metrics: Metrics, ok: bool,
+                   interpreter: Optional[Interpreter] = None) -> None:
+        """Adds a finished run to the performance history of the current part."""
+        if self.perf_history is None:
+            return
+        stdlib_version = startup_profile.lazy_import("aoc_stdlib").__version__
+        self.perf_history.record(
+            int(config.CURRENT_YEAR), int(config.CURRENT_DAY), int(config.CURRENT_PART or 1),
+            code, metrics, self.utilsEditor.content_hash()[:16], stdlib_version, ok,
+            (interpreter or current_interpreter()).label)
+        self.refresh_perf_panel()
+
+    def on_interpreters_detected(self, interpreters: List[Interpreter]) -> None:
+        self.interpreters = interpreters
+        self.show_interpreters()
+
+    def show_interpreters(self) -> None:
+        """Fills the interpreter dropdown and selects the current day's choice."""
+        self.interpreter_dropdown.blockSignals(True)
+        self.interpreter_dropdown.clear()
+        for index, interpreter in enumerate(self.interpreters):
+            label = interpreter.label + (" (editor)" if index == 0 else "")
+            self.interpreter_dropdown.addItem(label, interpreter.path)
+            self.interpreter_dropdown.setItemData(
+                index, interpreter.path, QtCore.Qt.ItemDataRole.ToolTipRole)
+        index = self.interpreter_dropdown.findData(self.day_interpreter_path())
+        self.interpreter_dropdown.setCurrentIndex(max(index, 0))
+        self.interpreter_dropdown.blockSignals(False)
+
+    def day_interpreter_path(self) -> str:
+        if self.preferences_store is None:
+            return ""
+        return self.preferences_store.get(
+            INTERPRETER_SECTION, f"{config.CURRENT_YEAR}-{config.CURRENT_DAY}", "")
+
+    def set_day_interpreter(self, index: int) -> None:
+        if self.preferences_store is None or index < 0:
+            return
+        # An empty path means the editor's own Python, whichever that is later
+        path = self.interpreter_dropdown.itemData(index) if index > 0 else ""
+        self.preferences_store.set(
+            INTERPRETER_SECTION, f"{config.CURRENT_YEAR}-{config.CURRENT_DAY}", path)
+
+    def selected_interpreter(self) -> Interpreter:
+        return self.interpreters[max(self.interpreter_dropdown.currentIndex(), 0)]
+
+    def run_comparison(self) -> None:
+        """Times the current code under every interpreter found, side by side."""
+        if self.utilsEditor is None:
+            return  # Still starting up
+        code = self.code_editor.toPlainText()
+        if not code.strip():
+            self.terminal.setText("Error: No code to execute!")
+            return
+
+        self.run_status_label.hide()
+        if len(self.interpreters) < 2:
+            self.terminal.setText(
+                "Only one Python was found. Put PyPy or another python3.x on your PATH to compare.")
+            return
+        self.terminal.setText(compare_interpreters(
+            code, self.utilsEditor.get_content(), self.interpreters,
+            on_metrics=lambda interpreter, metrics, ok: self.record_run(
+                code, metrics, ok, interpreter)))
+
+    def load_solution_code(self, code: str) -> None:
+        # One edit block, so a single undo brings back what was there
+        cursor = QTextCursor(self.code_editor.document())
+        cursor.beginEditBlock()
+        cursor.select(QTextCursor.Document)
+        cursor.insertText(code)
+        cursor.endEditBlock()
+
+    def open_find_bar(self) -> None:
+        panels = [self.code_editor, self.terminal, self.part1_panel,
+                  self.part2_panel, self.input_panel, self.utils_panel]
+        widget = QApplication.focusWidget()
+        if widget is not None and self.find_bar.isAncestorOf(widget):
+            self.find_bar.find_edit.selectAll()
+            return
+        while widget is not None and widget not in panels:
+            widget = widget.parentWidget()
+        # Nothing searchable has focus, so search the tab on show
+        self.find_bar.open_for(widget or self.problem_tabs.currentWidget())
+
     def handle_submit_button(self) -> None:
         # Handles the submit button action
         year, day, part = config.CURRENT_YEAR, config.CURRENT_DAY, config.CURRENT_PART
@@ -274,25 +527,76 @@ class AoCEditor(QtWidgets.QWidget):
         return year, day, part
 
     def run_code(self) -> None:
+        self._run_code(force=False)
+
+    def rerun_code(self) -> None:
+        """Runs the code again even if the same run is in the cache."""
+        self._run_code(force=True)
+
+    def _run_code(self, force: bool) -> None:
+        if self.utilsEditor is None:
+            return  # Still starting up
+
         code = self.code_editor.toPlainText()
         if not code.strip():
             self.terminal.setText("Error: No code to execute!")
             return
 
-        # Make the utils content available to the user's code
-        utils_content = self.utilsEditor.get_content() or ""
+        # Make the utils content available to the user's code. This is the
+        # in-memory buffer, so there is no disk read per run.
+        utils_content = self.utilsEditor.get_content()
+
+        interpreter = self.selected_interpreter()
+        self.run_status_label.hide()
+        if self.cells_button.isChecked():
+            self._run_cells(code, utils_content, force, interpreter)
+            return
 
-        output = execute_code(code, utils_content)
+        output = execute_code(code, utils_content,
+                              on_metrics=partial(self.record_run, code, interpreter=interpreter),
+                              cache=self.exec_cache, force=force,
+                              on_cached=self.show_cached_run, interpreter=interpreter)
         if output:
             self.terminal.setText(output)
         else:
             self.terminal.setText("Code executed successfully (no output)")
 
+    def _run_cells(self, code: str, utils_content: str, restart: bool,
+                   interpreter: Interpreter) -> None:
+        result = execute_cells(self.cell_session, code, utils_content, restart, interpreter)
+        self.terminal.setText(result.output or "Code executed successfully (no output)")
+        if result.cell_count:
+            ran = ", ".join(str(i + 1) for i in result.ran) or "none"
+            self.run_status_label.setText(f"cells run: {ran}")
+            self.run_status_label.setToolTip(
+                f"{len(result.ran)} of {result.cell_count} cells ran, the rest kept their "
+                "results from before. Cmd+Shift+R starts a fresh worker and runs them all.")
+            self.run_status_label.show()
+
+    def set_cell_mode(self, enabled: bool) -> None:
+        if not enabled:
+            self.cell_session.stop()
+        if self.preferences_store is not None:
+            self.preferences_store.set("code_editor_preferences", "CellMode", enabled)
+
+    def show_cached_run(self, cached: CachedRun) -> None:
+        when = QtCore.QDateTime.fromSecsSinceEpoch(int(cached.created)).toString("HH:mm")
+        took = f", it took {cached.wall * 1000:.0f} ms" if cached.wall is not None else ""
+        self.run_status_label.setText("cached")
+        self.run_status_label.setToolTip(
+            f"Output of an identical run at {when}{took}. Cmd+Shift+R runs it again.")
+        self.run_status_label.show()
+
     def _handle_keyboard_shortcuts(self, event: QtCore.QEvent) -> bool:
         # _ at the start of a function name indicates it should only be used inside the class
         key = event.key()
         modifiers = event.modifiers()
 
+        # Run again, skipping the cache
+        if key == QtCore.Qt.Key_R and modifiers == QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier:
+            self.rerun_code()
+            return True
+
         if modifiers != QtCore.Qt.ControlModifier:
             return False
 
@@ -316,6 +620,11 @@ class AoCEditor(QtWidgets.QWidget):
             self.toggle_infobox()
             return True
 
+        # Run history
+        if key == QtCore.Qt.Key_H:
+            self.toggle_perf_panel()
+            return True
+
         # Use Cmd+tab to switch between tabs
         tab_keys = {
             QtCore.Qt.Key_1: 0,
@@ -423,27 +732,6 @@ class AoCEditor(QtWidgets.QWidget):
                 break
         return indentation
 
-    def add_newlines_after_second_dash(self, text: str) -> str:
-        """Add two newlines after the second occurrence of '---' in the text."""
-        dash_count = 0
-        result = ""
-        i = 0
-
-        while i < len(text):
-            if text[i:i+3] == "---":
-                result += "---"
-                dash_count += 1
-                i += 3
-
-                if dash_count == 2:
-                    # Add two newlines after the second "---"
-                    result += "\n\n"
-            else:
-                result += text[i]
-                i += 1
-
-        return result
-
     def update_problem_description(self) -> None:
         year: str = self.year_dropdown.currentText()
         day: str = self.day_dropdown.currentText()
@@ -451,54 +739,53 @@ class AoCEditor(QtWidgets.QWidget):
         config.CURRENT_YEAR = year
         config.CURRENT_DAY = day
 
-        parts, error_msg = fetch_problem(
-            int(year), int(day), self.session_cookie
-        )
-
-        part1_text: str = parts[0] if len(parts) > 0 else ""
-        part2_text: str = parts[1] if len(parts) > 1 else ""
+        # Each day keeps its own solution, swapping documents is instant
+        # and leaves every day's undo history intact
+        self.code_editor.set_document(self.solutions.document(int(year), int(day)))
+        self.show_interpreters()
 
-        if error_msg:
-            print(f"Error: {error_msg}")
+        # Formatting and hints are worked out once per fetch, so switching
+        # tabs afterwards does no text processing
+        self.problem = load_problem(int(year), int(day), self.session_cookie)
 
-        if part1_text:
-            # Add two newlines after the second occurrence of "---"
-            formatted_part1 = self.add_newlines_after_second_dash(part1_text)
-            self.part1_panel.setPlainText(formatted_part1)
+        if self.problem.error:
+            print(f"Error: {self.problem.error}")
 
-            if part2_text:
-                formatted_part2 = self.add_newlines_after_second_dash(
-                    part2_text)
-                self.part2_panel.setPlainText(formatted_part2)
+        for panel, fragment, text in zip([self.part1_panel, self.part2_panel],
+                                         self.problem.html, self.problem.formatted):
+            if fragment:
+                panel.setHtml(fragment)
             else:
-                self.part2_panel.setPlainText(
-                    "Part 2 not available yet. Complete Part 1 first!")
+                panel.setPlainText(text)
 
-            user_input: str = fetch_input(
+        if self.problem.parts[0]:
+            # The input is cached on disk and memory-mapped by the panel
+            # rather than copied into a text widget
+            input_path, error_msg = ensure_input_file(
                 int(year), int(day), self.session_cookie)
-            self.input_panel.setPlainText(user_input)
+            if error_msg:
+                self.input_panel.set_text(error_msg)
+            else:
+                self.input_panel.load_file(input_path)
 
-            last_sentence: str = get_last_paragraph(part1_text)
-            self.hint_box.setPlainText(last_sentence)
+            self.hint_box.setPlainText(self.problem.hints[0])
 
             self.problem_tabs.setCurrentIndex(0)
-        else:
-            self.part1_panel.setPlainText("No problem available for today.")
-            self.part2_panel.setPlainText("")
+
+        self.refresh_perf_panel()
 
     def update_hint(self, index: int) -> None:
+        if self.problem is None:
+            return
         if index == 0:
             config.CURRENT_PART = 1
-            last_sentence = get_last_paragraph(
-                self.part1_panel.toPlainText()
-            )
-            self.hint_box.setPlainText(last_sentence)
+            self.hint_box.setPlainText(self.problem.hints[0])
         elif index == 1:
             config.CURRENT_PART = 2
-            last_sentence = get_last_paragraph(
-                self.part2_panel.toPlainText()
-            )
-            self.hint_box.setPlainText(last_sentence)
+            self.hint_box.setPlainText(self.problem.hints[1])
+        else:
+            return
+        self.refresh_perf_panel()
 
     def get_session_token(parent: Optional[QtWidgets.QWidget] = None) -> str:
         while True:
@@ -532,9 +819,10 @@ class AoCEditor(QtWidgets.QWidget):
 
             def handle_submit() -> None:
                 token: str = session_input.text().strip()
-                if len(token) == 128 and token.isalnum():
+                if is_valid_token(token):
                     valid_token[0] = token
-                    set_password("AoCode", "session_token", token)
+                    QtCore.QThreadPool.globalInstance().start(
+                        lambda: save_token(token))
                     dialog.accept()
                 else:
                     QtWidgets.QMessageBox.warning(
@@ -568,4 +856,6 @@ if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
     window = AoCEditor()
     window.show()
+    startup_profile.mark("main window shown")
+    QtCore.QTimer.singleShot(0, window.finish_startup)
     sys.exit(app.exec())
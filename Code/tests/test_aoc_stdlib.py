@@ -0,0 +1,327 @@
+import os
+import sys
+import time
+
+import pytest
+# Imported the way solutions import it, so patches reach the same modules
+from aoc_stdlib import matrix, parallel
+
+
+@pytest.fixture(scope="module")
+def stdlib():
+    """Everything `from aoc_stdlib import *` gives a solution."""
+    namespace = {}
+    exec("from aoc_stdlib import *", namespace)
+    return namespace
+
+
+def test_point_helpers_return_tuples(stdlib):
+    """Test that points come back as hashable tuples."""
+    assert stdlib["padd"]((1, 2), (3, 4)) == (4, 6)
+    assert stdlib["psub"]((1, 2, 3), (1, 1, 1)) == (0, 1, 2)
+    assert stdlib["pneg"]((1, -2)) == (-1, 2)
+    assert stdlib["pdist1"]((1, 2), (4, 0)) == 5
+    assert stdlib["manhattan"]((1, 2), (4, 0)) == 5
+    assert stdlib["manhattan"]((0, 0, 0), (1, 2, 3)) == 6
+    assert len(set(stdlib["DIRS8"])) == 8
+
+
+def test_complex_grid(stdlib):
+    """Test complex coordinates, where turning is a multiplication."""
+    grid = stdlib["complex_grid"](["ab", "cd"])
+
+    assert grid[1 + 1j] == "d"
+    assert 1j * 1j == -1 and -1 in stdlib["CDIRS4"]
+
+
+def test_grid_neighbors_and_positions(stdlib):
+    """Test the flat grid's index conversions and border handling."""
+    grid = stdlib["Grid"](["#.S", "..#"])
+    start = grid.find("S")
+
+    assert grid.pos(start) == (0, 2)
+    assert grid[0, 2] == "S"
+    assert sorted(grid.pos(i) for i in grid.neighbors(start)) == [(0, 1), (1, 2)]
+    assert len(grid.neighbors(grid.index(0, 0), diagonal=True)) == 3
+    assert len(list(grid.indices())) == 6
+    assert str(grid) == "#.S\n..#"
+
+
+def test_grid_bfs(stdlib):
+    """Test BFS distances over the flat grid."""
+    grid = stdlib["Grid"].from_text("S.#\n#..\n..E")
+    dist = grid.bfs(grid.find("S"))
+
+    assert dist[grid.find("E")] == 4
+    assert grid.index(0, 2) not in dist
+
+
+def test_numpy_helpers(stdlib):
+    """Test the NumPy-backed bulk operations when NumPy is available."""
+    np = pytest.importorskip("numpy")
+    mask = stdlib["grid_array"](["##.", "#..", "..#"]) == "#"
+
+    counts = stdlib["neighbor_counts"](mask)
+    assert counts[1, 1] == 4
+    filled = stdlib["flood_fill"](~mask, (0, 2))
+    assert filled.sum() == 5 and not filled[2, 2]
+    assert isinstance(counts, np.ndarray)
+
+
+def serpentine(size):
+    """A maze that is one corridor winding through every other row."""
+    rows = []
+    for r in range(size):
+        if r % 2 == 0:
+            rows.append("." * size)
+        else:
+            gap = size - 1 if r % 4 == 1 else 0
+            rows.append("".join("." if c == gap else "#" for c in range(size)))
+    return rows
+
+
+@pytest.mark.parametrize("use_scipy", [True, False])
+def test_flood_fill_winding_corridor(stdlib, monkeypatch, use_scipy):
+    """Test that flood_fill follows a long corridor, with and without SciPy."""
+    pytest.importorskip("numpy")
+    if use_scipy:
+        pytest.importorskip("scipy")
+    monkeypatch.setattr("aoc_stdlib.grid.HAS_SCIPY", use_scipy)
+    mask = stdlib["grid_array"](serpentine(41)) == "."
+    # Cut the corridor off near the end
+    mask[38, 0] = False
+
+    filled = stdlib["flood_fill"](mask, (0, 0))
+    assert filled[36].all() and not filled[39:].any()
+    assert filled.sum() == mask[:39].sum()
+    assert stdlib["flood_fill"](mask, (-1, -1)).sum() == mask[39:].sum()
+    assert not stdlib["flood_fill"](mask, (1, 0)).any()
+
+
+def naive_matexp(a, k):
+    n = len(a)
+    out = [[int(i == j) for j in range(n)] for i in range(n)]
+    for _ in range(k):
+        out = [[sum(a[i][m] * out[m][j] for m in range(n)) for j in range(n)] for i in range(n)]
+    return out
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+@pytest.mark.parametrize("size,mod", [(3, None), (20, None), (20, 97), (20, 1_000_000_007), (20, 10 ** 15)])
+def test_matexp(stdlib, monkeypatch, numpy, size, mod):
+    """Test matrix powers with and without a mod, in pure Python and NumPy."""
+    if numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(matrix, "HAS_NUMPY", numpy)
+    a = [[(i * 7 + j * 13) % 11 for j in range(size)] for i in range(size)]
+
+    expected = naive_matexp(a, 5)
+    if mod:
+        expected = [[x % mod for x in row] for row in expected]
+    assert stdlib["matexp"](a, 5, mod) == expected
+
+
+def test_matmat_and_matvec(stdlib):
+    """Test non-square products and matrix-vector products."""
+    assert stdlib["matmat"]([[1, 2, 3]], [[1], [2], [3]]) == [[14]]
+    assert stdlib["matvec"]([[1, 2], [3, 4]], [5, 6], mod=10) == [7, 9]
+    assert stdlib["transpose"]([[1, 2, 3]]) == [[1], [2], [3]]
+
+
+def line_neighbors(n):
+    # 0 -> 1 -> ... with a costly shortcut of two steps at a time
+    return [(n + 1, 1), (n + 2, 3)] if n < 6 else []
+
+
+def test_bfs_visits_each_node_once(stdlib):
+    """Test that BFS returns every reachable node once, in BFS order."""
+    graph = {1: [2, 3], 2: [4, 1], 3: [4], 4: [1]}
+
+    assert stdlib["bfs"](graph, 1) == [1, 2, 3, 4]
+
+
+def test_dijkstra_and_a_star(stdlib):
+    """Test shortest paths rebuilt from the parent map."""
+    dist, parents = stdlib["dijkstra"](0, line_neighbors)
+
+    assert dist[6] == 6
+    assert stdlib["reconstruct_path"](parents, 6) == [0, 1, 2, 3, 4, 5, 6]
+    assert stdlib["a_star"](0, 6, line_neighbors, lambda n: 6 - n) == ([0, 1, 2, 3, 4, 5, 6], 6)
+    assert stdlib["a_star"](0, 99, line_neighbors, lambda n: 0) == (None, float("inf"))
+
+
+def test_a_star_with_unorderable_nodes(stdlib):
+    """Test that ties never fall back to comparing the nodes themselves."""
+    class Node:
+        pass
+
+    nodes = [Node() for _ in range(3)]
+
+    def neighbors(node):
+        return [(other, 1) for other in nodes if other is not node]
+
+    path, cost = stdlib["a_star"](nodes[0], nodes[2], neighbors, lambda n: 0)
+    assert cost == 1 and path == [nodes[0], nodes[2]]
+
+
+def test_indexed_search(stdlib):
+    """Test the flat-array BFS and Dijkstra over integer nodes."""
+    dist, parents = stdlib["dijkstra_indexed"](9, 0, line_neighbors)
+
+    assert list(dist) == [0, 1, 2, 3, 4, 5, 6, 8, -1]
+    assert stdlib["indexed_path"](parents, 3) == [0, 1, 2, 3]
+    steps = stdlib["bfs_indexed"](8, 0, lambda n: [m for m, _ in line_neighbors(n)])
+    assert list(steps) == [0, 1, 1, 2, 2, 3, 3, 4]
+
+
+@pytest.mark.parametrize("limit", [0, 1, 2, 3, 4, 9, 10, 11, 97, 1000])
+def test_prime_sieve(stdlib, limit):
+    """Test the odd-only sieve against trial division, including the edges."""
+    expected = [n for n in range(2, limit + 1) if all(n % d for d in range(2, int(n ** 0.5) + 1))]
+
+    assert stdlib["allPrimesToX"](limit) == expected
+
+
+def test_union_find(stdlib):
+    """Test merging, set counts and sizes."""
+    uf = stdlib["UnionFind"](6)
+
+    assert uf.merge(0, 1) and uf.merge(2, 3) and uf.merge(1, 3)
+    assert not uf.merge(0, 2)
+    assert uf.in_same_set(0, 3) and not uf.in_same_set(0, 4)
+    assert uf.num_sets == 3
+    assert uf.size(2) == 4
+
+
+def test_union_find_long_chain(stdlib):
+    """Test that find is iterative and flattens a long chain as it goes."""
+    n = 100_000
+    uf = stdlib["UnionFind"](n)
+    for i in range(1, n):
+        uf.parents[i] = i - 1
+
+    assert uf.find(n - 1) == 0
+    assert uf.find(n - 1) == 0 and uf.parents[n - 1] != n - 2
+
+
+@pytest.fixture
+def three_workers(monkeypatch):
+    """Allow three workers whatever the machine, so the pool is used."""
+    monkeypatch.setattr(parallel, "max_workers", lambda: 3)
+
+
+def test_parallel_map_keeps_order(stdlib, three_workers):
+    """Test that results come back in item order and lambdas need no pickling."""
+    offset = 7
+    result = stdlib["parallel_map"](lambda n: (n + offset, os.getpid()), range(100))
+
+    assert [value for value, _ in result] == [n + 7 for n in range(100)]
+    pids = {pid for _, pid in result}
+    stats = stdlib["parallel_stats"]()
+    if parallel._can_fork():
+        # How chunks spread over the workers is up to the scheduler
+        assert os.getpid() not in pids and 1 <= len(stats.workers) <= 3
+    assert sum(worker.items for worker in stats.workers) == 100
+    assert "worker 1:" in str(stats)
+
+
+def test_parallel_map_small_inputs(stdlib, three_workers):
+    """Test empty inputs, generators, and one item run without a pool."""
+    assert stdlib["parallel_map"](abs, []) == []
+    assert stdlib["parallel_map"](abs, (n for n in (-1, -2))) == [1, 2]
+    assert stdlib["parallel_map"](lambda n: os.getpid(), [0]) == [os.getpid()]
+
+
+def test_parallel_map_raises(stdlib, three_workers):
+    """Test that an exception in a worker reaches the solution."""
+    def check(n):
+        if n == 42:
+            raise ValueError("bad seed")
+        return n
+
+    with pytest.raises(ValueError, match="bad seed"):
+        stdlib["parallel_map"](check, range(100))
+
+
+def test_parallel_search_finds_first_match(stdlib, three_workers):
+    """Test that the earliest match wins even when later chunks match first."""
+    search = stdlib["parallel_search"]
+
+    assert search(lambda n: n * n > 10_000_000, range(10 ** 9)) == 3163
+    assert search(lambda n: n % 1000 == 999, range(5000), chunksize=100) == 999
+    assert search(lambda n: n > 10, range(10), default=-1) == -1
+    assert search(str.isdigit, "ab3c4") == "3"
+    checked = sum(worker.items for worker in stdlib["parallel_stats"]().workers)
+    assert checked <= 5
+
+
+def test_parallel_search_huge_range(stdlib, three_workers):
+    """Test that ranges longer than len() allows are chunked without building them."""
+    search = stdlib["parallel_search"]
+    start = 2 ** 63
+
+    assert search(lambda n: n % 1000 == 0, range(start, 2 ** 64)) == start + 192
+    assert search(lambda n: n % 7 == 0, range(2 ** 64, 0, -1)) == 2 ** 64 // 7 * 7
+    assert search(lambda n: n == 3, range(10, 0, -3)) is None
+    assert search(lambda n: n == 4, range(10, 0, -3)) == 4
+    assert parallel._length(range(10, 0, -3)) == len(range(10, 0, -3))
+    assert parallel._length(range(5, 5)) == 0
+
+
+def test_parallel_serial_fallback(stdlib, three_workers, monkeypatch):
+    """Test that with one worker or no fork everything runs in this process."""
+    assert set(stdlib["parallel_map"](lambda n: os.getpid(), range(20), workers=1)) == {os.getpid()}
+
+    monkeypatch.setattr(parallel, "_can_fork", lambda: False)
+    assert set(stdlib["parallel_map"](lambda n: os.getpid(), range(20))) == {os.getpid()}
+    assert len(stdlib["parallel_stats"]().workers) == 1
+
+
+def test_max_workers_limits(monkeypatch):
+    """Test that AOCODE_MAX_WORKERS and a container CPU quota lower the worker count."""
+    monkeypatch.setattr(parallel, "_cgroup_cpus", lambda: None)
+    monkeypatch.delenv("AOCODE_MAX_WORKERS", raising=False)
+    cpus = parallel.max_workers()
+    assert cpus >= 1
+
+    monkeypatch.setenv("AOCODE_MAX_WORKERS", "1")
+    assert parallel.max_workers() == 1
+    monkeypatch.setenv("AOCODE_MAX_WORKERS", "lots")
+    assert parallel.max_workers() == cpus
+
+    monkeypatch.setattr(parallel, "_cgroup_cpus", lambda: 1)
+    assert parallel.max_workers() == 1
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_timed_out_solution_stops_its_workers(tmp_path):
+    """Test that a solution stuck in parallel_map is stopped with all its workers."""
+    import subprocess
+    from Code.core import runner
+
+    pids = tmp_path / "pids"
+    script = (
+        "import os\nfrom aoc_stdlib import parallel, parallel_map\n"
+        "parallel.max_workers = lambda: 2\n"
+        f"def spin(n):\n    open({str(pids)!r}, 'a').write(f'{{os.getpid()}}\\n')\n"
+        "    while True:\n        pass\n"
+        "parallel_map(spin, range(4), workers=2)\n")
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run_script(script, timeout=2)
+
+    started = list(map(int, pids.read_text().split()))
+    assert len(started) == 2
+
+    def running(pid):
+        # Killed workers linger as zombies until init reaps them
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+        except FileNotFoundError:
+            return False
+
+    deadline = time.monotonic() + 5
+    while any(map(running, started)) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(map(running, started))
@@ -0,0 +1,159 @@
+import pytest
+
+from Code.core.cells import CellSession, analyse, plan_reruns, split_cells
+
+CODE = """\
+lines = parsed.lines
+nums = [int(x) for x in lines]
+print("parsed", len(nums))
+# %% part 1
+print(sum(nums))
+# %% part 2
+print(max(nums))
+"""
+
+
+def test_split_cells():
+    """Test that `# %%` lines start cells and keep their line numbers."""
+    cells = split_cells(CODE)
+
+    assert [cell.start_line for cell in cells] == [0, 3, 5]
+    assert cells[1].source == "# %% part 1\nprint(sum(nums))\n"
+    assert len(split_cells("print(1)")) == 1
+    assert [cell.start_line for cell in split_cells("\n\n# %%\nx = 1\n")] == [2]
+
+
+def test_analyse_names():
+    """Test that definitions, reads and in-place changes are told apart."""
+    names = analyse(
+        "import numpy as np\nfrom math import gcd\n"
+        "def f(a):\n    return a + total\n"
+        "for i in range(3):\n    seen.add(i)\n"
+        "grid[0][1] = '#'\ncount += 1\n")
+
+    assert {"np", "gcd", "f", "i"} <= names.defines
+    assert {"total", "range", "count", "seen", "grid"} <= names.uses
+    assert names.mutates == {"seen", "grid"}
+    assert "a" not in names.defines
+    assert analyse("def (") is None
+
+
+def plan(sources, previous):
+    return plan_reruns(split_cells("\n# %%\n".join(sources)),
+                       [cell.source for cell in split_cells("\n# %%\n".join(previous))])
+
+
+def test_plan_only_changed_and_dependent_cells():
+    """Test that unchanged cells that do not read changed names are skipped."""
+    before = ["a = 1", "b = a + 1", "c = 5", "print(b, c)"]
+
+    assert plan(before, before) == []
+    assert plan(["a = 1", "b = a + 1", "c = 6", "print(b, c)"], before) == [2, 3]
+    assert plan(["a = 2", "b = a + 1", "c = 5", "print(b, c)"], before) == [0, 1, 3]
+    assert plan(before, []) == [0, 1, 2, 3]
+
+
+def test_plan_follows_functions():
+    """Test that a function reading a changed global is defined again."""
+    before = ["limit = 3", "def f():\n    return limit", "c = 0", "print(f())"]
+    after = ["limit = 4"] + before[1:]
+
+    assert plan(after, before) == [0, 1, 3]
+
+
+def test_plan_reruns_cell_whose_objects_change():
+    """Test that a cell changing an earlier cell's list re-runs that cell first."""
+    before = ["seen = set()", "x = 1", "seen.add(1)\nprint(len(seen))"]
+    after = ["seen = set()", "x = 1", "seen.add(2)\nprint(len(seen))"]
+
+    assert plan(after, before) == [0, 2]
+
+
+def test_plan_reruns_cell_whose_names_are_rebound():
+    """Test that a cell building on an earlier cell's value re-runs that cell first."""
+    before = ["x = 1\nnums = [1, 2]", "y = 2", "x += 1\nnums = nums + [3]\nprint(x, nums)"]
+    after = before[:2] + ["x += 2\nnums = nums + [3]\nprint(x, nums)"]
+
+    assert plan(after, before) == [0, 2]
+    assert plan(["x = 1", "y = 2", "nums = nums + [4]"],
+                ["x = 1", "y = 2", "nums = nums + [3]"]) == [2]
+
+
+def test_plan_reruns_cells_that_failed():
+    """Test that cells recorded as needing a run are run even if unchanged."""
+    cells = split_cells("a = 1\n# %%\nb = 2\n")
+
+    assert plan_reruns(cells, [cells[0].source, None]) == [1]
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """A cell session with a small input file."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input.txt").write_text("1\n2\n3\n")
+    session = CellSession(timeout=5)
+    yield session
+    session.stop()
+
+
+def run(session, code, utils=""):
+    return session.run(code, utils, "input.txt", ".")
+
+
+def test_session_skips_unchanged_cells(session):
+    """Test that a second run only runs the edited cell but shows all output."""
+    first = run(session, CODE)
+    assert first.ok and first.ran == [0, 1, 2]
+    assert first.output == "parsed 3\n6\n3\n"
+
+    second = run(session, CODE.replace("sum(nums)", "sum(nums) * 2"))
+    assert second.ran == [1]
+    assert second.output == "parsed 3\n12\n3\n"
+
+
+def test_session_keeps_namespace(session):
+    """Test that variables from cells that did not run are still there."""
+    code = "import time\nstart = time.time()\n# %%\nprint(start)\n"
+    first = run(session, code)
+    second = run(session, code.replace("print(start)", "print(start, 1)"))
+
+    assert second.ran == [1]
+    assert second.output.split()[0] == first.output.strip()
+
+
+def test_session_error_reruns_next_time(session):
+    """Test that a failing cell reports editor line numbers and runs again."""
+    broken = run(session, CODE.replace("max(nums)", "max(nums) / 0"))
+    assert not broken.ok
+    assert 'File "<cell 3>", line 7' in broken.output
+    assert "ZeroDivisionError" in broken.output
+
+    fixed = run(session, CODE)
+    assert fixed.ok and fixed.ran == [2]
+
+
+def test_session_restarts_when_utils_change(session):
+    """Test that changing the utils code starts a fresh worker."""
+    run(session, "print(helper())", "def helper():\n    return 1\n")
+    changed = run(session, "print(helper())", "def helper():\n    return 2\n")
+
+    assert changed.ran == [0]
+    assert changed.output == "2\n"
+
+
+def test_session_timeout_starts_fresh(session):
+    """Test that a cell that never finishes is stopped and the worker replaced."""
+    session.timeout = 0.5
+    stuck = run(session, "x = 1\n# %%\nwhile True:\n    pass\n")
+    assert not stuck.ok and "stopped after 0.5 seconds" in stuck.output
+    assert not session.alive()
+
+    session.timeout = 5
+    assert run(session, "x = 1\n# %%\nprint(x)\n").ran == [0, 1]
+
+
+def test_session_worker_exit(session):
+    """Test that a cell that kills the worker is reported."""
+    result = run(session, "import os\nos._exit(3)\n")
+
+    assert not result.ok and "worker exited" in result.output
@@ -0,0 +1,70 @@
+import pytest
+import sys
+from unittest.mock import patch
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QFont
+from Code.ui.code_editor import CodeEditor
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def editor(qapp):
+    """Fixture to create a CodeEditor instance."""
+    editor = CodeEditor()
+    editor.resize(400, 300)
+    yield editor
+    editor.close()
+
+
+def test_gutter_width_tracks_digit_count(editor):
+    """Test that the gutter grows when the line count gains a digit."""
+    one_digit = editor.line_number_area_width()
+
+    editor.setPlainText("\n" * 8)  # 9 lines
+    assert editor.line_number_area_width() == one_digit
+
+    editor.setPlainText("\n" * 99)  # 100 lines
+    assert editor.line_number_area_width() > one_digit
+
+
+def test_gutter_width_not_recomputed_without_digit_change(editor):
+    """Test that viewport margins are only reset when the digit count changes."""
+    editor.setPlainText("\n" * 20)
+    with patch.object(editor, "setViewportMargins") as margins:
+        editor.appendPlainText("more")
+        editor.appendPlainText("lines")
+        margins.assert_not_called()
+
+        editor.setPlainText("\n" * 150)
+        margins.assert_called_once()
+
+
+def test_digit_pixmaps_prerendered(editor):
+    """Test that one pixmap per digit is rendered up front."""
+    assert len(editor._digit_pixmaps) == 10
+    assert all(not pixmap.isNull() for pixmap in editor._digit_pixmaps)
+
+
+def test_font_change_refreshes_gutter(editor):
+    """Test that changing the font re-measures the gutter."""
+    editor.setPlainText("\n" * 999)
+    editor.setFont(QFont("Arial", 8))
+    small = editor.line_number_area_width()
+    editor.setFont(QFont("Arial", 30))
+    assert editor.line_number_area_width() > small
+
+
+def test_gutter_paints_large_document(editor):
+    """Test that painting the gutter works on a large document."""
+    editor.setPlainText("\n".join(str(i) for i in range(50000)))
+    editor.show()
+    editor.verticalScrollBar().setValue(editor.verticalScrollBar().maximum())
+    assert not editor.line_number_area.grab().isNull()
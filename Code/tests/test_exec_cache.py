@@ -0,0 +1,138 @@
+import os
+
+import pytest
+
+from Code.core import runner
+from Code.core.exec_cache import ENTRY_SUFFIX, ExecCache, run_key
+import config.config as config
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache with room for a few small entries."""
+    return ExecCache(str(tmp_path / "exec"), max_bytes=400)
+
+
+def test_put_and_get(cache):
+    """Test that a stored output comes back with its timing."""
+    cache.put("a", "42\n", 0.25)
+
+    run = cache.get("a")
+    assert run.stdout == "42\n" and run.wall == 0.25
+    assert cache.get("b") is None
+
+
+def test_least_recently_used_evicted(cache):
+    """Test that going over the size limit drops the oldest unused entry."""
+    for key in "abc":
+        cache.put(key, "x" * 60)
+    cache.get("a")
+    for key in "defg":
+        cache.put(key, "x" * 60)
+
+    assert "a" in cache and "b" not in cache
+    assert cache.total_bytes <= cache.max_bytes
+    assert len(os.listdir(cache.directory)) == len(cache)
+
+
+def test_oversized_output_not_cached(cache):
+    """Test that one huge output is not allowed to push out everything else."""
+    cache.put("small", "1")
+    cache.put("huge", "x" * 1000)
+
+    assert "huge" not in cache and "small" in cache
+
+
+def test_entries_and_order_survive_reopening(cache):
+    """Test that a new cache object picks up the files and their use order."""
+    cache.put("old", "1")
+    cache.put("new", "2")
+    os.utime(os.path.join(cache.directory, "old" + ENTRY_SUFFIX), ns=(0, 0))
+
+    reopened = ExecCache(cache.directory, cache.max_bytes)
+    assert list(reopened._entries) == ["old", "new"]
+    assert reopened.get("new").stdout == "2"
+    assert reopened.total_bytes == cache.total_bytes
+
+
+def test_corrupt_entry_dropped(cache):
+    """Test that an unreadable entry is treated as a miss and removed."""
+    cache.put("a", "1")
+    with open(os.path.join(cache.directory, "a" + ENTRY_SUFFIX), "wb") as f:
+        f.write(b"not marshal")
+
+    assert cache.get("a") is None
+    assert "a" not in cache and cache.total_bytes == 0
+
+
+def test_run_key_covers_every_input(tmp_path):
+    """Test that changing code, utils, input or stdlib changes the key."""
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n")
+    key = run_key("code", "utils", str(input_path), "2.0")
+
+    assert run_key("code", "utils", str(input_path), "2.0") == key
+    assert run_key("code2", "utils", str(input_path), "2.0") != key
+    assert run_key("code", "utils2", str(input_path), "2.0") != key
+    assert run_key("code", "utils", str(input_path), "2.1") != key
+    assert run_key("code", "utils", str(input_path), "2.0", "/usr/bin/pypy3") != key
+    input_path.write_text("2\n")
+    assert run_key("code", "utils", str(input_path), "2.0") != key
+
+
+@pytest.fixture
+def solution_input(tmp_path, monkeypatch):
+    """Point the runner at a small cached input."""
+    monkeypatch.chdir(tmp_path)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n2\n")
+    monkeypatch.setattr(runner, "ensure_input_file",
+                        lambda year, day, token: (str(input_path), ""))
+    monkeypatch.setattr(config, "CURRENT_YEAR", "2023")
+    monkeypatch.setattr(config, "CURRENT_DAY", "1")
+    return tmp_path
+
+
+# Appends to a file each time it really runs, so cached runs can be told apart
+COUNTING_CODE = "open('runs.txt', 'a').write('x')\nprint(len(parsed.lines))"
+
+
+def run_count(directory):
+    return len((directory / "runs.txt").read_text())
+
+
+def test_repeated_run_served_from_cache(solution_input, cache):
+    """Test that an unchanged run returns the earlier output without running."""
+    hits = []
+    first = runner.execute_code(COUNTING_CODE, cache=cache, on_cached=hits.append)
+    second = runner.execute_code(COUNTING_CODE, cache=cache, on_cached=hits.append)
+
+    assert first == second == "2\n"
+    assert run_count(solution_input) == 1
+    assert len(hits) == 1 and hits[0].wall is not None
+
+
+def test_force_runs_again(solution_input, cache):
+    """Test that forcing a run skips the cache."""
+    runner.execute_code(COUNTING_CODE, cache=cache)
+    runner.execute_code(COUNTING_CODE, cache=cache, force=True)
+
+    assert run_count(solution_input) == 2
+
+
+def test_changed_utils_runs_again(solution_input, cache):
+    """Test that editing the utils file invalidates the cached output."""
+    runner.execute_code(COUNTING_CODE, "A = 1", cache=cache)
+    runner.execute_code(COUNTING_CODE, "A = 2", cache=cache)
+
+    assert run_count(solution_input) == 2
+
+
+def test_failed_run_not_cached(solution_input, cache):
+    """Test that errors are never replayed from the cache."""
+    code = "open('runs.txt', 'a').write('x')\nraise ValueError('no')"
+    runner.execute_code(code, cache=cache)
+    runner.execute_code(code, cache=cache)
+
+    assert run_count(solution_input) == 2
+    assert len(cache) == 0
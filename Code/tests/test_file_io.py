@@ -0,0 +1,92 @@
+import pytest
+import os
+import sys
+from PySide6.QtWidgets import QApplication
+from Code.core.file_io import atomic_write, DebouncedWriter
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def target(tmp_path):
+    """Path of the file being saved."""
+    return str(tmp_path / "nested" / "utils.py")
+
+
+def test_atomic_write_creates_file(target):
+    """Test that atomic_write creates missing directories and leaves no temp files."""
+    atomic_write(target, "print('hi')\n")
+
+    with open(target) as f:
+        assert f.read() == "print('hi')\n"
+    assert os.listdir(os.path.dirname(target)) == ["utils.py"]
+
+
+def test_writer_coalesces_until_flush(qapp, target):
+    """Test that scheduled saves are not written until the writer fires."""
+    writer = DebouncedWriter(target, delay_ms=10_000)
+    writer.schedule("a")
+    writer.schedule("ab")
+    writer.schedule("abc")
+
+    assert not os.path.exists(target)
+    assert writer.has_pending()
+
+    writer.flush()
+    with open(target) as f:
+        assert f.read() == "abc"
+    assert not writer.has_pending()
+
+
+def test_writer_writes_after_idle(qtbot, target):
+    """Test that the writer saves on its own once the idle delay passes."""
+    writer = DebouncedWriter(target, delay_ms=20)
+    writer.schedule("x = 1")
+
+    qtbot.waitUntil(lambda: os.path.exists(target), timeout=2000)
+    writer.flush()
+    with open(target) as f:
+        assert f.read() == "x = 1"
+
+
+def test_writer_skips_unchanged_content(qapp, target):
+    """Test that identical content is not rewritten."""
+    atomic_write(target, "same")
+    mtime = os.stat(target).st_mtime_ns
+
+    writer = DebouncedWriter(target, delay_ms=10_000)
+    writer.mark_saved("same")
+    os.utime(target, ns=(0, 0))
+    writer.schedule("same")
+    writer.flush()
+
+    assert os.stat(target).st_mtime_ns == 0 != mtime
+
+
+def test_writer_serialize_hook(qapp, target):
+    """Test that payloads are passed through the serialize callable."""
+    writer = DebouncedWriter(target, delay_ms=10_000,
+                             serialize=lambda payload: ",".join(payload))
+    writer.schedule(["a", "b"])
+    writer.flush()
+
+    with open(target) as f:
+        assert f.read() == "a,b"
+
+
+def test_writer_records_errors(qapp, tmp_path):
+    """Test that a failed write is recorded instead of raising."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    writer = DebouncedWriter(str(blocker / "utils.py"), delay_ms=10_000)
+    writer.schedule("data")
+    writer.flush()
+
+    assert writer.last_error is not None
@@ -0,0 +1,60 @@
+import pytest
+from Code.core.html_extract import extract_articles
+
+
+def test_no_articles():
+    """Test that a page without articles gives an empty list."""
+    assert extract_articles("<html><body><p>Hi</p></body></html>") == []
+
+
+def test_text_and_paragraphs():
+    """Test that text and paragraph text are collected per article."""
+    page = ("<nav><p>ignored</p></nav><article><h2>Title</h2>"
+            "<p>One <em>two</em></p><p>Three</p></article>")
+    [article] = extract_articles(page)
+
+    assert article.text == "TitleOne twoThree"
+    assert article.paragraphs == ["One two", "Three"]
+    assert article.html == "<h2>Title</h2><p>One <em>two</em></p><p>Three</p>"
+
+
+def test_limit_stops_after_enough_articles():
+    """Test that only the requested number of articles are extracted."""
+    page = "<article><p>a</p></article><article><p>b</p></article><article><p>c</p></article>"
+
+    assert [a.paragraphs for a in extract_articles(page, limit=2)] == [["a"], ["b"]]
+    assert len(extract_articles(page)) == 3
+
+
+def test_entities_are_decoded_in_text_and_escaped_in_html():
+    """Test that character references are handled for both outputs."""
+    [article] = extract_articles("<article><p>1 &lt; 2 &amp;&amp; x</p></article>")
+
+    assert article.paragraphs == ["1 < 2 && x"]
+    assert article.html == "<p>1 &lt; 2 &amp;&amp; x</p>"
+
+
+def test_unclosed_tags_are_closed():
+    """Test that tags left open inside an article are closed in the fragment."""
+    [article] = extract_articles("<article><p>One<p>Two <em>open</article>")
+
+    assert article.paragraphs == ["One", "Two open"]
+    assert article.html == "<p>One</p><p>Two <em>open</em></p>"
+
+
+def test_unterminated_article():
+    """Test that a page ending inside an article still returns it."""
+    [article] = extract_articles("<article><p>Cut off")
+    assert article.paragraphs == ["Cut off"]
+
+
+@pytest.mark.parametrize("markup,expected", [
+    ("<article><script>var a = '<p>x</p>';</script><p>ok</p></article>", "<p>ok</p>"),
+    ("<article><form><input name=a><button>b</button></form><p>ok</p></article>", "<p>ok</p>"),
+    ("<article><p>a<br/>b</p></article>", "<p>a<br>b</p>"),
+    ("<article><form></div><p>x</form><p>ok</p></article>", "<p>ok</p>"),
+    ("<article><form><p>x</span>y</form><p>ok</p></article>", "<p>ok</p>"),
+])
+def test_dropped_and_void_tags(markup, expected):
+    """Test that dropped tags vanish and void tags don't unbalance the output."""
+    assert extract_articles(markup)[0].html == expected
@@ -0,0 +1,183 @@
+import os
+import sys
+
+import pytest
+
+from Code.core import runner
+from Code.core.cells import CellSession
+from Code.core.interpreters import Interpreter, candidate_paths, current, detect, probe, speedup
+import config.config as config
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script wrapper")
+
+
+def make_executable(path, text="#!/bin/sh\nexit 1\n"):
+    path.write_text(text)
+    path.chmod(0o755)
+    return str(path)
+
+
+FAKE_PYPY = """#!/bin/sh
+if [ "$1" = "-c" ]; then
+    echo '{"implementation": "PyPy", "version": "3.99.0", "version_info": [3, 99], "free_threaded": false}'
+    exit 0
+fi
+%sexec "%s" "$@"
+"""
+
+
+@pytest.fixture
+def wrapper(tmp_path):
+    """A second interpreter: calls itself PyPy when probed, but runs this Python."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    return make_executable(bin_dir / "pypy3.99", FAKE_PYPY % ("", sys.executable))
+
+
+def test_labels():
+    """Test that interpreters are named by implementation, version and build."""
+    assert Interpreter("/x/pypy3", "PyPy", "3.10.14").label == "PyPy 3.10.14"
+    free = Interpreter("/x/python3.13t", "CPython", "3.13.0", free_threaded=True)
+    assert free.label == "CPython 3.13.0 free-threaded"
+    assert free.identity != Interpreter("/x/python3.13t", "CPython", "3.13.1", True).identity
+
+
+def test_speedup():
+    """Test that times are compared as a ratio."""
+    assert speedup(0.5, 2.0) == "4.0x faster"
+    assert speedup(3.0, 1.0) == "3.0x slower"
+    assert speedup(0, 1.0) == ""
+
+
+def test_probe_current_matches():
+    """Test that asking this Python about itself agrees with current()."""
+    found = probe(sys.executable)
+
+    assert found == current()
+
+
+@posix_only
+def test_probe_rejects_non_python(tmp_path):
+    """Test that programs that are not a working Python are left out."""
+    assert probe(make_executable(tmp_path / "python3")) is None
+    assert probe(str(tmp_path / "missing")) is None
+
+
+@posix_only
+def test_candidate_paths(tmp_path):
+    """Test that only Python-like executables are picked, in PATH order."""
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    for name in ("python3", "python3.13t", "pypy3", "pypy3.10", "python3-config", "pythonw"):
+        make_executable(first / name)
+    make_executable(second / "python3")
+    make_executable(second / "pypy")
+    (second / "python3.12").write_text("not executable")
+
+    found = candidate_paths(os.pathsep.join([str(first), str(second)]))
+
+    assert [os.path.relpath(path, tmp_path) for path in found] == [
+        os.path.join("a", name) for name in ("pypy3", "pypy3.10", "python3", "python3.13t")
+    ] + [os.path.join("b", name) for name in ("pypy", "python3")]
+
+
+@posix_only
+def test_detect_lists_each_install_once(tmp_path, wrapper):
+    """Test that the editor's Python comes first and links to it are not repeated."""
+    link_dir = tmp_path / "links"
+    link_dir.mkdir()
+    os.symlink(sys.executable, link_dir / "python3")
+    make_executable(link_dir / "pypy3")
+    # A shim: another file, but the same build as the editor's
+    make_executable(link_dir / "python3.11", f'#!/bin/sh\nexec "{sys.executable}" "$@"\n')
+    os.symlink(wrapper, link_dir / "pypy")
+
+    found = detect(search_path=os.pathsep.join([str(link_dir), os.path.dirname(wrapper)]))
+
+    assert [interpreter.path for interpreter in found] == [
+        sys.executable, str(link_dir / "pypy")]
+    assert found[1].label == "PyPy 3.99.0"
+
+
+@pytest.fixture
+def solution_input(tmp_path, monkeypatch):
+    """Point the runner at a small cached input."""
+    monkeypatch.chdir(tmp_path)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n2\n")
+    monkeypatch.setattr(runner, "ensure_input_file",
+                        lambda year, day, token: (str(input_path), ""))
+    monkeypatch.setattr(config, "CURRENT_YEAR", "2023")
+    monkeypatch.setattr(config, "CURRENT_DAY", "1")
+    return str(input_path)
+
+
+@posix_only
+def test_execute_code_under_other_interpreter(solution_input, wrapper):
+    """Test that utils and parsed input work under the chosen interpreter."""
+    other = probe(wrapper)
+    code = "import sys\nprint(helper(parsed.ints), sys.argv[0].endswith('.py'))"
+
+    output = runner.execute_code(code, "def helper(ints):\n    return len(ints)\n",
+                                 interpreter=other)
+
+    assert output == "2 True\n"
+
+
+def test_execute_code_missing_interpreter(solution_input):
+    """Test that an interpreter that has gone away is reported, not raised."""
+    gone = Interpreter("/nowhere/pypy3", "PyPy", "3.10.14")
+
+    output = runner.execute_code("print(1)", interpreter=gone)
+
+    assert output.startswith("Error: Could not start PyPy 3.10.14")
+
+
+@posix_only
+def test_compare_interpreters(solution_input, wrapper):
+    """Test that each interpreter gets a row compared with the first."""
+    other = probe(wrapper)
+    recorded = []
+    report = runner.compare_interpreters(
+        "print(len(parsed.lines))", "", [current(), other,
+                                         Interpreter("/nowhere/pypy3", "PyPy", "3.10.14")],
+        on_metrics=lambda interpreter, metrics, ok: recorded.append((interpreter, ok)))
+
+    lines = report.splitlines()
+    assert lines[2].startswith(current().label) and lines[2].endswith("baseline")
+    assert "x faster" in lines[3] or "x slower" in lines[3]
+    assert "output differs" not in report
+    assert "could not start" in lines[4]
+    assert recorded == [(current(), True), (other, True)]
+
+
+@posix_only
+def test_compare_flags_different_output(solution_input, wrapper, monkeypatch):
+    """Test that a run printing something else than the baseline is flagged."""
+    monkeypatch.setenv("AOCODE_TEST_WRAPPED", "")
+    with open(wrapper, "w") as f:
+        f.write(FAKE_PYPY % ("AOCODE_TEST_WRAPPED=1 ", sys.executable))
+    report = runner.compare_interpreters(
+        "import os\nprint(os.environ['AOCODE_TEST_WRAPPED'])", "", [current(), probe(wrapper)])
+
+    assert report.splitlines()[3].endswith("output differs")
+
+
+@posix_only
+def test_cell_session_restarts_for_new_interpreter(tmp_path, wrapper, monkeypatch):
+    """Test that changing interpreter starts a new worker under it."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input.txt").write_text("1\n")
+    session = CellSession(timeout=5)
+    try:
+        first = session.run("x = 1\n# %%\nprint(x)\n", "", "input.txt", ".")
+        first_pid = session.process.pid
+        again = session.run("x = 1\n# %%\nprint(x)\n", "", "input.txt", ".", interpreter=wrapper)
+        again_pid = session.process.pid
+    finally:
+        session.stop()
+
+    assert first.ran == [0, 1]
+    assert again.ran == [0, 1] and again.output == "1\n"
+    assert again_pid != first_pid
@@ -0,0 +1,97 @@
+import mmap
+import pytest
+import sys
+from PySide6.QtWidgets import QApplication
+from Code.core.line_index import LineIndex
+from Code.ui.input_view import InputView
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.mark.parametrize("buffer,lines", [
+    (b"", []),
+    (b"abc", ["abc"]),
+    (b"abc\n", ["abc"]),
+    (b"abc\ndef", ["abc", "def"]),
+    (b"ab\r\ncd\r\n", ["ab", "cd"]),
+    (b"\n\n", ["", ""]),
+])
+def test_lines(buffer, lines):
+    """Test that lines are split on newlines without their line endings."""
+    index = LineIndex(buffer)
+
+    assert index.line_count == len(lines)
+    assert [index.line(i) for i in range(index.line_count)] == lines
+
+
+def test_positions_and_stats():
+    """Test offset to line/column lookup and the summary stats."""
+    index = LineIndex(b"12\n3456\n7")
+
+    assert index.position_of(0) == (0, 0)
+    assert index.position_of(5) == (1, 2)
+    assert index.position_of(8) == (2, 0)
+    assert index.max_width == 4
+    assert index.stats() == "3 lines • 4 columns • 9 bytes"
+
+
+def test_find_wraps_around():
+    """Test that search continues from the start once it reaches the end."""
+    index = LineIndex(b"x..\n.x.\n..x")
+
+    assert index.find(b"x") == 0
+    assert index.find(b"x", 1) == 5
+    assert index.find(b"x", 11) == 0
+    assert index.find(b"y") == -1
+
+
+def test_index_over_mmap(tmp_path):
+    """Test that an index works directly on a memory-mapped file."""
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"".join(b"%d\n" % i for i in range(10_000)))
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        index = LineIndex(mapped)
+        assert index.line_count == 10_000
+        assert index.line(9_999) == "9999"
+        assert index.line_of(index.find(b"\n5000\n") + 1) == 5000
+    finally:
+        mapped.close()
+
+
+def test_input_view_loads_file(qapp, tmp_path):
+    """Test that the input panel exposes the mapped file one row per line."""
+    path = tmp_path / "input.txt"
+    path.write_text("first\nsecond\nthird\n")
+    view = InputView()
+
+    view.load_file(str(path))
+
+    assert view.model.rowCount() == 3
+    assert view.model.data(view.model.index(1)) == "second"
+    view.select_span(13, 16)
+    assert view.list_view.currentIndex().row() == 2
+    assert view.stats_label.text().startswith("Ln 3, Col 1")
+    view.release()
+
+
+def test_input_view_empty_file_and_message(qapp, tmp_path):
+    """Test that empty files and error messages are shown without mapping anything."""
+    path = tmp_path / "input.txt"
+    path.write_text("")
+    view = InputView()
+
+    view.load_file(str(path))
+    assert view.model.rowCount() == 0
+
+    view.set_text("Failed to fetch input")
+    assert view.text() == "Failed to fetch input"
@@ -0,0 +1,83 @@
+import os
+import pytest
+from Code.core import parsed_input
+from Code.core.parsed_input import CharGrid, ParsedInput
+from Code.core import runner
+import config.config as config
+
+INPUT = "#.S\n.#.\n\nmove 3 from -1 to 2\n"
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text(INPUT)
+    return str(path)
+
+
+def test_views(input_file):
+    """Test each parsed view of an input."""
+    parsed = ParsedInput(input_file)
+
+    assert parsed.data == INPUT
+    assert parsed.lines == ["#.S", ".#.", "", "move 3 from -1 to 2"]
+    assert parsed.ints == [[], [], [], [3, -1, 2]]
+    assert parsed.paragraphs == [["#.S", ".#."], ["move 3 from -1 to 2"]]
+    assert (parsed.grid.width, parsed.grid.height) == (19, 4)
+
+
+def test_char_grid():
+    """Test lookups on the flat grid."""
+    grid = CharGrid.from_lines(["#.S", ".#.", "S"])
+
+    assert grid[2, 0] == "S"
+    assert grid.get(5, 5) is None
+    assert grid.row(2) == "S  "
+    assert grid.find("S") == (2, 0)
+    assert list(grid.find_all("#")) == [(0, 0), (1, 1)]
+    with pytest.raises(IndexError):
+        grid[3, 0]
+
+
+def test_views_are_cached_on_disk(input_file, tmp_path, monkeypatch):
+    """Test that a second run loads parsed views instead of parsing again."""
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    first = ParsedInput(input_file, cache_dir)
+    expected = (first.ints, first.grid.cells)
+
+    # Parsing ints again would now fail
+    monkeypatch.setattr(parsed_input, "INT_PATTERN", None)
+    second = ParsedInput(input_file, cache_dir)
+
+    assert (second.ints, second.grid.cells) == expected
+    assert sorted(os.listdir(cache_dir)) == [
+        "parsed_grid.marshal", "parsed_ints.marshal", "parsed_lines.marshal"]
+
+
+def test_cache_ignored_when_input_changes(input_file, tmp_path):
+    """Test that a changed input file is parsed again."""
+    cache_dir = str(tmp_path)
+    assert ParsedInput(input_file, cache_dir).lines[0] == "#.S"
+
+    with open(input_file, "w") as f:
+        f.write("new input\n")
+    os.utime(input_file, ns=(0, 0))
+
+    assert ParsedInput(input_file, cache_dir).lines == ["new input"]
+
+
+def test_solution_sees_data_and_parsed(tmp_path, monkeypatch):
+    """Test that solutions get `data` and `parsed` from the cached input."""
+    monkeypatch.chdir(tmp_path)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1 2\n3 4\n")
+    monkeypatch.setattr(runner, "ensure_input_file",
+                        lambda year, day, token: (str(input_path), ""))
+    monkeypatch.setattr(config, "CURRENT_YEAR", "2023")
+    monkeypatch.setattr(config, "CURRENT_DAY", "1")
+
+    output = runner.execute_code(
+        "print(len(data), sum(map(sum, parsed.ints)), parsed.grid.height)")
+
+    assert output == "8 10 2\n"
@@ -0,0 +1,138 @@
+import os
+
+import pytest
+
+from Code.core import runner
+from Code.core.perf_history import PerfHistory, code_hash
+from Code.core.run_metrics import read_metrics
+import config.config as config
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Create a history store in a temporary directory."""
+    history = PerfHistory(str(tmp_path / "user" / "perf_history.sqlite"))
+    yield history
+    history.close()
+
+
+def test_runs_kept_per_part_in_order(history):
+    """Test that runs are stored per (year, day, part), oldest first."""
+    history.record(2023, 1, 1, "a", (0.5, 0.4, 2048), "u1", "2.0")
+    history.record(2023, 1, 1, "b", (0.2, 0.2, None), "u1", "2.0")
+    history.record(2023, 1, 2, "c", (0.1, 0.1, 1024), "u1", "2.0")
+
+    runs = history.runs(2023, 1, 1)
+    assert [run.wall for run in runs] == [0.5, 0.2]
+    assert runs[0].peak_kb == 2048 and runs[1].peak_kb is None
+    assert runs[0].utils_hash == "u1" and runs[0].stdlib_version == "2.0"
+    assert [run.code_hash for run in history.runs(2023, 1, 2)] == [code_hash("c")]
+
+
+def test_fastest_ignores_failed_runs(history):
+    """Test that the fastest run is the quickest one that succeeded."""
+    history.record(2023, 2, 1, "slow", (0.9, 0.9, None), "u", "2.0")
+    history.record(2023, 2, 1, "broken", (0.01, 0.01, None), "u", "2.0", ok=False)
+    history.record(2023, 2, 1, "quick", (0.3, 0.3, None), "u", "2.0")
+
+    fastest = history.fastest(2023, 2, 1)
+    assert history.code(fastest.code_hash) == "quick"
+    assert history.fastest(2023, 3, 1) is None
+
+
+def test_fastest_by_interpreter(history):
+    """Test that the best run under each interpreter is found, quickest first."""
+    history.record(2023, 4, 1, "a", (2.0, 2.0, None), "u", "2.0", interpreter="CPython 3.12.1")
+    history.record(2023, 4, 1, "a", (1.5, 1.5, None), "u", "2.0", interpreter="CPython 3.12.1")
+    history.record(2023, 4, 1, "a", (0.2, 0.2, None), "u", "2.0", interpreter="PyPy 3.10.14")
+    history.record(2023, 4, 1, "a", (0.1, 0.1, None), "u", "2.0", ok=False,
+                   interpreter="PyPy 3.10.14")
+
+    best = history.fastest_by_interpreter(2023, 4, 1)
+    assert [(run.interpreter, run.wall) for run in best] == [
+        ("PyPy 3.10.14", 0.2), ("CPython 3.12.1", 1.5)]
+
+
+def test_older_history_gains_interpreter_column(tmp_path):
+    """Test that a history file from before interpreters were recorded still opens."""
+    import sqlite3
+    path = str(tmp_path / "old.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY, year INTEGER NOT NULL, day INTEGER NOT NULL, "
+        "part INTEGER NOT NULL, started REAL NOT NULL, wall REAL NOT NULL, cpu REAL NOT NULL, "
+        "peak_kb INTEGER, code_hash TEXT NOT NULL, utils_hash TEXT NOT NULL, "
+        "stdlib_version TEXT NOT NULL, ok INTEGER NOT NULL)")
+    connection.execute("INSERT INTO runs VALUES (NULL, 2023, 1, 1, 0, 0.5, 0.5, NULL, 'h', 'u', '1.0', 1)")
+    connection.commit()
+    connection.close()
+
+    history = PerfHistory(path)
+    history.record(2023, 1, 1, "x", (0.1, 0.1, None), "u", "2.0", interpreter="PyPy 3.10.14")
+    assert [run.interpreter for run in history.runs(2023, 1, 1)] == ["", "PyPy 3.10.14"]
+    history.close()
+
+
+def test_code_stored_once(history):
+    """Test that rerunning the same code does not store it again."""
+    for wall in (0.3, 0.2, 0.1):
+        history.record(2023, 1, 1, "same", (wall, wall, None), "u", "2.0")
+
+    count, = history.connection.execute("SELECT COUNT(*) FROM code").fetchone()
+    assert count == 1
+
+
+def test_history_survives_reopening(tmp_path):
+    """Test that runs are read back from the file."""
+    path = str(tmp_path / "history.sqlite")
+    history = PerfHistory(path)
+    history.record(2023, 1, 1, "x", (0.1, 0.1, None), "u", "2.0")
+    history.close()
+
+    reopened = PerfHistory(path)
+    assert len(reopened.runs(2023, 1, 1)) == 1
+    reopened.close()
+
+
+def test_read_metrics_missing_file(tmp_path):
+    """Test that a run that wrote no metrics gives None."""
+    empty = tmp_path / "empty.metrics"
+    empty.write_bytes(b"")
+
+    assert read_metrics(str(tmp_path / "none.metrics")) is None
+    assert read_metrics(str(empty)) is None
+
+
+@pytest.fixture
+def solution_input(tmp_path, monkeypatch):
+    """Point the runner at a small cached input."""
+    monkeypatch.chdir(tmp_path)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n2\n")
+    monkeypatch.setattr(runner, "ensure_input_file",
+                        lambda year, day, token: (str(input_path), ""))
+    monkeypatch.setattr(config, "CURRENT_YEAR", "2023")
+    monkeypatch.setattr(config, "CURRENT_DAY", "1")
+
+
+def test_execute_code_reports_metrics(solution_input):
+    """Test that a run reports its wall time, CPU time and peak memory."""
+    reported = []
+    output = runner.execute_code(
+        "total = sum(i * i for i in range(200000))\nprint(len(parsed.lines))",
+        on_metrics=lambda metrics, ok: reported.append((metrics, ok)))
+
+    assert output == "2\n"
+    (wall, cpu, peak), ok = reported[0]
+    assert ok and wall > 0 and cpu > 0
+    assert peak is None or peak > 0
+
+
+def test_failed_run_still_reports_metrics(solution_input):
+    """Test that a solution that raises is recorded as failed."""
+    reported = []
+    runner.execute_code("raise ValueError('no')",
+                        on_metrics=lambda metrics, ok: reported.append(ok))
+
+    assert reported == [False]
+    assert not [name for name in os.listdir(".") if name.endswith(".metrics")]
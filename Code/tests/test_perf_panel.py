@@ -0,0 +1,118 @@
+import sys
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from Code.core.perf_history import PerfHistory
+from Code.ui.perf_panel import PerfPanel, format_interpreters, format_memory, format_seconds
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Create a history with three runs of one part."""
+    history = PerfHistory(str(tmp_path / "perf_history.sqlite"))
+    history.record(2023, 5, 1, "print('slow')", (1.5, 1.4, 40960), "u", "2.0")
+    history.record(2023, 5, 1, "print('fast')", (0.02, 0.02, 10240), "u", "2.0")
+    history.record(2023, 5, 1, "print('broken')", (0.01, 0.01, 512), "u", "2.0", ok=False)
+    yield history
+    history.close()
+
+
+@pytest.fixture
+def panel(qapp, history):
+    """Create a panel showing the history."""
+    panel = PerfPanel()
+    panel.show_history(history, 2023, 5, 1)
+    yield panel
+    panel.close()
+
+
+def test_formatting():
+    """Test that times and memory are shown in readable units."""
+    assert format_seconds(0.0123) == "12.3 ms"
+    assert format_seconds(2.5) == "2.500 s"
+    assert format_memory(None) == "-"
+    assert format_memory(512) == "512 KB"
+    assert format_memory(10240) == "10.0 MB"
+
+
+def test_panel_lists_runs_and_fastest(panel):
+    """Test that every run gets a row and the fastest is named in the title."""
+    assert panel.table.rowCount() == 3
+    assert "fastest 20.0 ms" in panel.title_label.text()
+    assert panel.table.item(1, 0).font().bold()
+    assert not panel.table.item(0, 0).font().bold()
+    assert panel.table.item(2, 1).text().endswith("(failed)")
+    assert panel.chart.fastest_id == panel.fastest.id
+    panel.grab()
+
+
+def test_load_fastest_emits_its_code(panel):
+    """Test that the fastest version can be loaded back."""
+    loaded = []
+    panel.load_requested.connect(loaded.append)
+
+    panel.load_fastest()
+
+    assert loaded == ["print('fast')"]
+
+
+def test_load_selected_run(panel):
+    """Test that any run picked in the chart or table can be loaded."""
+    loaded = []
+    panel.load_requested.connect(loaded.append)
+    assert not panel.load_selected_button.isEnabled()
+
+    panel.chart.run_clicked.emit(0)
+    assert panel.chart.selected == 0
+    assert panel.load_selected_button.isEnabled()
+    panel.load_selected()
+
+    assert loaded == ["print('slow')"]
+
+
+def test_interpreters_side_by_side(panel, history):
+    """Test that best times per interpreter are only compared once there are two."""
+    assert panel.interpreters_label.isHidden()
+
+    history.record(2023, 5, 1, "print('fast')", (0.005, 0.005, 10240), "u", "2.0",
+                   interpreter="PyPy 3.10.14")
+    panel.show_history(history, 2023, 5, 1)
+
+    assert not panel.interpreters_label.isHidden()
+    assert panel.interpreters_label.text() == "PyPy 3.10.14 5.0 ms (4.0x faster)  |  unrecorded 20.0 ms"
+    assert panel.table.item(3, 4).text() == "PyPy 3.10.14"
+    assert panel.table.item(0, 4).text() == "-"
+    assert format_interpreters(history.fastest_by_interpreter(2023, 6, 1)) == ""
+
+
+def test_compare_button_emits(panel):
+    """Test that the compare button asks the editor to run the comparison."""
+    requested = []
+    panel.compare_requested.connect(lambda: requested.append(True))
+
+    panel.compare_button.click()
+
+    assert requested == [True]
+
+
+def test_empty_history(qapp, tmp_path):
+    """Test that a part that was never run shows an empty panel."""
+    history = PerfHistory(str(tmp_path / "empty.sqlite"))
+    panel = PerfPanel()
+    panel.show_history(history, 2023, 6, 2)
+
+    assert panel.table.rowCount() == 0
+    assert not panel.load_fastest_button.isEnabled()
+    panel.grab()
+    panel.close()
+    history.close()
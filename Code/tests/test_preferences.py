@@ -4,6 +4,8 @@ import os
 import sys
 import tempfile
 import shutil
+import threading
+import time
 from unittest.mock import MagicMock, patch
 from PySide6.QtWidgets import QApplication, QTextEdit
 from PySide6.QtGui import QColor
@@ -62,6 +64,8 @@ def preferences(qapp, mock_editor, mock_console, temp_user_dir):
         f.write(prefs.default_template)
 
     yield prefs
+    # Finish pending writes before the widget and its store can be collected
+    prefs.store.flush()
     prefs.close()
 
 
@@ -183,7 +187,8 @@ def test_custom_theme_color(preferences):
         preferences.editor_theme.setCurrentText("Change Custom")
         preferences.apply_editor_preferences()
 
-        # Check that custom color was saved
+        # Check that custom color was saved once pending writes are flushed
+        preferences.store.flush()
         with open(preferences.preferences_path, "r") as f:
             data = json.load(f)
 
@@ -284,3 +289,110 @@ def test_preferences_dropdown_options(preferences):
                       for i in range(preferences.console_theme.count())]
     assert "Default" in console_themes
     assert "Dark" in console_themes
+
+
+def test_apply_preferences_does_not_write_immediately(preferences):
+    """Test that live preview changes are batched instead of written per change."""
+    preferences.editor_theme.setCurrentText("Dark")
+    preferences.console_theme.setCurrentText("Monokai")
+
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    assert data["code_editor_preferences"]["Theme"] == "Default"
+
+    preferences.store.flush()
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    assert data["code_editor_preferences"]["Theme"] == "Dark"
+    assert data["console_preferences"]["Theme"] == "Monokai"
+
+
+def test_store_notifies_observers(preferences):
+    """Test that observers are told about changed preferences."""
+    seen = []
+    preferences.store.changed.connect(
+        lambda section, key, value: seen.append((section, key, value)))
+
+    preferences.editor_font.setCurrentText("Consolas")
+
+    assert ("code_editor_preferences", "Font", "Consolas") in seen
+
+
+def test_store_keeps_changes_from_other_windows(preferences):
+    """Test that a write only merges the keys this store changed."""
+    preferences.editor_theme.setCurrentText("Dark")
+
+    # Another window saves a different setting in the meantime
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    data["console_preferences"]["Theme"] = "Solarized"
+    with open(preferences.preferences_path, "w") as f:
+        json.dump(data, f)
+
+    preferences.store.flush()
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    assert data["code_editor_preferences"]["Theme"] == "Dark"
+    assert data["console_preferences"]["Theme"] == "Solarized"
+
+
+def test_save_only_writes_changed_keys(preferences):
+    """Test that the Save button does not overwrite settings it never changed."""
+    preferences.editor_theme.setCurrentText("Dark")
+    preferences.store.flush()
+
+    # Another window changes a setting this one never touched
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    data["console_preferences"]["Theme"] = "Solarized"
+    with open(preferences.preferences_path, "w") as f:
+        json.dump(data, f)
+
+    preferences.store.save()
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    assert data["code_editor_preferences"]["Theme"] == "Dark"
+    assert data["console_preferences"]["Theme"] == "Solarized"
+
+
+def test_store_write_waits_for_other_writers(preferences):
+    """Test that a write waits for the file lock and merges what was saved under it."""
+    file_io = sys.modules[type(preferences.store.writer).__module__]
+    preferences.editor_theme.setCurrentText("Dark")
+
+    with file_io.file_lock(preferences.preferences_path):
+        writer = threading.Thread(target=preferences.store.flush)
+        writer.start()
+        time.sleep(0.2)
+        # Another process finishes its own read-merge-write while holding the lock
+        with open(preferences.preferences_path, "r") as f:
+            data = json.load(f)
+        assert data["code_editor_preferences"]["Theme"] == "Default"
+        data["console_preferences"]["Theme"] = "Solarized"
+        file_io.atomic_write(preferences.preferences_path, json.dumps(data))
+    writer.join(5)
+
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    assert data["code_editor_preferences"]["Theme"] == "Dark"
+    assert data["console_preferences"]["Theme"] == "Solarized"
+
+
+def test_failed_write_keeps_changes_for_next_write(preferences, monkeypatch, capsys):
+    """Test that settings from a write that failed are written by the next one."""
+    file_io = sys.modules[type(preferences.store.writer).__module__]
+    write = file_io.atomic_write
+
+    def fail(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_io, "atomic_write", fail)
+    preferences.editor_theme.setCurrentText("Dark")
+    preferences.store.flush()
+    assert "disk full" in capsys.readouterr().err
+
+    monkeypatch.setattr(file_io, "atomic_write", write)
+    preferences.store.save()
+    with open(preferences.preferences_path, "r") as f:
+        data = json.load(f)
+    assert data["code_editor_preferences"]["Theme"] == "Dark"
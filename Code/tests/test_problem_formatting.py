@@ -0,0 +1,163 @@
+import os
+import pytest
+from unittest.mock import patch
+from Code.core import aoc_fetcher
+from Code.core.aoc_fetcher import (
+    NO_PROBLEM, PART2_UNAVAILABLE, add_newlines_after_second_dash, format_problem, load_problem,
+    parse_answers, parse_problem_page
+)
+from Code.core.answers import answers_path, day_answers
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("", ""),
+    ("no dashes here", "no dashes here"),
+    ("--- Day 1 ---Text", "--- Day 1 ---\n\nText"),
+    ("--- Day 1 ---Text --- more ---", "--- Day 1 ---\n\nText --- more ---"),
+    ("only --- one", "only --- one"),
+    ("-----x---", "-----x---\n\n"),
+])
+def test_add_newlines_after_second_dash(text, expected):
+    """Test that only the second '---' gets newlines after it."""
+    assert add_newlines_after_second_dash(text) == expected
+
+
+def test_format_problem_both_parts():
+    """Test that formatted text and hints are produced for both parts."""
+    problem = format_problem(
+        ["--- Day 1 ---Intro\n\nWhat is the sum?", "--- Part Two ---More\nWhat now?"])
+
+    assert problem.formatted[0] == "--- Day 1 ---\n\nIntro\n\nWhat is the sum?"
+    assert problem.hints == ["What is the sum?", "What now?"]
+
+
+def test_format_problem_missing_part2():
+    """Test that a locked Part 2 gets the placeholder text."""
+    problem = format_problem(["--- Day 1 ---Intro\nQuestion?", ""])
+
+    assert problem.formatted[1] == PART2_UNAVAILABLE
+    assert problem.hints[1] == PART2_UNAVAILABLE
+
+
+def test_format_problem_no_problem():
+    """Test that an unavailable day shows the no-problem message."""
+    problem = format_problem(["", ""], "Could not fetch Part 1.")
+
+    assert problem.formatted == [NO_PROBLEM, ""]
+    assert problem.error == "Could not fetch Part 1."
+
+
+@pytest.fixture
+def problem_cache(tmp_path, monkeypatch):
+    """Keep cached problems in a temporary directory and start empty."""
+    monkeypatch.chdir(tmp_path)
+    aoc_fetcher._problems.clear()
+    yield tmp_path
+    aoc_fetcher._problems.clear()
+
+
+PAGE = ("<main><article><h2>--- Day 1 ---</h2><p>Intro with <code>x</code>.</p>\n"
+        "<p>What is the sum?</p>\n</article>\n"
+        "<article><h2>--- Part Two ---</h2><p>What now?</p></article></main>")
+
+
+def test_parse_problem_page():
+    """Test that articles are turned into text and minimal HTML."""
+    texts, fragments = parse_problem_page(PAGE)
+
+    assert texts[0].startswith("--- Day 1 ---")
+    assert fragments[0] == ("<h2>--- Day 1 ---</h2><p>Intro with <code>x</code>.</p>\n"
+                            "<p>What is the sum?</p>\n")
+    assert fragments[1] == "<h2>--- Part Two ---</h2><p>What now?</p>"
+
+
+def test_parse_problem_page_missing_part2():
+    """Test that a page with one article pads Part 2 with empty strings."""
+    texts, fragments = parse_problem_page("<article><p>Only one</p></article>")
+    assert texts[1] == "" and fragments[1] == ""
+
+
+@pytest.mark.parametrize("markup,expected", [
+    ('<article><p onclick="x()">Hi</p></article>', "<p>Hi</p>"),
+    ("<article><script>alert(1)</script><p>ok</p></article>", "<p>ok</p>"),
+    ("<article><div><em>kept</em></div></article>", "<em>kept</em>"),
+    ("<article><p>1 &lt; 2</p></article>", "<p>1 &lt; 2</p>"),
+    ('<article><a href="/2020/day/1/input">input</a></article>',
+     '<a href="https://adventofcode.com/2020/day/1/input">input</a>'),
+    ('<article><a href="javascript:evil()">link</a></article>', "link"),
+    ("<article><!-- hidden --><p>x</p></article>", "<p>x</p>"),
+])
+def test_sanitize_article(markup, expected):
+    """Test that only display tags and safe links survive sanitizing."""
+    _, fragments = parse_problem_page(markup)
+    assert fragments[0] == expected
+
+
+def test_load_problem_caches_complete_problems(problem_cache):
+    """Test that a problem with both parts is only fetched and parsed once."""
+    with patch.object(aoc_fetcher, "fetch_problem_page", return_value=(PAGE, "")) as fetch:
+        first = load_problem(2020, 1, "token")
+        assert load_problem(2020, 1, "token") is first
+        fetch.assert_called_once()
+
+    assert first.hints == ["What is the sum?", "What now?"]
+    assert "<code>x</code>" in first.html[0]
+
+
+def test_load_problem_reads_disk_cache(problem_cache):
+    """Test that a complete problem is read back from disk after a restart."""
+    with patch.object(aoc_fetcher, "fetch_problem_page", return_value=(PAGE, "")):
+        first = load_problem(2020, 1, "token")
+
+    aoc_fetcher._problems.clear()
+    with patch.object(aoc_fetcher, "fetch_problem_page") as fetch:
+        second = load_problem(2020, 1, "token")
+        fetch.assert_not_called()
+
+    assert second == first
+
+
+SOLVED_PAGE = PAGE.replace(
+    "</article>\n<article>",
+    "</article>\n<p>Your puzzle answer was <code>1&lt;2</code>.</p><article>"
+).replace("</main>", "<p>Your puzzle answer was <code>42</code>.</p></main>")
+
+
+def test_parse_answers():
+    """Test that the answers shown on a solved day are read in part order."""
+    assert parse_answers(SOLVED_PAGE) == ["1<2", "42"]
+    assert parse_answers(PAGE) == []
+
+
+def test_load_problem_records_answers_from_page(problem_cache):
+    """Test that answers on a fetched or cached page are recorded."""
+    with patch.object(aoc_fetcher, "fetch_problem_page", return_value=(SOLVED_PAGE, "")):
+        load_problem(2020, 1, "token")
+    assert day_answers(2020, 1) == {1: "1<2", 2: "42"}
+
+    # Answers recorded before answers.json was lost come back from the cache
+    os.remove(answers_path())
+    aoc_fetcher._problems.clear()
+    load_problem(2020, 1, "token")
+    assert day_answers(2020, 1) == {1: "1<2", 2: "42"}
+
+
+def test_load_problem_refetches_until_part2_unlocks(problem_cache):
+    """Test that a problem without Part 2 isn't cached."""
+    page = "<article><p>Part one only</p></article>"
+    with patch.object(aoc_fetcher, "fetch_problem_page", return_value=(page, "")) as fetch:
+        load_problem(2020, 2, "token")
+        load_problem(2020, 2, "token")
+        assert fetch.call_count == 2
+
+
+def test_load_problem_error(problem_cache):
+    """Test that a failed fetch is reported and not cached."""
+    with patch.object(aoc_fetcher, "fetch_problem_page",
+                      return_value=("", "Could not fetch Part 1.")) as fetch:
+        problem = load_problem(2030, 1, "token")
+        load_problem(2030, 1, "token")
+        assert fetch.call_count == 2
+
+    assert problem.error == "Could not fetch Part 1."
+    assert problem.formatted[0] == NO_PROBLEM
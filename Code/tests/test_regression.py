@@ -0,0 +1,118 @@
+import os
+import sys
+
+import pytest
+
+from Code.core import regression
+from Code.core.answers import day_answers, record_answer
+from Code.core.aoc_fetcher import input_cache_path
+from Code.core.solutions import solution_path
+import config.config as config
+
+USER = "user"
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Run inside a temporary directory with a fixed user."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "HASHED_TOKEN", USER)
+    return tmp_path
+
+
+def add_day(day, code, input_text="1\n2\n3\n", answers=None):
+    path = solution_path(USER, 2023, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(code)
+    if input_text is not None:
+        with open(input_cache_path(2023, day), "w") as f:
+            f.write(input_text)
+    for part, answer in (answers or {}).items():
+        record_answer(2023, day, part, answer)
+
+
+def test_answers_recorded_per_part(workspace):
+    """Test that accepted answers are stored by year, day and part."""
+    record_answer(2023, 4, 1, " 42\n")
+    record_answer(2023, 4, 2, "abc")
+
+    assert day_answers(2023, 4) == {1: "42", 2: "abc"}
+    assert day_answers(2023, 5) == {}
+
+
+def test_missing_answers_matches_words_and_lines():
+    """Test that answers are found as whole words or whole lines."""
+    output = "Part 1: 123\nHELLO WORLD\n"
+
+    assert regression.missing_answers(output, {1: "123", 2: "HELLO WORLD"}) == []
+    assert regression.missing_answers(output, {1: "12", 2: "456"}) == [1, 2]
+
+
+def test_run_year_reports_each_day(workspace):
+    """Test that passing, failing, crashing and unchecked days are told apart."""
+    add_day(1, "print('Part 1:', sum(parsed.ints[i][0] for i in range(3)))", answers={1: "6"})
+    add_day(2, "print(5)", answers={1: "6", 2: "7"})
+    add_day(3, "raise ValueError('bad input')", answers={1: "6"})
+    add_day(4, "print('anything')")
+    add_day(5, "print(1)", input_text=None)
+
+    results = {r.day: r for r in regression.run_year(USER, 2023, jobs=2)}
+
+    assert results[1].status == regression.PASS
+    assert results[2].status == regression.FAIL and results[2].missing == [1, 2]
+    assert results[3].status == regression.ERROR
+    assert results[3].detail == "ValueError: bad input"
+    assert results[4].status == regression.UNCHECKED
+    assert results[5].status == regression.NO_INPUT
+
+    report = regression.format_report(2023, list(results.values()))
+    assert "missing part 1 (6), 2 (7)" in report
+    assert "1 error, 1 fail, 1 no input, 1 pass, 1 unchecked" in report
+
+
+def test_utils_file_available_to_solutions(workspace):
+    """Test that solutions can call helpers from the user's utils file."""
+    add_day(1, "print(triple(2))", answers={1: "6"})
+    with open(os.path.join("user_files", USER, "utils.py"), "w") as f:
+        f.write("def triple(x):\n    return 3 * x\n")
+
+    assert regression.run_year(USER, 2023)[0].status == regression.PASS
+
+
+def test_slowdown_compared_with_last_pass(workspace):
+    """Test that a day much slower than its last passing run is flagged."""
+    add_day(1, "print(6)", answers={1: "6"})
+    first = regression.run_year(USER, 2023)[0]
+    assert first.previous_seconds is None and not first.slower
+
+    timings = regression.load_timings(USER)
+    assert timings["2023"]["1"] == round(first.seconds, 4)
+
+    result = regression.DayResult(1, regression.PASS, seconds=1.0, previous_seconds=0.1)
+    assert result.slower
+    result = regression.DayResult(1, regression.PASS, seconds=0.03, previous_seconds=0.01)
+    assert not result.slower
+
+
+def test_main_exit_status(workspace, capsys):
+    """Test that the command fails when any day fails."""
+    add_day(1, "print(6)", answers={1: "6"})
+    assert regression.main(["2023", "--user", USER]) == 0
+    assert "Day  1  pass" in capsys.readouterr().out
+
+    add_day(2, "print(0)", answers={1: "6"})
+    assert regression.main(["2023", "--user", USER, "--days", "2"]) == 1
+
+
+def test_other_interpreter_timed_separately(workspace, capsys):
+    """Test that --python runs the days under that interpreter with their own timings."""
+    add_day(1, "print(6)", answers={1: "6"})
+    assert regression.main(["2023", "--user", USER, "--python", sys.executable]) == 0
+    assert "Running under" in capsys.readouterr().out
+
+    timings = regression.load_timings(USER)
+    assert list(timings) == [regression.timings_key(2023, sys.executable)]
+
+    with pytest.raises(SystemExit):
+        regression.main(["2023", "--user", USER, "--python", "/nowhere/pypy3"])
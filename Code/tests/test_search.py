@@ -0,0 +1,186 @@
+import re
+import pytest
+import sys
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtWidgets import QApplication, QPlainTextEdit
+from Code.core.search import SearchOptions, compile_pattern, find_all
+from Code.core.solutions import SolutionWorkspace
+from Code.ui.code_editor import CodeEditor
+# The bar checks panel types, so use the InputView class it imported
+from Code.ui.find_bar import FindBar, InputView, SearchTarget, target_for
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.mark.parametrize("query,options,count", [
+    ("foo", SearchOptions(), 3),
+    ("foo", SearchOptions(case_sensitive=True), 2),
+    ("foo", SearchOptions(whole_word=True), 2),
+    ("f.o", SearchOptions(), 0),
+    ("f.o", SearchOptions(regex=True), 3),
+])
+def test_find_all_options(query, options, count):
+    """Test that case, whole word and regex options change what matches."""
+    matches = find_all(compile_pattern(query, options), "foo Foo foobar")
+
+    assert len(matches) == count
+
+
+def test_find_all_bytes_and_empty_matches():
+    """Test searching raw bytes and that empty matches are skipped."""
+    pattern = compile_pattern("x*", SearchOptions(regex=True), binary=True)
+    matches = find_all(pattern, b"a xx b x")
+
+    assert [matches.span(i) for i in range(len(matches))] == [(2, 4), (7, 8)]
+
+
+def test_invalid_regex():
+    """Test that a bad regex raises re.error for the bar to report."""
+    with pytest.raises(re.error):
+        compile_pattern("(", SearchOptions(regex=True))
+
+
+def test_matches_lookup():
+    """Test the range queries used for viewport-only highlighting."""
+    matches = find_all(compile_pattern("ab", SearchOptions()), "ab..ab..ab")
+
+    assert list(matches.between(1, 7)) == [1]
+    assert matches.any_between(3, 5)
+    assert not matches.any_between(2, 4)
+    assert matches.first_at_or_after(5) == 2
+    assert matches.first_at_or_after(9) == 0
+
+
+@pytest.fixture
+def editor(qapp):
+    editor = QPlainTextEdit()
+    editor.setPlainText("total = 0\nfor x in data:\n    total += int(x)\nprint(total)")
+    editor.resize(400, 300)
+    yield editor
+    editor.close()
+
+
+def test_find_bar_counts_and_steps(qapp, editor):
+    """Test that the bar counts matches and steps through them with wrap-around."""
+    bar = FindBar()
+    bar.open_for(editor)
+    bar.find_edit.setText("total")
+
+    assert bar.count_label.text() == "1 of 3"
+    bar.find_next()
+    assert editor.textCursor().selectionStart() == 0
+    bar.find_previous()
+    assert bar.count_label.text() == "3 of 3"
+    assert editor.textCursor().selectedText() == "total"
+    assert len(editor.extraSelections()) == 3
+
+
+def test_find_bar_replace(qapp, editor):
+    """Test replacing one match and then the rest, with regex groups."""
+    bar = FindBar()
+    bar.open_for(editor)
+    bar.find_edit.setText("total")
+    bar.replace_edit.setText("acc")
+
+    bar.replace_current()
+    assert editor.toPlainText().startswith("acc = 0")
+    assert bar.count_label.text() == "1 of 2"
+
+    bar.regex_button.setChecked(True)
+    bar.find_edit.setText(r"(\w+) \+= (\w+)")
+    bar.replace_edit.setText(r"\1 = \1 + \2")
+    bar.replace_all()
+    assert "total = total + int(x)" in editor.toPlainText()
+
+
+def test_find_bar_offsets_past_wide_characters(qapp, editor):
+    """Test that matches after emoji line up with the document's UTF-16 positions."""
+    editor.setPlainText("star = '\U0001F31F\U0001F31F'\nprint(star)")
+    bar = FindBar()
+    bar.open_for(editor)
+    bar.find_edit.setText("star")
+    bar.find_previous()
+
+    assert editor.textCursor().selectedText() == "star"
+    assert bar.target.cursor_offset() == editor.toPlainText().rindex("star")
+
+    bar.replace_edit.setText("sun")
+    bar.replace_current()
+    assert editor.toPlainText() == "star = '\U0001F31F\U0001F31F'\nprint(sun)"
+
+
+def test_find_bar_follows_editor_document_swaps(qapp, tmp_path, monkeypatch):
+    """Test that switching days searches the new day's document, not the old one."""
+    monkeypatch.chdir(tmp_path)
+    workspace = SolutionWorkspace("user", capacity=1)
+    editor = CodeEditor()
+    editor.resize(400, 300)
+    first = workspace.document(2023, 1)
+    first.setPlainText("y = 1")
+    editor.set_document(first)
+    bar = FindBar()
+    bar.open_for(editor)
+    bar.find_edit.setText("x")
+    assert bar.count_label.text() == "No results"
+
+    second = workspace.document(2023, 2)
+    second.setPlainText("x = 5")
+    editor.set_document(second)
+    # The first day's document is closed and deleted
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    assert bar.count_label.text() == "1 of 1"
+    assert len(editor.extraSelections()) == 1
+    bar.replace_edit.setText("z")
+    bar.replace_current()
+    assert second.toPlainText() == "z = 5"
+    bar.close_bar()
+    editor.close()
+
+
+def test_search_target_is_abstract(qapp):
+    """Test that a target missing part of the interface cannot be created."""
+    class TextOnly(SearchTarget):
+        def text(self):
+            return ""
+
+    with pytest.raises(TypeError, match="replace"):
+        TextOnly(None)
+
+
+def test_find_bar_read_only_panels_hide_replace(qapp, editor):
+    """Test that replace is only offered for editable panels."""
+    editor.setReadOnly(True)
+    bar = FindBar()
+    bar.open_for(editor)
+
+    assert bar.replace_button.isHidden()
+
+
+def test_find_bar_searches_large_input_in_worker(qapp, qtbot, tmp_path, monkeypatch):
+    """Test that inputs past the threshold are searched off the GUI thread."""
+    monkeypatch.setattr("Code.ui.find_bar.WORKER_THRESHOLD", 10)
+    path = tmp_path / "input.txt"
+    path.write_text("".join(f"{i}\n" for i in range(1000)))
+    view = InputView()
+    view.load_file(str(path))
+    bar = FindBar()
+    bar.open_for(view)
+
+    with qtbot.waitSignal(bar.worker.finished, timeout=5000):
+        bar.find_edit.setText("99")
+        bar.search()
+
+    assert bar.count_label.text() == "1 of 19"
+    bar.find_next()
+    assert view.list_view.currentIndex().row() == 99
+    assert target_for(view).text() is view.line_index.buffer
+    bar.close_bar()
+    view.release()
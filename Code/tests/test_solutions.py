@@ -0,0 +1,105 @@
+import os
+import sys
+
+import pytest
+from PySide6.QtGui import QFont, QTextCursor
+from PySide6.QtWidgets import QApplication
+
+from Code.core.solutions import SolutionWorkspace, solution_path
+from Code.ui.code_editor import CodeEditor
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def workspace(qapp, tmp_path, monkeypatch):
+    """Create a workspace writing into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    workspace = SolutionWorkspace("user", capacity=2)
+    yield workspace
+    workspace.flush()
+
+
+def test_solution_path_layout():
+    """Test that solutions are stored per year with zero-padded days."""
+    assert solution_path("user", 2023, 5) == os.path.join(
+        "user_files", "user", "solutions", "2023", "05.py")
+
+
+def test_edits_saved_per_day(workspace):
+    """Test that each day's document is written to its own file."""
+    workspace.document(2023, 1).setPlainText("print(1)")
+    workspace.document(2023, 2).setPlainText("print(2)")
+    workspace.flush()
+
+    with open(solution_path("user", 2023, 1)) as f:
+        assert f.read() == "print(1)"
+    with open(solution_path("user", 2023, 2)) as f:
+        assert f.read() == "print(2)"
+
+
+def test_untouched_day_not_written(workspace):
+    """Test that opening a day without typing leaves no file behind."""
+    workspace.document(2023, 3)
+    workspace.flush()
+
+    assert not os.path.exists(solution_path("user", 2023, 3))
+
+
+def test_reopening_keeps_document_and_undo(workspace):
+    """Test that switching back to an open day reuses its document."""
+    document = workspace.document(2023, 1)
+    QTextCursor(document).insertText("x = 1")
+
+    workspace.document(2023, 2)
+    assert workspace.document(2023, 1) is document
+    assert document.isUndoAvailable()
+
+
+def test_least_recently_used_day_saved_and_dropped(workspace):
+    """Test that going over capacity evicts the oldest day after saving it."""
+    workspace.document(2023, 1).setPlainText("first")
+    workspace.document(2023, 2)
+    workspace.document(2023, 1)
+    workspace.document(2023, 3)
+
+    assert workspace.open_days() == [(2023, 1), (2023, 3)]
+    assert not workspace.is_open(2023, 2)
+
+    workspace.document(2023, 4)
+    assert not workspace.is_open(2023, 1)
+    with open(solution_path("user", 2023, 1)) as f:
+        assert f.read() == "first"
+    assert workspace.document(2023, 1).toPlainText() == "first"
+
+
+def test_editor_switch_keeps_font_tabs_and_cursor(workspace):
+    """Test that the editor keeps its settings and each day's cursor."""
+    editor = CodeEditor()
+    editor.setFont(QFont("Arial", 15))
+    editor.setTabStopDistance(28)
+
+    first = workspace.document(2023, 1)
+    first.setPlainText("line one\nline two")
+    editor.set_document(first)
+    cursor = editor.textCursor()
+    cursor.setPosition(12)
+    editor.setTextCursor(cursor)
+
+    editor.set_document(workspace.document(2023, 2))
+    assert editor.textCursor().position() == 0
+    assert editor.tabStopDistance() == 28
+    assert editor.document().defaultFont().pointSize() == 15
+
+    editor.set_document(first)
+    assert editor.textCursor().position() == 12
+    # The editor goes first, its documents belong to the workspace
+    editor.close()
+    del editor
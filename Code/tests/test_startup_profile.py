@@ -0,0 +1,77 @@
+import sys
+import time
+
+import pytest
+
+from Code.core import startup_profile
+
+
+@pytest.fixture
+def fresh_profile(monkeypatch):
+    """Start each test with no recorded phases or imports."""
+    monkeypatch.setattr(startup_profile, "_marks", [])
+    monkeypatch.setattr(startup_profile, "_imports", [])
+
+
+@pytest.fixture
+def heavy_module(tmp_path, monkeypatch):
+    """A module on the path that records when it is imported."""
+    (tmp_path / "aocode_heavy_dep.py").write_text(
+        "import builtins\nbuiltins.aocode_heavy_loaded = True\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "aocode_heavy_dep"
+    sys.modules.pop("aocode_heavy_dep", None)
+    import builtins
+    if hasattr(builtins, "aocode_heavy_loaded"):
+        del builtins.aocode_heavy_loaded
+
+
+def test_deferred_import_waits_for_first_use(fresh_profile, heavy_module, tmp_path):
+    """Test that a module behind a module __getattr__ loads on first attribute access."""
+    import builtins
+    (tmp_path / "aocode_uses_heavy.py").write_text(
+        "from Code.core.startup_profile import lazy_import\n"
+        "def __getattr__(name):\n"
+        "    if name == 'heavy':\n"
+        f"        return lazy_import({heavy_module!r})\n"
+        "    raise AttributeError(name)\n")
+    try:
+        import aocode_uses_heavy
+        assert heavy_module not in sys.modules
+        assert not hasattr(builtins, "aocode_heavy_loaded")
+
+        assert aocode_uses_heavy.heavy.VALUE == 42
+        assert heavy_module in sys.modules
+    finally:
+        sys.modules.pop("aocode_uses_heavy", None)
+
+    assert [name for name, _ in startup_profile._imports] == [heavy_module]
+
+
+def test_lazy_import_records_each_module_once(fresh_profile, heavy_module):
+    """Test that later calls reuse the loaded module without recording it again."""
+    first = startup_profile.lazy_import(heavy_module)
+
+    assert startup_profile.lazy_import(heavy_module) is first
+    assert len(startup_profile._imports) == 1
+
+
+def test_report_lists_phases_in_order(fresh_profile, heavy_module):
+    """Test that the report shows every phase and deferred import."""
+    assert "none yet" in startup_profile.report()
+
+    startup_profile.mark("window built")
+    startup_profile.mark("problem loaded")
+    startup_profile.lazy_import(heavy_module)
+    report = startup_profile.report()
+
+    assert report.index("window built") < report.index("problem loaded")
+    assert heavy_module in report and "none yet" not in report
+    first, second = (ms for _, ms in startup_profile._marks)
+    assert 0 <= first <= second
+
+
+def test_launch_time_is_before_import():
+    """Test that the launch time is not in the future."""
+    assert startup_profile.LAUNCH_TIME <= time.perf_counter()
+    assert startup_profile.elapsed_ms() >= 0
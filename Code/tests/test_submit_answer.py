@@ -1,6 +1,13 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from Code.core.runner import submit_answer
+from Code.core.answers import day_answers
+
+
+@pytest.fixture(autouse=True)
+def user_dir(tmp_path, monkeypatch):
+    """Keep recorded answers out of the working tree."""
+    monkeypatch.chdir(tmp_path)
 
 
 @pytest.fixture
@@ -32,6 +39,7 @@ def test_successful_submission_correct_answer(mock_post, mock_terminal, mock_ins
     mock_terminal.append.assert_any_call(
         '<span style="color: green;">------Answer submitted successfully! That\'s the right answer.</span>')
     mock_instance.problem_tabs.setCurrentIndex.assert_called_with(1)
+    assert day_answers(2022, 1) == {1: 'answer'}
 
 
 @patch('Code.core.runner.requests.post')
@@ -47,6 +55,7 @@ def test_successful_submission_incorrect_answer(mock_post, mock_terminal, mock_i
 
     mock_terminal.append.assert_any_call(
         '<span style="color: red;">------Incorrect answer</span>')
+    assert day_answers(2022, 1) == {}
 
 
 @pytest.mark.parametrize("status_code,expected_message", [
@@ -0,0 +1,69 @@
+import pytest
+import sys
+from unittest.mock import MagicMock
+from PySide6.QtWidgets import QApplication, QTextEdit
+from Code.config.themes import ThemeEngine
+import Code.config.config as config
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def engine(qapp):
+    """Create a ThemeEngine over the built-in themes."""
+    return ThemeEngine(config.THEMES)
+
+
+@pytest.mark.parametrize("theme_name", list(config.THEMES))
+def test_builtin_stylesheets(engine, theme_name):
+    """Test that every built-in theme is precompiled."""
+    assert engine.stylesheet(theme_name) == config.THEMES[theme_name]
+
+
+def test_unknown_theme_falls_back_to_default(engine):
+    """Test that an unknown theme name uses the default theme."""
+    assert engine.stylesheet("Nope") == config.THEMES["Default"]
+
+
+def test_custom_stylesheet_is_cached(engine):
+    """Test that custom colours produce one shared stylesheet string."""
+    first = engine.stylesheet("Custom", "#123456", "#ffffff")
+    assert "#123456" in first
+    assert engine.stylesheet("Custom", "#123456", "#ffffff") is first
+
+
+def test_font_is_cached(engine):
+    """Test that fonts are only constructed once per family and size."""
+    assert engine.font("Menlo", 15) is engine.font("Menlo", 15)
+    assert engine.font("Menlo", 15).fixedPitch()
+
+
+def test_apply_skips_unchanged_stylesheet(engine):
+    """Test that reapplying the same theme doesn't touch the widget again."""
+    widget = QTextEdit()
+    widget.setStyleSheet = MagicMock(wraps=widget.setStyleSheet)
+
+    assert engine.apply(widget, engine.stylesheet("Dark"))
+    assert not engine.apply(widget, engine.stylesheet("Dark"))
+    assert engine.apply(widget, engine.stylesheet("Light"))
+
+    assert widget.setStyleSheet.call_count == 2
+    assert widget.updatesEnabled()
+    widget.close()
+
+
+def test_apply_font_skips_unchanged_font(engine):
+    """Test that the same font isn't set twice."""
+    widget = QTextEdit()
+
+    assert engine.apply_font(widget, "Arial", 12)
+    assert not engine.apply_font(widget, "Arial", 12)
+    assert widget.font().family() == engine.font("Arial", 12).family()
+    widget.close()
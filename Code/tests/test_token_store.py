@@ -0,0 +1,112 @@
+import os
+import pytest
+import sys
+import time
+from unittest.mock import patch
+from PySide6.QtWidgets import QApplication
+from Code.core.token_store import (
+    TokenLoader, read_cached_token, write_cached_token
+)
+
+TOKEN = "ab12" * 32
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Path of the cached token copy."""
+    return str(tmp_path / ".session")
+
+
+def test_cache_file_round_trip(cache_path):
+    """Test writing and reading the cache file."""
+    assert read_cached_token(cache_path) is None
+    write_cached_token(TOKEN, cache_path)
+    assert read_cached_token(cache_path) == TOKEN
+    if os.name == "posix":
+        assert os.stat(cache_path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.parametrize("contents", ["", "short", "x" * 127 + "!",
+                                      "bm90IGEgdG9rZW4=" * 15])
+def test_cache_ignores_anything_but_a_token(cache_path, contents):
+    """Test that an empty, damaged or old obfuscated cache file is not used."""
+    with open(cache_path, "w") as f:
+        f.write(contents)
+    assert read_cached_token(cache_path) is None
+
+
+def test_loader_prefers_keyring_and_refreshes_cache(qapp, cache_path):
+    """Test that a token changed in the keyring replaces an older cached one."""
+    write_cached_token("old0" * 32, cache_path)
+    loader = TokenLoader(cache_path)
+    results = []
+    loader.loaded.connect(results.append)
+
+    with patch("keyring.get_password", return_value=TOKEN):
+        loader.load()
+
+    assert results == [TOKEN]
+    assert read_cached_token(cache_path) == TOKEN
+
+
+@pytest.mark.parametrize("get_password", [
+    lambda *args: None,
+    lambda *args: time.sleep(1),
+])
+def test_loader_uses_cache_when_keyring_has_nothing(qapp, cache_path, get_password):
+    """Test that the cached token is used when the keyring is empty or too slow."""
+    write_cached_token(TOKEN, cache_path)
+    loader = TokenLoader(cache_path, keyring_timeout=0.05)
+    results = []
+    loader.loaded.connect(results.append)
+
+    with patch("keyring.get_password", side_effect=get_password):
+        loader.load()
+
+    assert results == [TOKEN]
+
+
+def test_loader_caches_keyring_token(qapp, cache_path):
+    """Test that a keyring token is copied to the cache when there is none yet."""
+    loader = TokenLoader(cache_path)
+    results = []
+    loader.loaded.connect(results.append)
+
+    with patch("keyring.get_password", return_value=TOKEN):
+        loader.load()
+
+    assert results == [TOKEN]
+    assert read_cached_token(cache_path) == TOKEN
+
+
+def test_loader_reports_missing_token(qapp, cache_path):
+    """Test that an empty string is emitted when there is no token anywhere."""
+    loader = TokenLoader(cache_path)
+    results = []
+    loader.loaded.connect(results.append)
+
+    with patch("keyring.get_password", return_value=None):
+        loader.load()
+
+    assert results == [""]
+
+
+def test_loader_runs_in_background(qtbot, cache_path):
+    """Test that start() delivers the token asynchronously."""
+    write_cached_token(TOKEN, cache_path)
+    loader = TokenLoader(cache_path)
+
+    with patch("keyring.get_password", return_value=None), \
+            qtbot.waitSignal(loader.loaded, timeout=5000) as blocker:
+        loader.start()
+
+    assert blocker.args == [TOKEN]
@@ -0,0 +1,165 @@
+import pytest
+import os
+import sys
+from PySide6.QtWidgets import QApplication, QTextEdit
+from Code.core.utils import TEMPLATE_VERSION, Utils, template_version, upgrade_utils
+from Code.core.legacy_template import TEMPLATE_V1
+import aoc_stdlib
+import config.config as config
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create a QApplication instance for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def utils(qapp, tmp_path, monkeypatch):
+    """Create a Utils instance writing into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "TOKEN", "a" * 128)
+    panel = QTextEdit()
+    utils = Utils(panel)
+    yield utils
+    utils.flush()
+    panel.close()
+
+
+def test_utils_file_created_from_template(utils):
+    """Test that a new user gets the default template in memory and on disk."""
+    assert os.path.exists(utils.utils_path)
+    assert utils.get_content() == utils.default_template
+
+
+def test_edits_update_buffer_and_version(utils):
+    """Test that typing updates the in-memory buffer and bumps the version."""
+    version = utils.version
+    utils.panel.setPlainText("def helper():\n    return 1\n")
+
+    assert utils.get_content() == "def helper():\n    return 1\n"
+    assert utils.version > version
+
+
+def test_get_content_does_not_read_disk(utils):
+    """Test that the runner gets the buffer even before the autosave fires."""
+    utils.panel.setPlainText("x = 1")
+    os.remove(utils.utils_path)
+
+    assert utils.get_content() == "x = 1"
+
+    utils.flush()
+    with open(utils.utils_path) as f:
+        assert f.read() == "x = 1"
+
+
+def test_content_hash_follows_version(utils):
+    """Test that the content hash only changes when the buffer does."""
+    first = utils.content_hash()
+    assert utils.content_hash() == first
+
+    utils.panel.setPlainText("y = 2")
+    assert utils.content_hash() != first
+
+
+def test_template_imports_stdlib():
+    """Test that the template only pulls in the shared helpers."""
+    namespace = {}
+    exec(Utils.get_template(), namespace)
+
+    assert template_version(Utils.get_template()) == TEMPLATE_VERSION
+    assert namespace["UnionFind"] is aoc_stdlib.UnionFind
+
+
+V1_COMPAT_IMPORT = "from aoc_stdlib.compat_v1 import UnionFind, DIRS4, DIRS8, padd, pneg, psub"
+
+
+def test_upgrade_untouched_old_template():
+    """Test that an unchanged copy of the old template becomes the new one."""
+    upgraded = upgrade_utils(TEMPLATE_V1)
+
+    assert upgraded.startswith(Utils.get_template())
+    assert upgraded.rstrip().endswith(V1_COMPAT_IMPORT)
+    assert "def lmap" not in upgraded
+    assert upgrade_utils(upgraded) is None
+    assert upgrade_utils(Utils.get_template()) is None
+
+
+def test_upgraded_utils_behave_like_old_template():
+    """Test that V1-style solutions get the same results after the upgrade."""
+    usage = """
+moved = padd([0, 0], [1, 1]) + psub([3, 3], [1, 2]) + pneg([1, -2])
+uf = UnionFind(4)
+uf.merge(0, 1)
+result = (moved, [0, 1] in DIRS4, type(DIRS8), uf.ranks, uf.parents, lmap(int, "12"))
+"""
+    old, new = {}, {}
+    exec(TEMPLATE_V1 + usage, old)
+    exec(upgrade_utils(TEMPLATE_V1) + usage, new)
+
+    assert new["result"] == old["result"]
+    assert new["result"][1] is True and new["result"][2] is list
+
+
+def test_upgrade_keeps_helpers_built_from_changed_ones():
+    """Test that DIRS8 stays in the file when the DIRS4 it extends was edited."""
+    old = TEMPLATE_V1.replace("DIRS4 = [[-1, 0], [1, 0], [0, -1], [0, 1]]",
+                              "DIRS4 = [[0, 1], [1, 0], [0, -1], [-1, 0]]")
+    namespace = {}
+    exec(upgrade_utils(old), namespace)
+
+    assert namespace["DIRS8"][:4] == [[0, 1], [1, 0], [0, -1], [-1, 0]]
+
+
+def test_upgrade_keeps_user_changes():
+    """Test that edited helpers and the user's own code survive an upgrade."""
+    old = TEMPLATE_V1.replace("return s.split()", "return s.split(',')")
+    old += "\n\n\n# Mine\nLIMIT = 10\n\n\ndef double(x):\n    return 2 * x\n"
+
+    upgraded = upgrade_utils(old)
+
+    assert upgraded.startswith(Utils.get_template())
+    assert "return s.split(',')" in upgraded
+    assert "# Mine\nLIMIT = 10" in upgraded and "def double" in upgraded
+    assert "def lmap" not in upgraded and "class UnionFind" not in upgraded
+
+
+def test_old_utils_file_upgraded_on_load(qapp, tmp_path, monkeypatch):
+    """Test that loading an old utils.py upgrades it and keeps a backup."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "TOKEN", "b" * 128)
+    user_dir = tmp_path / "user_files" / Utils.generate_user_id(None, "b" * 128)
+    user_dir.mkdir(parents=True)
+    (user_dir / "utils.py").write_text(TEMPLATE_V1)
+
+    utils = Utils(QTextEdit())
+
+    assert utils.get_content() == upgrade_utils(TEMPLATE_V1)
+    assert (user_dir / "utils.py").read_text() == upgrade_utils(TEMPLATE_V1)
+    assert (user_dir / "utils.py.v1.bak").read_text() == TEMPLATE_V1
+    assert utils.upgrade_backup == os.path.join(
+        "user_files", user_dir.name, "utils.py.v1.bak")
+
+
+def test_upgrade_is_idempotent_without_header(qapp, tmp_path, monkeypatch):
+    """Test that deleting the header comment does not upgrade the file again."""
+    headless = Utils.get_template().split("\n", 1)[1] + "\nLIMIT = 10\n"
+    assert upgrade_utils(headless) is None
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "TOKEN", "b" * 128)
+    user_dir = tmp_path / "user_files" / Utils.generate_user_id(None, "b" * 128)
+    user_dir.mkdir(parents=True)
+    (user_dir / "utils.py").write_text(TEMPLATE_V1)
+    Utils(QTextEdit())
+
+    # The user strips the file down to their own code after the upgrade
+    (user_dir / "utils.py").write_text("LIMIT = 10\n")
+    utils = Utils(QTextEdit())
+
+    assert utils.get_content() == "LIMIT = 10\n"
+    assert utils.upgrade_backup is None
+    assert (user_dir / "utils.py.v1.bak").read_text() == TEMPLATE_V1
@@ -1,6 +1,11 @@
 from PySide6.QtWidgets import QWidget, QPlainTextEdit
-from PySide6.QtCore import Qt, QRect, QSize
-from PySide6.QtGui import QPainter, QColor, QPaintEvent, QResizeEvent
+from PySide6.QtCore import Qt, QRect, QSize, QEvent, QPointF, Signal
+from PySide6.QtGui import (QPainter, QColor, QPaintEvent, QResizeEvent, QPixmap,
+                           QTextCursor, QTextDocument)
+
+GUTTER_BACKGROUND = QColor(240, 240, 240)
+GUTTER_FOREGROUND = QColor(100, 100, 100)
+GUTTER_PADDING = 3
 
 
 class LineNumberArea(QWidget):
@@ -16,21 +21,66 @@ class LineNumberArea(QWidget):
 
 
 class CodeEditor(QPlainTextEdit):
+    # set_document swapped in another document, anything tied to the old one is stale
+    documentReplaced = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.line_number_area = LineNumberArea(self)
 
+        # Gutter caches. The digit pixmaps and metrics only depend on the font,
+        # and the width only depends on how many digits the last line number has,
+        # so none of this needs recomputing while scrolling or typing.
+        self._digit_count: int = 0
+        self._gutter_width: int = 0
+        self._digit_advance: int = 0
+        self._line_height: int = 0
+        self._digit_pixmaps: list[QPixmap] = []
+        self._refresh_gutter_metrics()
+
         self.blockCountChanged.connect(self.update_line_number_area_width)
         self.updateRequest.connect(self.update_line_number_area)
 
         self.update_line_number_area_width(0)
 
+    def set_document(self, document: QTextDocument) -> None:
+        """
+        Shows another document, keeping the editor's font and tab width and
+        remembering where the cursor and scroll bar were in each document.
+        """
+        old = self.document()
+        if document is old:
+            return
+        old.setProperty("cursor_position", self.textCursor().position())
+        old.setProperty("scroll_position", self.verticalScrollBar().value())
+
+        tab_stop = self.tabStopDistance()
+        document.setDefaultFont(self.font())
+        self.setDocument(document)
+        self.setTabStopDistance(tab_stop)
+
+        cursor = QTextCursor(document)
+        cursor.setPosition(min(document.property("cursor_position") or 0,
+                               document.characterCount() - 1))
+        self.setTextCursor(cursor)
+        self.verticalScrollBar().setValue(document.property("scroll_position") or 0)
+
+        # The new document may need a different number of digits
+        self._digit_count = 0
+        self.update_line_number_area_width(0)
+        self.documentReplaced.emit()
+
     def line_number_area_width(self) -> int:
-        digits = len(str(max(1, self.blockCount())))
-        return 3 + self.fontMetrics().horizontalAdvance('9') * digits
+        return self._gutter_width
 
     def update_line_number_area_width(self, _) -> None:
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        digits = len(str(max(1, self.blockCount())))
+        if digits == self._digit_count:
+            return
+        self._digit_count = digits
+        self._gutter_width = GUTTER_PADDING + self._digit_advance * digits
+        self.setViewportMargins(self._gutter_width, 0, 0, 0)
+        self._resize_line_number_area()
 
     def update_line_number_area(self, rect: QRect, dy: int) -> None:
         if dy:
@@ -38,31 +88,72 @@ class CodeEditor(QPlainTextEdit):
         else:
             self.line_number_area.update(
                 0, rect.y(), self.line_number_area.width(), rect.height())
-        if rect.contains(self.viewport().rect()):
-            self.update_line_number_area_width(0)
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         super().resizeEvent(event)
+        self._resize_line_number_area()
+
+    def changeEvent(self, event: QEvent) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.FontChange:
+            self._refresh_gutter_metrics()
+            # Force the width to be recomputed with the new digit advance
+            self._digit_count = 0
+            self.update_line_number_area_width(0)
+            self.line_number_area.update()
+
+    def _resize_line_number_area(self) -> None:
         cr = self.contentsRect()
         self.line_number_area.setGeometry(
-            QRect(cr.left(), cr.top(), self.line_number_area_width(), cr.height()))
+            QRect(cr.left(), cr.top(), self._gutter_width, cr.height()))
+
+    def _refresh_gutter_metrics(self) -> None:
+        metrics = self.fontMetrics()
+        self._digit_advance = max(
+            metrics.horizontalAdvance(str(d)) for d in range(10))
+        self._line_height = metrics.height()
+
+        # Pre-render each digit once, numbers are then composed from these
+        ratio = self.devicePixelRatioF()
+        self._digit_pixmaps = []
+        for digit in range(10):
+            pixmap = QPixmap(round(self._digit_advance * ratio),
+                             round(self._line_height * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.font())
+            painter.setPen(GUTTER_FOREGROUND)
+            painter.drawText(QRect(0, 0, self._digit_advance, self._line_height),
+                             Qt.AlignmentFlag.AlignCenter, str(digit))
+            painter.end()
+            self._digit_pixmaps.append(pixmap)
+
+    def _draw_line_number(self, painter: QPainter, number: int, top: int) -> None:
+        text = str(number)
+        x = (self._gutter_width - len(text) * self._digit_advance) / 2
+        for ch in text:
+            painter.drawPixmap(QPointF(x, top), self._digit_pixmaps[ord(ch) - 48])
+            x += self._digit_advance
 
     def line_number_area_paint_event(self, event: QPaintEvent) -> None:
         painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor(240, 240, 240))
-        painter.setPen(QColor(100, 100, 100))
+        painter.fillRect(event.rect(), GUTTER_BACKGROUND)
 
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
-        top = round(self.blockBoundingGeometry(
-            block).translated(self.contentOffset()).top())
+        offset = self.contentOffset()
+        top = round(self.blockBoundingGeometry(block).translated(offset).top())
         bottom = top + round(self.blockBoundingRect(block).height())
+        rect_top = event.rect().top()
+        rect_bottom = event.rect().bottom()
 
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                painter.drawText(0, top, self.line_number_area.width(),
-                                 self.fontMetrics().height(), Qt.AlignmentFlag.AlignCenter, str(block_number + 1))
+        while block.isValid() and top <= rect_bottom:
+            if block.isVisible() and bottom >= rect_top:
+                self._draw_line_number(painter, block_number + 1, top)
             block = block.next()
             top = bottom
             bottom = top + round(self.blockBoundingRect(block).height())
             block_number += 1
+
+        painter.end()
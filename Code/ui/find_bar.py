@@ -0,0 +1,487 @@
+import re
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left
+from typing import List, Optional, Pattern, Tuple, Union
+
+from PySide6.QtCore import QObject, QPoint, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QTextCursor, QTextDocument, QTextFormat
+from PySide6.QtWidgets import (QHBoxLayout, QLabel, QLineEdit, QPlainTextEdit,
+                               QTextEdit, QToolButton, QWidget)
+
+from core.search import (WORKER_THRESHOLD, Matches, SearchOptions, SearchWorker,
+                         Searchable, compile_pattern, find_all)
+from ui.input_view import InputView
+
+MATCH_COLOR = QColor("#fff59d")
+CURRENT_MATCH_COLOR = QColor("#ffb74d")
+SEARCH_DEBOUNCE_MS = 150
+# Characters the document stores as two UTF-16 units
+WIDE_CHAR = re.compile("[\U00010000-\U0010FFFF]")
+
+TextWidget = Union[QPlainTextEdit, QTextEdit]
+
+
+class _SearchTargetMeta(ABCMeta, type(QObject)):
+    pass
+
+
+class SearchTarget(QObject, metaclass=_SearchTargetMeta):
+    """
+    What the find bar needs from a panel. `changed` fires whenever the
+    panel's text changes so the bar can search again, `reset` when the text
+    was swapped for another so matches found so far no longer apply.
+    Offsets are indices into text().
+    """
+
+    changed = Signal()
+    reset = Signal()
+    binary = False
+
+    def __init__(self, parent: QObject) -> None:
+        # Shiboken creates the object itself, so ABCMeta never gets to refuse
+        if self.__abstractmethods__:
+            raise TypeError(f"{type(self).__name__} does not implement "
+                            f"{', '.join(sorted(self.__abstractmethods__))}")
+        super().__init__(parent)
+
+    @property
+    def editable(self) -> bool:
+        return False
+
+    @abstractmethod
+    def text(self) -> Searchable:
+        ...
+
+    def cursor_offset(self) -> int:
+        return 0
+
+    @abstractmethod
+    def show_matches(self, matches: Optional[Matches], current: int) -> None:
+        ...
+
+    @abstractmethod
+    def select(self, start: int, end: int) -> None:
+        ...
+
+    @abstractmethod
+    def replace(self, start: int, end: int, text: str) -> None:
+        """Only called when editable is true."""
+
+    @abstractmethod
+    def replace_all(self, text: str) -> None:
+        """Only called when editable is true."""
+
+
+class TextEditTarget(SearchTarget):
+    """
+    The code editor, utils file, terminal and problem panels. The document
+    counts positions in UTF-16 units, so characters past U+FFFF such as
+    emoji take two there and one in text(); offsets are converted both ways.
+    """
+
+    def __init__(self, widget: TextWidget) -> None:
+        super().__init__(widget)
+        self.widget = widget
+        self._matches: Optional[Matches] = None
+        self._current = -1
+        # The text and where its wide characters are, until the next edit
+        self._text: Optional[str] = None
+        self._wide: List[int] = []
+        self._wide_positions: List[int] = []
+        self._document = widget.document()
+        self._watch(self._document)
+        # The code editor shows another document for each day
+        replaced = getattr(widget, "documentReplaced", None)
+        if replaced is not None:
+            replaced.connect(self._document_replaced)
+        # Only what is on screen is highlighted, so redo it when that moves
+        widget.verticalScrollBar().valueChanged.connect(self._highlight_viewport)
+        widget.horizontalScrollBar().valueChanged.connect(self._highlight_viewport)
+
+    @property
+    def editable(self) -> bool:
+        return not self.widget.isReadOnly()
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.widget.toPlainText()
+            self._wide = ([] if self._text.isascii() else
+                          [match.start() for match in WIDE_CHAR.finditer(self._text)])
+            self._wide_positions = [offset + i for i, offset in enumerate(self._wide)]
+        return self._text
+
+    def cursor_offset(self) -> int:
+        return self._offset(self.widget.textCursor().selectionStart())
+
+    def visible_range(self) -> Tuple[int, int]:
+        viewport = self.widget.viewport()
+        first = self.widget.cursorForPosition(QPoint(0, 0))
+        last = self.widget.cursorForPosition(
+            QPoint(viewport.width(), viewport.height()))
+        last.movePosition(QTextCursor.EndOfBlock)
+        return self._offset(first.block().position()), self._offset(last.position()) + 1
+
+    def show_matches(self, matches: Optional[Matches], current: int) -> None:
+        self._matches = matches
+        self._current = current
+        self._highlight_viewport()
+
+    def select(self, start: int, end: int) -> None:
+        self.widget.setTextCursor(self._cursor(start, end))
+        self.widget.ensureCursorVisible()
+
+    def replace(self, start: int, end: int, text: str) -> None:
+        self._cursor(start, end).insertText(text)
+
+    def replace_all(self, text: str) -> None:
+        # One edit block so a single undo brings everything back
+        cursor = QTextCursor(self.widget.document())
+        cursor.beginEditBlock()
+        cursor.select(QTextCursor.Document)
+        cursor.insertText(text)
+        cursor.endEditBlock()
+
+    def _forget_text(self) -> None:
+        self._text = None
+
+    def _watch(self, document: QTextDocument) -> None:
+        document.contentsChanged.connect(self._forget_text)
+        document.contentsChanged.connect(self.changed)
+
+    def _document_replaced(self) -> None:
+        try:
+            self._document.contentsChanged.disconnect(self._forget_text)
+            self._document.contentsChanged.disconnect(self.changed)
+        except (RuntimeError, TypeError):
+            pass  # already deleted, its connections went with it
+        self._document = self.widget.document()
+        self._watch(self._document)
+        self._forget_text()
+        # The highlight cursors belong to the old document, which may be gone
+        self._matches = None
+        self._current = -1
+        self.widget.setExtraSelections([])
+        self.reset.emit()
+
+    def _position(self, offset: int) -> int:
+        self.text()
+        return offset + bisect_left(self._wide, offset)
+
+    def _offset(self, position: int) -> int:
+        self.text()
+        return position - bisect_left(self._wide_positions, position)
+
+    def _cursor(self, start: int, end: int) -> QTextCursor:
+        cursor = QTextCursor(self.widget.document())
+        cursor.setPosition(self._position(start))
+        cursor.setPosition(self._position(end), QTextCursor.KeepAnchor)
+        return cursor
+
+    def _highlight_viewport(self) -> None:
+        selections: List[QTextEdit.ExtraSelection] = []
+        if self._matches:
+            start, end = self.visible_range()
+            for i in self._matches.between(start, end):
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = self._cursor(*self._matches.span(i))
+                selection.format.setBackground(
+                    CURRENT_MATCH_COLOR if i == self._current else MATCH_COLOR)
+                selection.format.setProperty(QTextFormat.FullWidthSelection, False)
+                selections.append(selection)
+        self.widget.setExtraSelections(selections)
+
+
+class InputViewTarget(SearchTarget):
+    """The input panel, searched as bytes straight from the mapped file."""
+
+    binary = True
+
+    def __init__(self, view: InputView) -> None:
+        super().__init__(view)
+        self.view = view
+        view.contentChanged.connect(self.changed)
+
+    def text(self) -> Searchable:
+        return self.view.line_index.buffer
+
+    def cursor_offset(self) -> int:
+        row = self.view.list_view.currentIndex().row()
+        return self.view.line_index.starts[row] if row >= 0 else 0
+
+    def show_matches(self, matches: Optional[Matches], current: int) -> None:
+        # The model is only asked about rows on screen, so this is viewport-only
+        self.view.model.set_match_lookup(matches.any_between if matches else None)
+
+    def select(self, start: int, end: int) -> None:
+        self.view.select_span(start, end)
+
+    # The input file is never edited here, the bar hides replace for it
+    def replace(self, start: int, end: int, text: str) -> None:
+        pass
+
+    def replace_all(self, text: str) -> None:
+        pass
+
+
+def target_for(widget: QWidget) -> Optional[SearchTarget]:
+    """The search target wrapping a panel, created once per panel."""
+    target = widget.findChild(SearchTarget, options=Qt.FindDirectChildrenOnly)
+    if target is not None:
+        return target
+    if isinstance(widget, InputView):
+        return InputViewTarget(widget)
+    if isinstance(widget, (QPlainTextEdit, QTextEdit)):
+        return TextEditTarget(widget)
+    return None
+
+
+class FindBar(QWidget):
+    """
+    Find and replace shared by every panel. Small texts are searched on each
+    keystroke; anything past WORKER_THRESHOLD is searched on a worker thread
+    and the count shows up when it finishes. Only matches in view are
+    highlighted, the rest are just counted.
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.target: Optional[SearchTarget] = None
+        self.matches: Optional[Matches] = None
+        self.current = -1
+        # The current match is highlighted but not selected until the user
+        # steps to it, so a search never moves the cursor on its own
+        self._visited = False
+        self._pattern: Optional[Pattern] = None
+        self._pending_generation = 0
+
+        self.worker = SearchWorker(self)
+        self.worker.finished.connect(self._on_worker_finished)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search)
+
+        self.find_edit = QLineEdit()
+        self.find_edit.setPlaceholderText("Find")
+        self.find_edit.textChanged.connect(self._query_changed)
+        self.find_edit.installEventFilter(self)
+
+        self.case_button = self._toggle("Aa", "Match case")
+        self.regex_button = self._toggle(".*", "Regular expression")
+        self.word_button = self._toggle("W", "Whole word")
+
+        self.count_label = QLabel()
+        self.count_label.setMinimumWidth(90)
+
+        self.previous_button = QToolButton()
+        self.previous_button.setText("↑")
+        self.previous_button.clicked.connect(self.find_previous)
+        self.next_button = QToolButton()
+        self.next_button.setText("↓")
+        self.next_button.clicked.connect(self.find_next)
+
+        self.replace_edit = QLineEdit()
+        self.replace_edit.setPlaceholderText("Replace")
+        self.replace_edit.returnPressed.connect(self.replace_current)
+        self.replace_button = QToolButton()
+        self.replace_button.setText("Replace")
+        self.replace_button.clicked.connect(self.replace_current)
+        self.replace_all_button = QToolButton()
+        self.replace_all_button.setText("All")
+        self.replace_all_button.clicked.connect(self.replace_all)
+
+        close_button = QToolButton()
+        close_button.setText("✕")
+        close_button.clicked.connect(self.close_bar)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 2, 4, 2)
+        for widget in [self.find_edit, self.case_button, self.regex_button,
+                       self.word_button, self.count_label, self.previous_button,
+                       self.next_button, self.replace_edit, self.replace_button,
+                       self.replace_all_button, close_button]:
+            layout.addWidget(widget)
+
+        self.hide()
+
+    def _toggle(self, text: str, tooltip: str) -> QToolButton:
+        button = QToolButton()
+        button.setText(text)
+        button.setToolTip(tooltip)
+        button.setCheckable(True)
+        button.toggled.connect(self._query_changed)
+        return button
+
+    @property
+    def options(self) -> SearchOptions:
+        return SearchOptions(case_sensitive=self.case_button.isChecked(),
+                             regex=self.regex_button.isChecked(),
+                             whole_word=self.word_button.isChecked())
+
+    def open_for(self, widget: QWidget) -> None:
+        target = target_for(widget)
+        if target is None:
+            return
+        self.attach(target)
+        self.show()
+        self.find_edit.setFocus()
+        self.find_edit.selectAll()
+        self.search()
+
+    def attach(self, target: SearchTarget) -> None:
+        if target is self.target:
+            return
+        self.detach()
+        self.target = target
+        target.changed.connect(self._target_changed)
+        target.reset.connect(self._target_reset)
+        target.destroyed.connect(self._target_destroyed)
+        for widget in [self.replace_edit, self.replace_button, self.replace_all_button]:
+            widget.setVisible(target.editable)
+
+    def detach(self) -> None:
+        if self.target is None:
+            return
+        self.target.changed.disconnect(self._target_changed)
+        self.target.reset.disconnect(self._target_reset)
+        self.target.destroyed.disconnect(self._target_destroyed)
+        self.target.show_matches(None, -1)
+        self.target = None
+        self.matches = None
+
+    def close_bar(self) -> None:
+        self.worker.cancel()
+        self.search_timer.stop()
+        self.detach()
+        self.hide()
+
+    def search(self) -> None:
+        """Search the current target for the query, in the background if it is large."""
+        self.search_timer.stop()
+        if self.target is None or not self.isVisible():
+            return
+        query = self.find_edit.text()
+        if not query:
+            self.worker.cancel()
+            self._pattern = None
+            self._set_matches(None)
+            return
+
+        try:
+            self._pattern = compile_pattern(query, self.options, self.target.binary)
+        except re.error:
+            self.worker.cancel()
+            self._pattern = None
+            self._set_matches(None)
+            self.count_label.setText("Invalid regex")
+            return
+
+        text = self.target.text()
+        if len(text) < WORKER_THRESHOLD:
+            self.worker.cancel()
+            self._set_matches(find_all(self._pattern, text))
+        else:
+            self.count_label.setText("Searching…")
+            self._pending_generation = self.worker.search(self._pattern, text)
+
+    def find_next(self) -> None:
+        self._step(1)
+
+    def find_previous(self) -> None:
+        self._step(-1)
+
+    def replace_current(self) -> None:
+        if not self._can_replace() or self.current < 0:
+            return
+        start, end = self.matches.span(self.current)
+        match = self._pattern.match(self.target.text(), start)
+        if match is None or match.end() != end:
+            return
+        self.target.replace(start, end, self._expand(match))
+        self.search()
+        self.find_next()
+
+    def replace_all(self) -> None:
+        if not self._can_replace() or not self.matches:
+            return
+        text, count = self._pattern.subn(self._expand, self.target.text())
+        if count:
+            self.target.replace_all(text)
+        self.search()
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self.find_edit and event.type() == event.Type.KeyPress:
+            if event.key() in (Qt.Key_Return, Qt.Key_Enter):
+                if event.modifiers() & Qt.ShiftModifier:
+                    self.find_previous()
+                else:
+                    self.find_next()
+                return True
+            if event.key() == Qt.Key_Escape:
+                self.close_bar()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _target_changed(self) -> None:
+        self.search_timer.start()
+
+    def _target_reset(self) -> None:
+        # The old matches point into the old text, drop them before anything can use them
+        self.worker.cancel()
+        self._set_matches(None)
+        self.search()
+
+    def _query_changed(self) -> None:
+        # Small panels search on every keystroke, large ones wait for a pause
+        if self.target is not None and len(self.target.text()) >= WORKER_THRESHOLD:
+            self.search_timer.start()
+        else:
+            self.search()
+
+    def _expand(self, match: re.Match) -> str:
+        replacement = self.replace_edit.text()
+        return match.expand(replacement) if self.options.regex else replacement
+
+    def _can_replace(self) -> bool:
+        return (self.target is not None and self.target.editable
+                and self._pattern is not None and self.matches is not None)
+
+    def _on_worker_finished(self, generation: int, matches: Matches) -> None:
+        if generation == self._pending_generation and self.target is not None:
+            self._set_matches(matches)
+
+    def _set_matches(self, matches: Optional[Matches]) -> None:
+        self.matches = matches
+        self.current = -1
+        self._visited = False
+        if matches:
+            self.current = matches.first_at_or_after(self.target.cursor_offset())
+        self._update_count()
+        if self.target is not None:
+            self.target.show_matches(matches, self.current)
+
+    def _step(self, direction: int) -> None:
+        if not self.matches or self.target is None:
+            return
+        if not self._visited and direction > 0:
+            self._visited = True
+        else:
+            self.current = (self.current + direction) % len(self.matches)
+        self._visited = True
+        self.target.select(*self.matches.span(self.current))
+        self.target.show_matches(self.matches, self.current)
+        self._update_count()
+
+    def _update_count(self) -> None:
+        if self.matches is None:
+            self.count_label.setText("")
+        elif not self.matches:
+            self.count_label.setText("No results")
+        else:
+            self.count_label.setText(
+                f"{self.current + 1} of {self.matches.count_text()}")
+
+    def _target_destroyed(self) -> None:
+        self.target = None
+        self.matches = None
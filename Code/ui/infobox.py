@@ -1,4 +1,5 @@
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton
+from core import startup_profile
 
 
 class Infobox(QWidget):
@@ -17,9 +18,12 @@ class Infobox(QWidget):
 
         shortcuts_label = QLabel("""
 - Cmd+R: Run your code
+- Cmd+Shift+R: Run your code again, even if an identical run is cached
 - Cmd+Enter: Submit your answer
 - Cmd+P: Toggle preferences panel
 - Cmd+I: Toggle this info box
+- Cmd+H: Toggle the run history of the current part
+- Cmd+F: Find and replace in the focused panel (Enter / Shift+Enter to step, Esc to close)
 - Cmd+1/2/3/4: Switch between Part 1, Part 2, Input, and Utils tabs
         """)
         shortcuts_label.setWordWrap(True)
@@ -35,9 +39,15 @@ class Infobox(QWidget):
 - There's a hint box for you to view the question in the top left.
 - Line numbers are displayed on the left of the code editor.
 - Click on 'Utils File' to add your own functions you can call at any time.                            
-- Your input data can be called using the variable 'data'.                            
+- Your input data can be called using the variable 'data'.
+- 'parsed' has it pre-split: parsed.lines, parsed.ints, parsed.grid and parsed.paragraphs.                            
 - Click on 'Run' to execute your code and view the output in the console.                    
 - You can also click on 'Submit' to submit your solution to the server.                      
+- Running unchanged code against the same input shows the saved output, marked 'cached'.
+- Turn on 'Cells' to split your code with '# %%' lines: only cells you changed, and cells that depend on them, run again. Cmd+Shift+R starts from scratch.
+- The dropdown next to the day picks which Python runs that day's solution, e.g. PyPy for brute force. 'Compare Interpreters' in History times them all side by side.
+- parallel_map and parallel_search spread brute-force work over every core, parallel_stats() shows how long each worker took.
+- Every run is timed. 'History' charts a part's runs and can load the fastest version back.
 - Click on the cog icon to open the preferences panel, where you can customize your theme and font.
         """)
         tips_label.setWordWrap(True)
@@ -63,6 +73,16 @@ Hint Box displaying the actual question so no need to scroll
         self.features_label.hide()
         main_layout.addWidget(self.features_label)
 
+        # Startup Profile Section (collapsible)
+        self.profile_button = QPushButton("Show Startup Profile")
+        self.profile_button.clicked.connect(self.toggle_profile)
+        main_layout.addWidget(self.profile_button)
+
+        self.profile_label = QLabel()
+        self.profile_label.setStyleSheet("font-family: monospace;")
+        self.profile_label.hide()
+        main_layout.addWidget(self.profile_label)
+
         main_layout.addStretch()
         self.setLayout(main_layout)
 
@@ -73,3 +93,12 @@ Hint Box displaying the actual question so no need to scroll
         else:
             self.features_label.show()
             self.features_button.setText("Hide Features")
+
+    def toggle_profile(self):
+        if self.profile_label.isVisible():
+            self.profile_label.hide()
+            self.profile_button.setText("Show Startup Profile")
+        else:
+            self.profile_label.setText(startup_profile.report())
+            self.profile_label.show()
+            self.profile_button.setText("Hide Startup Profile")
@@ -0,0 +1,146 @@
+import mmap
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QGuiApplication, QKeySequence
+from PySide6.QtWidgets import (QAbstractItemView, QHBoxLayout, QLabel,
+                               QListView, QVBoxLayout, QWidget)
+
+from core.line_index import LineIndex
+
+
+class InputLineModel(QAbstractListModel):
+    """One row per input line, decoded from the buffer only when a row is drawn."""
+
+    MATCH_COLOR = QColor("#fff59d")
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.line_index = LineIndex(b"")
+        # Asked with a line's byte span, only ever for rows being drawn
+        self.has_match: Optional[Callable[[int, int], bool]] = None
+
+    def set_line_index(self, line_index: LineIndex) -> None:
+        self.beginResetModel()
+        self.line_index = line_index
+        self.endResetModel()
+
+    def set_match_lookup(self, has_match: Optional[Callable[[int, int], bool]]) -> None:
+        self.has_match = has_match
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1),
+                                  [Qt.BackgroundRole])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.line_index.line_count
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.line_index.line(index.row())
+        if role == Qt.BackgroundRole and self.has_match is not None:
+            if self.has_match(*self.line_index.line_span(index.row())):
+                return self.MATCH_COLOR
+        return None
+
+
+class InputView(QWidget):
+    """
+    Read-only view of a puzzle input backed by the cached input file.
+    The file is memory-mapped and a QListView with uniform row heights only
+    asks for the lines on screen, so a multi-megabyte input opens as fast
+    as a small one. The find bar searches the mapped bytes directly.
+    """
+
+    contentChanged = Signal()
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._mapped: Optional[mmap.mmap] = None
+
+        self.model = InputLineModel(self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        font = QFont("Courier New")
+        font.setStyleHint(QFont.Monospace)
+        self.list_view.setFont(font)
+        self.list_view.installEventFilter(self)
+
+        self.stats_label = QLabel()
+        self.stats_label.setStyleSheet("color: gray;")
+
+        bottom = QHBoxLayout()
+        bottom.setContentsMargins(4, 2, 4, 2)
+        bottom.addStretch(1)
+        bottom.addWidget(self.stats_label)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.list_view, 1)
+        layout.addLayout(bottom)
+
+    @property
+    def line_index(self) -> LineIndex:
+        return self.model.line_index
+
+    def load_file(self, path: str) -> None:
+        with open(path, "rb") as f:
+            # mmap can't map an empty file
+            if f.seek(0, 2) == 0:
+                self._show(b"")
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._show(mapped)
+        self._mapped = mapped
+
+    def set_text(self, text: str) -> None:
+        """Show a short message such as a fetch error instead of a file."""
+        self._show(text.encode("utf-8"))
+
+    def text(self) -> str:
+        return self.line_index.buffer[:].decode("utf-8", errors="replace")
+
+    def release(self) -> None:
+        self._show(b"")
+
+    def select_span(self, start: int, end: int) -> None:
+        """Scroll to and select the line holding a byte range of the input."""
+        line, column = self.line_index.position_of(start)
+        row = self.model.index(line)
+        self.list_view.setCurrentIndex(row)
+        self.list_view.scrollTo(row, QAbstractItemView.PositionAtCenter)
+        self.stats_label.setText(
+            f"Ln {line + 1}, Col {column + 1} • {self.line_index.stats()}")
+
+    def copy_selection(self) -> None:
+        rows = sorted(index.row() for index in self.list_view.selectedIndexes())
+        if rows:
+            QGuiApplication.clipboard().setText(
+                "\n".join(self.line_index.line(row) for row in rows))
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self.list_view and event.type() == event.Type.KeyPress \
+                and event.matches(QKeySequence.Copy):
+            self.copy_selection()
+            return True
+        return super().eventFilter(obj, event)
+
+    def _show(self, buffer) -> None:
+        # Swap the model over before unmapping so no row reads a closed map
+        old = self._mapped
+        self._mapped = None
+        self.model.set_line_index(LineIndex(buffer))
+        if old is not None:
+            try:
+                old.close()
+            except BufferError:
+                pass  # A background search still holds it, freed once that ends
+        self.stats_label.setText(self.line_index.stats())
+        self.contentChanged.emit()
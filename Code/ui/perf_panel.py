@@ -0,0 +1,240 @@
+import time
+from typing import List, Optional
+
+from PySide6.QtCore import QRectF, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QMouseEvent, QPainter, QPaintEvent
+from PySide6.QtWidgets import (QAbstractItemView, QHBoxLayout, QLabel, QPushButton,
+                               QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget)
+
+from core.interpreters import speedup
+from core.perf_history import PerfHistory, RunRecord
+
+RUN_COLOR = QColor("#64b5f6")
+FASTEST_COLOR = QColor("#43a047")
+FAILED_COLOR = QColor("#bdbdbd")
+SELECTED_OUTLINE = QColor("#212121")
+CHART_PADDING = 24
+
+COLUMNS = ["When", "Wall", "CPU", "Peak memory", "Interpreter", "Code", "Utils", "Stdlib"]
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.3f} s"
+
+
+def format_memory(kb: Optional[int]) -> str:
+    if kb is None:
+        return "-"
+    if kb < 1024:
+        return f"{kb} KB"
+    return f"{kb / 1024:.1f} MB"
+
+
+def format_interpreters(fastest: List[RunRecord]) -> str:
+    """
+    Best time under each interpreter side by side, compared with the slowest,
+    e.g. "PyPy 3.10.14 20.0 ms (75.0x faster)  |  CPython 3.11.7 1.500 s".
+    """
+    if len(fastest) < 2:
+        return ""
+    slowest = max(run.wall for run in fastest)
+    parts = []
+    for run in fastest:
+        part = f"{run.interpreter or 'unrecorded'} {format_seconds(run.wall)}"
+        if run.wall < slowest:
+            part += f" ({speedup(run.wall, slowest)})"
+        parts.append(part)
+    return "  |  ".join(parts)
+
+
+class HistoryChart(QWidget):
+    """One bar per run, oldest on the left, with the fastest run in green."""
+
+    run_clicked = Signal(int)
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.runs: List[RunRecord] = []
+        self.fastest_id: Optional[int] = None
+        self.selected = -1
+        self.setMinimumHeight(160)
+
+    def set_runs(self, runs: List[RunRecord], fastest_id: Optional[int]) -> None:
+        self.runs = runs
+        self.fastest_id = fastest_id
+        self.selected = -1
+        self.update()
+
+    def set_selected(self, index: int) -> None:
+        self.selected = index
+        self.update()
+
+    def bar_rect(self, index: int, slowest: float) -> QRectF:
+        plot = self.rect().adjusted(CHART_PADDING, CHART_PADDING // 2, -CHART_PADDING // 2, -CHART_PADDING)
+        slot = plot.width() / len(self.runs)
+        height = plot.height() * (self.runs[index].wall / slowest if slowest else 0)
+        return QRectF(plot.left() + slot * index + slot * 0.15, plot.bottom() - height,
+                      max(1.0, slot * 0.7), height)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        if not self.runs:
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter,
+                             "Run this part to start its history")
+            painter.end()
+            return
+
+        slowest = max(run.wall for run in self.runs)
+        painter.drawText(4, CHART_PADDING // 2 + 10, format_seconds(slowest))
+        painter.drawText(4, self.height() - 6, f"{len(self.runs)} runs")
+        for index, run in enumerate(self.runs):
+            if run.id == self.fastest_id:
+                color = FASTEST_COLOR
+            else:
+                color = RUN_COLOR if run.ok else FAILED_COLOR
+            rect = self.bar_rect(index, slowest)
+            painter.fillRect(rect, color)
+            if index == self.selected:
+                painter.setPen(SELECTED_OUTLINE)
+                painter.drawRect(rect)
+        painter.end()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if not self.runs:
+            return
+        slowest = max(run.wall for run in self.runs)
+        x = event.position().x()
+        for index in range(len(self.runs)):
+            rect = self.bar_rect(index, slowest)
+            if rect.left() <= x <= rect.right():
+                self.run_clicked.emit(index)
+                return
+
+
+class PerfPanel(QWidget):
+    """
+    Timing history of the current part. The chart and table show every run,
+    with the fastest successful one highlighted, and any run's code can be
+    loaded back into the editor.
+    """
+
+    load_requested = Signal(str)
+    compare_requested = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setWindowTitle("Run History")
+        self.setGeometry(320, 320, 720, 520)
+        self.history: Optional[PerfHistory] = None
+        self.runs: List[RunRecord] = []
+        self.fastest: Optional[RunRecord] = None
+
+        layout = QVBoxLayout(self)
+
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        layout.addWidget(self.title_label)
+
+        # Only shown once the part has been run under more than one interpreter
+        self.interpreters_label = QLabel()
+        self.interpreters_label.setWordWrap(True)
+        self.interpreters_label.hide()
+        layout.addWidget(self.interpreters_label)
+
+        self.chart = HistoryChart(self)
+        self.chart.run_clicked.connect(self.table_select)
+        layout.addWidget(self.chart)
+
+        self.table = QTableWidget(0, len(COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().hide()
+        self.table.itemSelectionChanged.connect(self.selection_changed)
+        self.table.cellDoubleClicked.connect(self.load_selected)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.compare_button = QPushButton("Compare Interpreters")
+        self.compare_button.setToolTip(
+            "Run the current code under every Python found and time them side by side")
+        self.compare_button.clicked.connect(self.compare_requested)
+        buttons.addWidget(self.compare_button)
+        buttons.addStretch(1)
+        self.load_fastest_button = QPushButton("Load Fastest")
+        self.load_fastest_button.clicked.connect(self.load_fastest)
+        buttons.addWidget(self.load_fastest_button)
+        self.load_selected_button = QPushButton("Load Selected")
+        self.load_selected_button.clicked.connect(self.load_selected)
+        buttons.addWidget(self.load_selected_button)
+        layout.addLayout(buttons)
+
+        self._update_buttons()
+
+    def show_history(self, history: PerfHistory, year: int, day: int, part: int) -> None:
+        self.history = history
+        self.runs = history.runs(year, day, part)
+        self.fastest = history.fastest(year, day, part)
+        fastest_id = self.fastest.id if self.fastest else None
+
+        title = f"{year} Day {day} Part {part}"
+        if self.fastest:
+            title += f"  -  fastest {format_seconds(self.fastest.wall)}"
+        self.title_label.setText(title)
+        comparison = format_interpreters(history.fastest_by_interpreter(year, day, part))
+        self.interpreters_label.setText(comparison)
+        self.interpreters_label.setVisible(bool(comparison))
+        self.chart.set_runs(self.runs, fastest_id)
+
+        bold = QFont()
+        bold.setBold(True)
+        self.table.setRowCount(len(self.runs))
+        for row, run in enumerate(self.runs):
+            values = [time.strftime("%Y-%m-%d %H:%M", time.localtime(run.started)),
+                      format_seconds(run.wall) + ("" if run.ok else " (failed)"),
+                      format_seconds(run.cpu), format_memory(run.peak_kb),
+                      run.interpreter or "-", run.code_hash[:8], run.utils_hash[:8], run.stdlib_version]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if run.id == fastest_id:
+                    item.setFont(bold)
+                    item.setBackground(FASTEST_COLOR.lighter(170))
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        if self.runs:
+            self.table.scrollToBottom()
+        self._update_buttons()
+
+    def table_select(self, index: int) -> None:
+        self.table.selectRow(index)
+
+    def selected_run(self) -> Optional[RunRecord]:
+        rows = self.table.selectionModel().selectedRows()
+        return self.runs[rows[0].row()] if rows else None
+
+    def selection_changed(self) -> None:
+        rows = self.table.selectionModel().selectedRows()
+        self.chart.set_selected(rows[0].row() if rows else -1)
+        self._update_buttons()
+
+    def load_fastest(self) -> None:
+        if self.fastest is not None:
+            self._load(self.fastest)
+
+    def load_selected(self) -> None:
+        run = self.selected_run()
+        if run is not None:
+            self._load(run)
+
+    def _load(self, run: RunRecord) -> None:
+        code = self.history.code(run.code_hash) if self.history else None
+        if code is not None:
+            self.load_requested.emit(code)
+
+    def _update_buttons(self) -> None:
+        self.load_fastest_button.setEnabled(self.fastest is not None)
+        self.load_selected_button.setEnabled(self.selected_run() is not None)